@@ -1,21 +1,188 @@
+import os
 import random
-from typing import List, Tuple
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+UNKNOWN, MISS, HIT, SUNK = 0, 1, 2, 3
+
+
+def placement_counts(board: np.ndarray, ships: List[int]) -> np.ndarray:
+    """How many placements of the remaining ships cover each cell.
+
+    A placement is any horizontal or vertical run of `length` cells with no
+    miss or sunk cell in it. Runs are found with sliding-window sums over a
+    blocked-cell mask (prefix sums along each axis), and the coverage of every
+    valid start is spread back over its cells the same way, so the cost is a
+    few array passes per distinct ship length whatever the board size.
+    """
+    blocked = ((board == MISS) | (board == SUNK)).astype(np.int32)
+    counts = np.zeros(board.shape, dtype=np.int64)
+    lengths, copies = np.unique(np.asarray(ships, dtype=np.int64), return_counts=True)
+    for length, copies_of_length in zip(lengths, copies):
+        # Work on rows for horizontal placements and on the transpose for vertical ones
+        for grid, transposed in ((blocked, False), (blocked.T, True)):
+            if length > grid.shape[1]:
+                continue
+            coverage = _row_coverage(grid, int(length))
+            counts += copies_of_length * (coverage.T if transposed else coverage)
+    return counts
+
+
+def _row_coverage(blocked: np.ndarray, length: int) -> np.ndarray:
+    """Per cell, the number of clear `length`-runs along its row that contain it"""
+    rows, cols = blocked.shape
+    prefix = np.zeros((rows, cols + 1), dtype=np.int32)
+    np.cumsum(blocked, axis=1, out=prefix[:, 1:])
+    # valid[:, s] is 1 when cells s .. s+length-1 are all clear
+    valid = np.zeros((rows, cols + 1), dtype=np.int32)
+    valid[:, 1:cols - length + 2] = (prefix[:, length:] - prefix[:, :-length]) == 0
+    # Cell c is covered by the valid starts c-length+1 .. c
+    np.cumsum(valid, axis=1, out=valid)
+    ends = np.arange(1, cols + 1)
+    return valid[:, ends] - valid[:, np.maximum(ends - length, 0)]
+
+
+# --- MONTE-CARLO TARGETING (hard) ---
+# Fleets drawn per move, and the wall-clock cap on drawing them
+MC_SAMPLES = int(os.getenv("BATTLESHIP_SAMPLES", 4000))
+MC_TIME_LIMIT_MS = int(os.getenv("BATTLESHIP_TIME_LIMIT_MS", 300))
+# Hard ceiling for a requested sample count so one client can't pin the workers
+MC_MAX_SAMPLES = int(os.getenv("BATTLESHIP_MAX_SAMPLES", 100000))
+# Tries at a random spot for one ship before the whole fleet is redrawn
+PLACEMENT_TRIES = 20
+
+
+def ship_placements(rows: int, cols: int, length: int, blocked: int) -> List[int]:
+    """Every horizontal and vertical run of `length` cells that avoids `blocked`, as cell bitmasks (bit r * cols + c)"""
+    placements = []
+    run = (1 << length) - 1
+    vertical = sum(1 << (i * cols) for i in range(length))
+    for r in range(rows):
+        for c in range(cols):
+            if c + length <= cols:
+                mask = run << (r * cols + c)
+                if not mask & blocked:
+                    placements.append(mask)
+            if length > 1 and r + length <= rows:
+                mask = vertical << (r * cols + c)
+                if not mask & blocked:
+                    placements.append(mask)
+    return placements
+
+
+def sample_fleets(board: List[List[int]], ships: List[int], samples: int,
+                  time_limit_ms: Optional[float] = None, seed: Optional[int] = None) -> Tuple[List[int], int]:
+    """Draw random fleets consistent with the board and count how often each cell holds a ship.
+
+    Ships never touch a miss or a sunk cell and every open hit must be
+    covered. Hits are covered first, each by a random remaining ship placed
+    at random through it, then the rest of the fleet is dropped at random;
+    a fleet that doesn't fit is thrown away and redrawn. Building fleets
+    around the hits (rather than rejecting the ones that miss them) makes
+    this an approximation of the posterior, but one that stays cheap with
+    several open hits. Returns per-cell counts (row-major) and the number of
+    fleets that went into them.
+    """
+    rng = random.Random(seed)
+    rows, cols = len(board), len(board[0])
+    blocked = hits = 0
+    for r in range(rows):
+        for c in range(cols):
+            if board[r][c] in (MISS, SUNK):
+                blocked |= 1 << (r * cols + c)
+            elif board[r][c] == HIT:
+                hits |= 1 << (r * cols + c)
+
+    placements = {length: ship_placements(rows, cols, length, blocked) for length in set(ships)}
+    through = {
+        length: {cell: [m for m in masks if m >> cell & 1] for cell in range(rows * cols) if hits >> cell & 1}
+        for length, masks in placements.items()
+    }
+
+    deadline = None if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+    fleets = []
+    for attempt in range(samples * 10):
+        if len(fleets) >= samples:
+            break
+        if deadline is not None and attempt % 64 == 63 and time.perf_counter() > deadline:
+            break
+
+        occupied = 0
+        remaining = list(ships)
+        uncovered = hits
+        while uncovered and remaining:
+            # Lowest uncovered hit: pick a ship and a placement through it
+            cell = (uncovered & -uncovered).bit_length() - 1
+            options = [
+                (index, mask) for index, length in enumerate(remaining)
+                for mask in through[length][cell] if not mask & occupied
+            ]
+            if not options:
+                break
+            index, mask = rng.choice(options)
+            occupied |= mask
+            uncovered &= ~mask
+            remaining.pop(index)
+        if uncovered:
+            continue
+
+        for length in remaining:
+            candidates = placements[length]
+            if not candidates:
+                break
+            for _ in range(PLACEMENT_TRIES):
+                mask = rng.choice(candidates)
+                if not mask & occupied:
+                    occupied |= mask
+                    break
+            else:
+                break
+        else:
+            fleets.append(occupied)
+
+    if not fleets:
+        return [0] * (rows * cols), 0
+    width = (rows * cols + 7) // 8
+    bits = np.unpackbits(
+        np.frombuffer(b"".join(f.to_bytes(width, "little") for f in fleets), dtype=np.uint8).reshape(len(fleets), width),
+        axis=1, bitorder="little"
+    )[:, :rows * cols]
+    return bits.sum(axis=0).tolist(), len(fleets)
+
 
 class BattleshipAI:
-    def __init__(self):
+    def __init__(self, samples: int = MC_SAMPLES, time_limit_ms: int = MC_TIME_LIMIT_MS):
         self.board_size = 10
         self.ships = [5, 4, 3, 3, 2] 
+        self.samples = samples
+        self.time_limit_ms = time_limit_ms
         
-    def get_best_move(self, board_state: List[List[int]], difficulty: str = "hard") -> Tuple[int, int]:
+    def get_best_move(self, board_state: List[List[int]], difficulty: str = "hard",
+                      ships_remaining: Optional[List[int]] = None) -> Tuple[int, int]:
         """
         Determines move based on difficulty.
         0=Unknown, 1=Miss, 2=Hit, 3=Sunk
+        ships_remaining: lengths of the ships still afloat (the full fleet if not given)
         """
+        ships = ships_remaining or self.ships
+        if difficulty == 'hard':
+            # Hard samples whole fleets, which hunts and finishes damaged ships in one model
+            counts, fleets = sample_fleets(board_state, ships, self.samples, self.time_limit_ms)
+            move = self.best_sampled_cell(board_state, counts, fleets)
+            if move is not None:
+                return move
+            # No fleet fits the board (e.g. ships_remaining is wrong): fall back to the heuristics
+        return self.heuristic_move(board_state, difficulty, ships)
+
+    def heuristic_move(self, board_state: List[List[int]], difficulty: str, ships: List[int]) -> Tuple[int, int]:
+        """Target mode around open hits, otherwise a random (easy/medium) or heatmap (hard) hunt"""
         # 1. Check for 'Target Mode' (unfinished hits)
         # Even Medium AI should know how to finish a kill
         hits = []
-        for r in range(self.board_size):
-            for c in range(self.board_size):
+        for r in range(len(board_state)):
+            for c in range(len(board_state[r])):
                 if board_state[r][c] == 2: # Hit but not sunk
                     hits.append((r, c))
         
@@ -29,21 +196,34 @@ class BattleshipAI:
         elif difficulty == 'medium':
             return self._random_hunt(board_state) # Medium hunts randomly but targets smartly
         else:
-            return self._heatmap_hunt(board_state) # Hard uses math
+            return self._heatmap_hunt(board_state, ships) # Hard uses math
+
+    def best_sampled_cell(self, board, counts: List[int], fleets: int) -> Optional[Tuple[int, int]]:
+        """Unknown cell that the sampled fleets cover most often (random among ties); None without samples"""
+        if not fleets:
+            return None
+        cols = len(board[0])
+        unknown = [index for index, count in enumerate(counts) if board[index // cols][index % cols] == UNKNOWN]
+        if not unknown:
+            return None
+        best = max(counts[index] for index in unknown)
+        index = random.choice([index for index in unknown if counts[index] == best])
+        return (index // cols, index % cols)
 
     def _random_hunt(self, board) -> Tuple[int, int]:
         """Just pick a random valid spot"""
-        empties = [(r, c) for r in range(10) for c in range(10) if board[r][c] == 0]
+        empties = [(r, c) for r in range(len(board)) for c in range(len(board[r])) if board[r][c] == 0]
         if not empties: return (0,0)
         return random.choice(empties)
 
     def _target_mode(self, board, hits) -> Tuple[int, int]:
         """Smart targeting for damaged ships"""
+        rows, cols = len(board), len(board[0])
         candidates = []
         for r, c in hits:
             neighbors = [(r-1, c), (r+1, c), (r, c-1), (r, c+1)]
             for nr, nc in neighbors:
-                if 0 <= nr < self.board_size and 0 <= nc < self.board_size:
+                if 0 <= nr < rows and 0 <= nc < cols:
                     if board[nr][nc] == 0:
                         candidates.append((nr, nc))
                         
@@ -54,54 +234,30 @@ class BattleshipAI:
                 bot_r, _ = hits[-1]
                 priority = []
                 if top_r > 0 and board[top_r-1][col] == 0: priority.append((top_r-1, col))
-                if bot_r < 9 and board[bot_r+1][col] == 0: priority.append((bot_r+1, col))
+                if bot_r < rows - 1 and board[bot_r+1][col] == 0: priority.append((bot_r+1, col))
                 if priority: return random.choice(priority)
             if hits[0][0] == hits[1][0]: # Horizontal
                 row, left_c = hits[0]
                 _, right_c = hits[-1]
                 priority = []
                 if left_c > 0 and board[row][left_c-1] == 0: priority.append((row, left_c-1))
-                if right_c < 9 and board[row][right_c+1] == 0: priority.append((row, right_c+1))
+                if right_c < cols - 1 and board[row][right_c+1] == 0: priority.append((row, right_c+1))
                 if priority: return random.choice(priority)
 
         return random.choice(candidates) if candidates else self._random_hunt(board)
 
-    def _heatmap_hunt(self, board) -> Tuple[int, int]:
+    def _heatmap_hunt(self, board, ships: List[int]) -> Tuple[int, int]:
         """Probability Density Search (Hard Mode)"""
-        probability_grid = [[0]*10 for _ in range(10)]
-        
-        for ship_len in self.ships:
-            # Horizontal
-            for r in range(10):
-                for c in range(10 - ship_len + 1):
-                    valid = True
-                    for i in range(ship_len):
-                        if board[r][c+i] in [1, 3]: valid = False; break
-                    if valid:
-                        for i in range(ship_len):
-                            if board[r][c+i] == 0: probability_grid[r][c+i] += 1
-            # Vertical
-            for r in range(10 - ship_len + 1):
-                for c in range(10):
-                    valid = True
-                    for i in range(ship_len):
-                        if board[r+i][c] in [1, 3]: valid = False; break
-                    if valid:
-                        for i in range(ship_len):
-                            if board[r+i][c] == 0: probability_grid[r+i][c] += 1
-
-        best_score = -1
-        best_move = None
-        
-        for r in range(10):
-            for c in range(10):
-                if board[r][c] == 0:
-                    score = probability_grid[r][c]
-                    if (r + c) % 2 == 0: score += 5 # Parity
-                    score += random.randint(0, 2) # Noise
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_move = (r, c)
-        
-        return best_move or self._random_hunt(board)
\ No newline at end of file
+        grid = np.asarray(board)
+        unknown = grid == UNKNOWN
+        if not unknown.any():
+            return self._random_hunt(board)
+
+        score = placement_counts(grid, ships)
+        rows, cols = np.indices(grid.shape)
+        score += 5 * ((rows + cols) % 2 == 0) # Parity
+        score += np.random.randint(0, 3, size=grid.shape) # Noise
+        score[~unknown] = -1
+
+        r, c = np.unravel_index(int(np.argmax(score)), grid.shape)
+        return (int(r), int(c))
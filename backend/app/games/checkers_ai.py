@@ -1,192 +1,301 @@
 from typing import List, Dict, Any, Optional
 import random
-from .checkers_logic import CheckersGameLogic
+from .checkers_bitboard import (
+    CheckersPosition, Move, MoveCache, COLOR_INDEX, PIECE_CHARS, SQUARES, move_to_dict, square_row_col
+)
+from .checkers_endgame import EndgameTable, get_endgame_table
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, bound_flag
+from .search import SearchClock, SearchStats, SearchTimeout, iterative_deepening, resolve_search_budget
+
+PIECE_VALUES = (1, 3, 1, 3)  # man, king for each colour
+
+# Positions whose generated moves the search keeps (per engine, reused across moves)
+MOVE_CACHE_SIZE = 1 << 15
+# Transposition table size (2**bits entries); positions reached by transposed king moves are searched once
+TT_SIZE_BITS = 17
+
+
+def _build_eval_tables():
+    """EVAL_TABLES[side][piece][sq]: what a piece on a square is worth to `side`.
+
+    Material for both colours, plus the positional bonus for `side`'s own
+    pieces: advancement, centre columns and kings kept in their back rows.
+    """
+    tables = []
+    for side in range(2):
+        per_piece = []
+        for piece in range(4):
+            values = []
+            for sq in range(SQUARES):
+                row, col = square_row_col(sq)
+                if piece >> 1 != side:
+                    values.append(-PIECE_VALUES[piece])
+                    continue
+                value = PIECE_VALUES[piece] + (row if side == 0 else 7 - row) * 0.1
+                if 2 <= col <= 5:
+                    value += 0.05
+                if piece & 1 and (row <= 2 if side == 0 else row >= 5):
+                    value += 0.1
+                values.append(value)
+            per_piece.append(tuple(values))
+        tables.append(tuple(per_piece))
+    return tuple(tables)
+
+
+EVAL_TABLES = _build_eval_tables()
+
 
 class CheckersAI:
     def __init__(self, difficulty: str = 'medium'):
         self.difficulty = difficulty
+        # Maximum depth for iterative deepening; the time budget usually stops it first
         self.depth_limits = {
             'easy': 1,
             'medium': 2,
-            'hard': 3
+            'hard': 12
+        }
+        # Default wall-clock budget per move in milliseconds
+        self.time_budgets = {
+            'easy': 250,
+            'medium': 1000,
+            'hard': 3000
         }
-    
-    def get_best_move(self, board: List[List[Optional[str]]], player: str) -> Dict[str, Any]:
-        """Get the best move based on difficulty level"""
-        game_logic = CheckersGameLogic()
-        game_logic.board = [row[:] for row in board]
-        game_logic.current_player = player
-        
+        self.clock = SearchClock()
+        self.last_search: Optional[SearchStats] = None
+        self.pv_lines: Dict[int, List[Move]] = {}
+        self.previous_pv: List[Move] = []
+        self.move_cache = MoveCache(MOVE_CACHE_SIZE)
+        self.transposition_table = TranspositionTable(TT_SIZE_BITS)
+        self.table_player: Optional[str] = None
+        # Hard mode plays and searches with exact results once few pieces are left
+        self.use_endgame_table = difficulty == 'hard'
+        self.endgame_table: Optional[EndgameTable] = None
+
+    def get_best_move(self, board: List[List[Optional[str]]], player: str,
+                      time_budget_ms: Optional[int] = None, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Get the best move based on difficulty level (search stats are left in self.last_search).
+        With `max_depth` and no time budget, hard searches to exactly that depth."""
+        position = CheckersPosition.from_board(board, player)
+        self.clock = SearchClock(resolve_search_budget(
+            time_budget_ms, self.time_budgets.get(self.difficulty, self.time_budgets['hard']), max_depth
+        ))
+
         if self.difficulty == 'easy':
-            return self.get_easy_move(game_logic, player)
+            move = self.get_easy_move(position)
         elif self.difficulty == 'medium':
-            return self.get_medium_move(game_logic, player)
+            move = self.get_medium_move(position, player)
         else:  # hard
-            return self.get_hard_move(game_logic, player)
-    
-    def get_easy_move(self, game_logic: CheckersGameLogic, player: str) -> Dict[str, Any]:
-        """Easy AI: Prefer captures and random moves"""
-        moves = game_logic.get_legal_moves(player)
-        if not moves:
+            self.start_search(player)
+            move = self.get_endgame_move(position)
+            if move is None:
+                move = self.get_hard_move(position, player, max_depth)
+
+        if self.difficulty in ('easy', 'medium'):
+            self.last_search = SearchStats(1, self.clock.nodes, round(self.clock.elapsed_ms(), 1), False)
+        if move is None:
             return {}
-        
-        # Prefer capture moves
-        capture_moves = [move for move in moves if move.get('capture')]
-        if capture_moves:
-            return random.choice(capture_moves)
-        
-        # Otherwise random move
-        return random.choice(moves)
-    
-    def get_medium_move(self, game_logic: CheckersGameLogic, player: str) -> Dict[str, Any]:
+        return move_to_dict(move, PIECE_CHARS[position.piece_at(move[0][0])])
+
+    def start_search(self, player: str):
+        """Reset per-search state before searching for `player`"""
+        # Scores are from the AI's side, so entries from a search for the other colour can't be reused
+        if player != self.table_player:
+            self.transposition_table.clear()
+            self.table_player = player
+        self.transposition_table.new_search()
+        self.endgame_table = get_endgame_table() if self.use_endgame_table else None
+
+    def get_endgame_move(self, position: CheckersPosition) -> Optional[Move]:
+        """Exact move from the endgame table: fastest win, else a draw, else the slowest loss"""
+        if self.endgame_table is None or self.endgame_table.probe(position) is None:
+            return None
+
+        best_move, best_rank = None, None
+        for move in position.generate_moves():
+            position.push(move)
+            # Taking the opponent's last piece leaves a position the table doesn't hold: it has lost
+            result = self.endgame_table.probe(position) if position.occupancy[position.side] else None
+            position.pop()
+            if result is None or result.value < 0:
+                rank = (2, -result.distance if result else 0)
+            elif result.value == 0:
+                rank = (1, 0)
+            else:
+                rank = (0, result.distance)
+            if best_rank is None or rank > best_rank:
+                best_move, best_rank = move, rank
+
+        self.last_search = SearchStats(0, 0, round(self.clock.elapsed_ms(), 1), False, book=True)
+        return best_move
+
+    def get_easy_move(self, position: CheckersPosition) -> Optional[Move]:
+        """Easy AI: Prefer captures and random moves"""
+        # Captures are compulsory, so the move list is all captures whenever one exists
+        moves = position.generate_moves()
+        return random.choice(moves) if moves else None
+
+    def get_medium_move(self, position: CheckersPosition, player: str) -> Optional[Move]:
         """Medium AI: Basic evaluation function"""
-        moves = game_logic.get_legal_moves(player)
+        moves = position.generate_moves()
         if not moves:
-            return {}
-        
+            return None
+
         best_move = None
         best_score = float('-inf')
-        
+
         for move in moves:
-            # Create test board
-            test_logic = CheckersGameLogic()
-            test_logic.board = [row[:] for row in game_logic.board]
-            test_logic.current_player = player
-            
-            # Make the move
-            test_logic.make_move(move['from_row'], move['from_col'], 
-                               move['to_row'], move['to_col'])
-            
-            # Evaluate the position
-            score = self.evaluate_position(test_logic, player)
-            
+            position.push(move)
+            score = self.evaluate_position(position, player)
+            position.pop()
+
             if score > best_score:
                 best_score = score
                 best_move = move
-        
+
         return best_move or moves[0]
-    
-    def get_hard_move(self, game_logic: CheckersGameLogic, player: str) -> Dict[str, Any]:
+
+    def get_hard_move(self, position: CheckersPosition, player: str,
+                      max_depth: Optional[int] = None) -> Optional[Move]:
         """Hard AI: Minimax with alpha-beta pruning"""
-        depth = self.depth_limits['hard']
+        moves = list(self.move_cache.moves(position))
+        if not moves:
+            self.last_search = SearchStats(0, 0, round(self.clock.elapsed_ms(), 1), False)
+            return None
+
+        best_move, self.last_search = iterative_deepening(
+            lambda depth, pv: self.search_root(position, moves, depth, player, pv),
+            max_depth or self.depth_limits['hard'], self.clock, fallback_move=moves[0]
+        )
+        return best_move
+
+    def search_root(self, position: CheckersPosition, moves: List[Move], depth: int,
+                    player: str, previous_pv: List[Move]):
+        """One iterative-deepening iteration: returns (best move, score, principal variation)"""
+        self.previous_pv = previous_pv
+        ordered = moves[:]
+        if previous_pv and previous_pv[0] in ordered:
+            ordered.remove(previous_pv[0])
+            ordered.insert(0, previous_pv[0])
+
         best_move = None
         best_score = float('-inf')
-        
-        moves = game_logic.get_legal_moves(player)
-        if not moves:
-            return {}
-        
-        for move in moves:
-            test_logic = CheckersGameLogic()
-            test_logic.board = [row[:] for row in game_logic.board]
-            test_logic.current_player = player
-            
-            test_logic.make_move(move['from_row'], move['from_col'],
-                               move['to_row'], move['to_col'])
-            
-            score = self.minimax(test_logic, depth - 1, float('-inf'), float('inf'), False, player)
-            
-            if score > best_score:
-                best_score = score
-                best_move = move
-        
-        return best_move or moves[0]
-    
-    def minimax(self, game_logic: CheckersGameLogic, depth: int, alpha: float, beta: float, 
-                maximizing: bool, player: str) -> float:
+        best_line: List[Move] = []
+        alpha = float('-inf')
+        root_ply = len(position.history)
+
+        try:
+            for move in ordered:
+                position.push(move)
+                score = self.minimax(position, depth - 1, alpha, float('inf'), False, player, ply=1)
+                position.pop()
+
+                if best_move is None or score > best_score:
+                    best_score = score
+                    best_move = move
+                    best_line = [move] + self.pv_lines.get(1, [])
+
+                alpha = max(alpha, best_score)
+        except SearchTimeout:
+            # Unwind the moves the interrupted search left on the position
+            while len(position.history) > root_ply:
+                position.pop()
+            raise
+
+        if best_move is not None:
+            self.transposition_table.store(position.hash, depth, EXACT, best_score, best_move)
+        return best_move, best_score, best_line
+
+    def minimax(self, position: CheckersPosition, depth: int, alpha: float, beta: float,
+                maximizing: bool, player: str, ply: int = 0) -> float:
         """Minimax algorithm with alpha-beta pruning"""
-        if depth == 0 or game_logic.is_game_over():
-            return self.evaluate_position(game_logic, player)
-        
-        current_player = player if maximizing else ('white' if player == 'red' else 'red')
-        moves = game_logic.get_legal_moves(current_player)
-        
+        self.clock.tick()
+        self.pv_lines[ply] = []
+
+        # Few enough pieces left (after captures) for the endgame table to know the exact result
+        if self.endgame_table is not None:
+            result = self.endgame_table.probe(position)
+            if result is not None:
+                if result.value == 0:
+                    return 0
+                return float('inf') if (result.value > 0) == maximizing else float('-inf')
+
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = self.transposition_table.probe(position.hash)
+        if entry is not None:
+            tt_move = entry.best_move
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.value
+                if entry.flag == LOWER_BOUND:
+                    alpha = max(alpha, entry.value)
+                else:
+                    beta = min(beta, entry.value)
+                if beta <= alpha:
+                    return entry.value
+
+        if depth == 0:
+            return self.evaluate_position(position, player)
+
+        # One generator call (or cache hit) per node, and it doubles as the terminal check:
+        # the side to move with no legal move has lost
+        moves = self.move_cache.moves(position)
+        if not moves:
+            return float('-inf') if maximizing else float('inf')
+
+        # The previous iteration's principal variation move first, then the table's best move
+        first = []
+        if ply < len(self.previous_pv) and self.previous_pv[ply] in moves:
+            first.append(self.previous_pv[ply])
+        if tt_move is not None and tt_move not in first and tt_move in moves:
+            first.append(tt_move)
+        if first:
+            moves = first + [move for move in moves if move not in first]
+
+        best_move = None
         if maximizing:
             max_eval = float('-inf')
             for move in moves:
-                test_logic = CheckersGameLogic()
-                test_logic.board = [row[:] for row in game_logic.board]
-                test_logic.current_player = current_player
-                
-                test_logic.make_move(move['from_row'], move['from_col'],
-                                   move['to_row'], move['to_col'])
-                
-                eval_score = self.minimax(test_logic, depth - 1, alpha, beta, False, player)
+                position.push(move)
+                eval_score = self.minimax(position, depth - 1, alpha, beta, False, player, ply + 1)
+                position.pop()
+                if eval_score > max_eval or best_move is None:
+                    self.pv_lines[ply] = [move] + self.pv_lines.get(ply + 1, [])
+                    best_move = move
                 max_eval = max(max_eval, eval_score)
                 alpha = max(alpha, eval_score)
-                
+
                 if beta <= alpha:
                     break
+            self.transposition_table.store(position.hash, depth, bound_flag(max_eval, alpha_orig, beta_orig),
+                                           max_eval, best_move)
             return max_eval
         else:
             min_eval = float('inf')
             for move in moves:
-                test_logic = CheckersGameLogic()
-                test_logic.board = [row[:] for row in game_logic.board]
-                test_logic.current_player = current_player
-                
-                test_logic.make_move(move['from_row'], move['from_col'],
-                                   move['to_row'], move['to_col'])
-                
-                eval_score = self.minimax(test_logic, depth - 1, alpha, beta, True, player)
+                position.push(move)
+                eval_score = self.minimax(position, depth - 1, alpha, beta, True, player, ply + 1)
+                position.pop()
+                if eval_score < min_eval or best_move is None:
+                    self.pv_lines[ply] = [move] + self.pv_lines.get(ply + 1, [])
+                    best_move = move
                 min_eval = min(min_eval, eval_score)
                 beta = min(beta, eval_score)
-                
+
                 if beta <= alpha:
                     break
+            self.transposition_table.store(position.hash, depth, bound_flag(min_eval, alpha_orig, beta_orig),
+                                           min_eval, best_move)
             return min_eval
-    
-    def evaluate_position(self, game_logic: CheckersGameLogic, player: str) -> float:
-        """Evaluate the board position"""
+
+    def evaluate_position(self, position: CheckersPosition, player: str) -> float:
+        """Evaluate the board position: material for both sides plus positional bonuses for `player`"""
+        tables = EVAL_TABLES[COLOR_INDEX[player]]
         score = 0
-        
-        # Material score
-        for row in range(8):
-            for col in range(8):
-                piece = game_logic.board[row][col]
-                if piece:
-                    piece_value = self.get_piece_value(piece)
-                    if game_logic.get_piece_color(piece) == player:
-                        score += piece_value
-                    else:
-                        score -= piece_value
-        
-        # Position bonuses
-        score += self.evaluate_positional(game_logic, player)
-        
+        for piece, bits in enumerate(position.pieces):
+            values = tables[piece]
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                score += values[bit.bit_length() - 1]
         return score
-    
-    def get_piece_value(self, piece: str) -> int:
-        """Get the value of a piece"""
-        if piece.islower():  # Regular piece
-            return 1
-        else:  # King (uppercase)
-            return 3
-    
-    def evaluate_positional(self, game_logic: CheckersGameLogic, player: str) -> float:
-        """Evaluate positional advantages"""
-        score = 0
-        
-        # Encourage center control and advancement
-        for row in range(8):
-            for col in range(8):
-                piece = game_logic.board[row][col]
-                if piece and game_logic.get_piece_color(piece) == player:
-                    # Advancement bonus
-                    if player == 'red':
-                        score += row * 0.1  # Red wants to go down (rows 0-7)
-                    else:
-                        score += (7 - row) * 0.1  # White wants to go up (rows 7-0)
-                    
-                    # Center control bonus
-                    if 2 <= col <= 5:
-                        score += 0.05
-                    
-                    # King safety bonus (keep kings in back rows)
-                    if piece.isupper():  # King piece
-                        if player == 'red' and row <= 2:
-                            score += 0.1
-                        elif player == 'white' and row >= 5:
-                            score += 0.1
-        
-        return score
\ No newline at end of file
@@ -0,0 +1,301 @@
+import random
+from typing import List, Optional, Dict, Any, Tuple
+
+# Only the 32 dark squares are playable. They are numbered row by row,
+# square = row * 4 + col // 2, so square 0 is (0, 1) and square 31 is (7, 6)
+# on the API's 8x8 list board. Red starts on rows 0-2 and moves down, white
+# starts on rows 5-7 and moves up.
+RED, WHITE = 0, 1
+COLOR_INDEX = {'red': RED, 'white': WHITE}
+COLOR_NAMES = ('red', 'white')
+
+# Piece index = color * 2 + is_king
+RED_MAN, RED_KING, WHITE_MAN, WHITE_KING = range(4)
+PIECE_CHARS = "rRwW"
+PIECE_INDEX = {char: index for index, char in enumerate(PIECE_CHARS)}
+
+SQUARES = 32
+FULL_BOARD = (1 << SQUARES) - 1
+
+# A move is (path, captured): the squares the piece visits, start first, and a
+# bitmask of the pieces it jumps. A multi-jump is one move.
+Move = Tuple[Tuple[int, ...], int]
+
+
+def square_row_col(sq: int) -> Tuple[int, int]:
+    row = sq // 4
+    return row, (sq % 4) * 2 + (1 - row % 2)
+
+
+def square_index(row: int, col: int) -> int:
+    """Square number of an API board cell, or -1 for light or off-board cells"""
+    if not (0 <= row < 8 and 0 <= col < 8) or (row + col) % 2 == 0:
+        return -1
+    return row * 4 + col // 2
+
+
+# Diagonal directions: down-left, down-right, up-left, up-right
+DIRECTIONS = ((1, -1), (1, 1), (-1, -1), (-1, 1))
+ALL_DIRECTIONS = (0, 1, 2, 3)
+# Men only move (and capture) forwards
+MAN_DIRECTIONS = ((0, 1), (2, 3))
+# Rows where each colour's men are crowned
+PROMOTION_MASKS = (
+    sum(1 << square_index(7, col) for col in range(0, 8, 2)),
+    sum(1 << square_index(0, col) for col in range(1, 8, 2)),
+)
+
+
+def _build_tables():
+    """STEPS[sq][d] = neighbouring square (or -1); JUMPS[sq][d] = (jumped square, landing square) or None"""
+    steps, jumps = [], []
+    for sq in range(SQUARES):
+        row, col = square_row_col(sq)
+        step_row, jump_row = [], []
+        for dr, dc in DIRECTIONS:
+            step_row.append(square_index(row + dr, col + dc))
+            land = square_index(row + 2 * dr, col + 2 * dc)
+            jump_row.append((square_index(row + dr, col + dc), land) if land >= 0 else None)
+        steps.append(tuple(step_row))
+        jumps.append(tuple(jump_row))
+    return tuple(steps), tuple(jumps)
+
+
+STEPS, JUMPS = _build_tables()
+
+
+# Zobrist keys come from a fixed seed so hashes are stable across processes
+# and restarts (they are safe to persist or share between workers).
+_zobrist_rng = random.Random(0xC4EC_4E25)
+ZOBRIST_PIECES = [[_zobrist_rng.getrandbits(64) for _ in range(SQUARES)] for _ in range(4)]
+ZOBRIST_WHITE_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+
+def move_to_dict(move: Move, piece: Optional[str] = None) -> Dict[str, Any]:
+    """Convert a move to the dict used by the API (from/to are the first and last squares)"""
+    path, captured = move
+    from_row, from_col = square_row_col(path[0])
+    to_row, to_col = square_row_col(path[-1])
+    return {
+        'from_row': from_row,
+        'from_col': from_col,
+        'to_row': to_row,
+        'to_col': to_col,
+        'capture': captured != 0,
+        'path': [list(square_row_col(sq)) for sq in path],
+        'captured': [list(square_row_col(sq)) for sq in range(SQUARES) if captured >> sq & 1],
+        'piece': piece,
+    }
+
+
+class CheckersPosition:
+    """English draughts position on 32-square bitboards with in-place push/pop.
+
+    Same rules as the game: men move and capture diagonally forwards, kings
+    one square in any diagonal direction, captures are compulsory and a
+    capturing piece keeps jumping while it can (a man that reaches the far
+    row is crowned and its move ends there).
+    """
+    __slots__ = ('pieces', 'occupancy', 'mailbox', 'side', 'history', 'hash')
+
+    def __init__(self):
+        self.pieces = [0] * 4
+        self.occupancy = [0, 0]
+        self.mailbox: List[int] = [-1] * SQUARES
+        self.side = RED
+        # Zobrist hash, updated incrementally as pieces move
+        self.hash = 0
+        # Undo stack of (move, moving piece, captured pieces by square, promoted) for push/pop
+        self.history: List[tuple] = []
+
+    @classmethod
+    def from_board(cls, board: List[List[Optional[str]]], player: str = 'red') -> 'CheckersPosition':
+        """Build a position from the API's 8x8 list board"""
+        position = cls()
+        for row in range(8):
+            for col in range(8):
+                piece = board[row][col]
+                if piece:
+                    position._put(PIECE_INDEX[piece], square_index(row, col))
+        position.side = COLOR_INDEX[player]
+        if position.side == WHITE:
+            position.hash ^= ZOBRIST_WHITE_TO_MOVE
+        return position
+
+    def to_board(self) -> List[List[Optional[str]]]:
+        """Convert back to the API's 8x8 list board"""
+        board: List[List[Optional[str]]] = [[None] * 8 for _ in range(8)]
+        for sq, piece in enumerate(self.mailbox):
+            if piece >= 0:
+                row, col = square_row_col(sq)
+                board[row][col] = PIECE_CHARS[piece]
+        return board
+
+    @property
+    def player(self) -> str:
+        return COLOR_NAMES[self.side]
+
+    def _put(self, piece: int, sq: int):
+        bit = 1 << sq
+        self.pieces[piece] |= bit
+        self.occupancy[piece >> 1] |= bit
+        self.mailbox[sq] = piece
+        self.hash ^= ZOBRIST_PIECES[piece][sq]
+
+    def _remove(self, piece: int, sq: int):
+        bit = 1 << sq
+        self.pieces[piece] ^= bit
+        self.occupancy[piece >> 1] ^= bit
+        self.mailbox[sq] = -1
+        self.hash ^= ZOBRIST_PIECES[piece][sq]
+
+    def compute_hash(self) -> int:
+        """Zobrist hash computed from scratch (the incremental `hash` should always match it)"""
+        key = ZOBRIST_WHITE_TO_MOVE if self.side == WHITE else 0
+        for sq, piece in enumerate(self.mailbox):
+            if piece >= 0:
+                key ^= ZOBRIST_PIECES[piece][sq]
+        return key
+
+    def piece_at(self, sq: int) -> int:
+        """Piece index on a square, or -1 if empty"""
+        return self.mailbox[sq]
+
+    def generate_moves(self) -> List[Move]:
+        """Legal moves for the side to move: every complete jump chain if any capture exists, else simple moves"""
+        side = self.side
+        own = self.occupancy[side]
+        opponent = self.occupancy[side ^ 1]
+        kings = self.pieces[side * 2 + 1]
+        empty = FULL_BOARD & ~(own | opponent)
+
+        jumps: List[Move] = []
+        pieces = own
+        while pieces:
+            bit = pieces & -pieces
+            pieces ^= bit
+            sq = bit.bit_length() - 1
+            directions = ALL_DIRECTIONS if kings & bit else MAN_DIRECTIONS[side]
+            # The moving piece's own square counts as empty for the rest of the chain
+            self._jump_chains(sq, directions, not kings & bit, opponent, empty | bit, 0, (sq,), jumps)
+        if jumps:
+            return jumps
+
+        moves: List[Move] = []
+        pieces = own
+        while pieces:
+            bit = pieces & -pieces
+            pieces ^= bit
+            sq = bit.bit_length() - 1
+            steps = STEPS[sq]
+            for d in (ALL_DIRECTIONS if kings & bit else MAN_DIRECTIONS[side]):
+                target = steps[d]
+                if target >= 0 and empty >> target & 1:
+                    moves.append(((sq, target), 0))
+        return moves
+
+    def continuation_moves(self, sq: int, captured: int) -> List[Move]:
+        """Ways to finish a capture already under way: the piece on `sq` keeps jumping. The pieces in
+        `captured` were jumped earlier in the move, so they are still on the board but can't be jumped again.
+        Each move's path starts at `sq` and its captured mask includes `captured`."""
+        piece = self.mailbox[sq]
+        if piece < 0 or piece >> 1 != self.side:
+            return []
+        own = self.occupancy[piece >> 1]
+        opponent = self.occupancy[(piece >> 1) ^ 1]
+        empty = FULL_BOARD & ~(own | opponent)
+        directions = ALL_DIRECTIONS if piece & 1 else MAN_DIRECTIONS[piece >> 1]
+        moves: List[Move] = []
+        self._jump_chains(sq, directions, not piece & 1, opponent, empty, captured, (sq,), moves)
+        return moves
+
+    def _jump_chains(self, sq: int, directions, is_man: bool, opponent: int, empty: int, captured: int,
+                     path: Tuple[int, ...], out: List[Move]):
+        """Extend a capture sequence from `sq` as far as it goes, adding each finished chain to `out`"""
+        jumps = JUMPS[sq]
+        for d in directions:
+            jump = jumps[d]
+            if jump is None:
+                continue
+            over, land = jump
+            # Jumped pieces stay on the board until the move ends, so can't be jumped twice
+            if opponent >> over & 1 and not captured >> over & 1 and empty >> land & 1:
+                chain_path = path + (land,)
+                chain_captured = captured | (1 << over)
+                if is_man and PROMOTION_MASKS[self.side] >> land & 1:
+                    out.append((chain_path, chain_captured))
+                    continue
+                before = len(out)
+                self._jump_chains(land, directions, is_man, opponent, (empty | (1 << sq)) & ~(1 << land),
+                                  chain_captured, chain_path, out)
+                if len(out) == before:
+                    out.append((chain_path, chain_captured))
+
+    def push(self, move: Move):
+        """Play a move in place, recording what is needed to undo it"""
+        path, captured = move
+        from_sq, to_sq = path[0], path[-1]
+        piece = self.mailbox[from_sq]
+
+        taken = []
+        bits = captured
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            sq = bit.bit_length() - 1
+            taken.append((sq, self.mailbox[sq]))
+            self._remove(self.mailbox[sq], sq)
+
+        self._remove(piece, from_sq)
+        promoted = not piece & 1 and PROMOTION_MASKS[piece >> 1] >> to_sq & 1
+        self._put(piece | 1 if promoted else piece, to_sq)
+        self.side ^= 1
+        self.hash ^= ZOBRIST_WHITE_TO_MOVE
+        self.history.append((move, piece, taken))
+
+    def pop(self) -> Move:
+        """Undo the last pushed move and return it"""
+        move, piece, taken = self.history.pop()
+        path = move[0]
+
+        self._remove(self.mailbox[path[-1]], path[-1])
+        self._put(piece, path[0])
+        for sq, captured_piece in taken:
+            self._put(captured_piece, sq)
+        self.side ^= 1
+        self.hash ^= ZOBRIST_WHITE_TO_MOVE
+        return move
+
+
+class MoveCache:
+    """Bounded cache of generate_moves() results keyed by Zobrist hash.
+
+    Each entry keeps a copy of the piece bitboards it was generated from, so
+    a hash collision is a miss rather than another position's moves. When
+    full, the oldest entry is dropped. Results are tuples: copy before
+    reordering them.
+    """
+
+    def __init__(self, size: int = 1 << 15):
+        self.size = max(1, size)
+        self.entries: Dict[int, Tuple[List[int], Tuple[Move, ...]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def moves(self, position: CheckersPosition) -> Tuple[Move, ...]:
+        entry = self.entries.get(position.hash)
+        if entry is not None and entry[0] == position.pieces:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        moves = tuple(position.generate_moves())
+        if len(self.entries) >= self.size:
+            del self.entries[next(iter(self.entries))]
+        self.entries[position.hash] = (position.pieces[:], moves)
+        return moves
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,139 @@
+import mmap
+import os
+import struct
+from itertools import product
+from math import comb
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .checkers_bitboard import CheckersPosition, SQUARES
+
+# File layout (little-endian):
+#   header  "CKEG", version u16, max pieces u16, slice count u32
+#   slice table: red men, red kings, white men, white kings, side to move (u8 each), offset u32
+#   values: one signed byte per position, from the side to move's point of view:
+#           0 draw, d + 1 won in d plies, -(d + 1) lost in d plies
+# A slice holds every position with one material count and side to move; a
+# position's place in it comes from the squares of each piece type (see index()).
+TABLE_MAGIC = b"CKEG"
+TABLE_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+SLICE = struct.Struct("<5BI")
+
+DEFAULT_TABLE_PATH = Path(__file__).resolve().parent.parent / "data" / "checkers_endgame.bin"
+TABLE_PATH = Path(os.getenv("CHECKERS_ENDGAME_PATH", DEFAULT_TABLE_PATH))
+
+Material = Tuple[int, int, int, int]  # piece count per piece index (red man, red king, white man, white king)
+
+
+class EndgameResult(NamedTuple):
+    value: int     # 1 win, 0 draw, -1 loss for the side to move
+    distance: int  # Plies until the game ends with best play (0 for draws)
+
+
+def slice_size(material: Material) -> int:
+    size = 1
+    for count in material:
+        size *= comb(SQUARES, count)
+    return size
+
+
+def material_slices(max_pieces: int) -> List[Tuple[Material, int]]:
+    """(material, side to move) of every slice with 2..max_pieces pieces and both colours on the board"""
+    slices = []
+    for total in range(2, max_pieces + 1):
+        for material in product(range(total + 1), repeat=4):
+            if sum(material) == total and material[0] + material[1] and material[2] + material[3]:
+                slices.extend((material, side) for side in (0, 1))
+    return slices
+
+
+def material_of(position: CheckersPosition) -> Material:
+    pieces = position.pieces
+    return (pieces[0].bit_count(), pieces[1].bit_count(), pieces[2].bit_count(), pieces[3].bit_count())
+
+
+def index(position: CheckersPosition) -> int:
+    """Position's place within its slice: the combination rank of each piece type's squares, mixed radix"""
+    result = 0
+    for bits in position.pieces:
+        count = bits.bit_count()
+        rank, k = 0, 0
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            k += 1
+            rank += comb(bit.bit_length() - 1, k)
+        result = result * comb(SQUARES, count) + rank
+    return result
+
+
+def encode(value: int, distance: int) -> int:
+    if value == 0:
+        return 0
+    if distance > 126:
+        raise ValueError(f"distance {distance} doesn't fit the table's value byte")
+    return distance + 1 if value > 0 else -(distance + 1)
+
+
+def decode(byte: int) -> EndgameResult:
+    if byte == 0:
+        return EndgameResult(0, 0)
+    return EndgameResult(1, byte - 1) if byte > 0 else EndgameResult(-1, -byte - 1)
+
+
+def write_table(path: Path, max_pieces: int, slices: Iterable[Tuple[Material, int, bytes]]):
+    """Write (material, side to move, values) slices as a table file"""
+    slices = list(slices)
+    offset = HEADER.size + SLICE.size * len(slices)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(TABLE_MAGIC, TABLE_VERSION, max_pieces, len(slices)))
+        for material, side, values in slices:
+            f.write(SLICE.pack(*material, side, offset))
+            offset += len(values)
+        for _, _, values in slices:
+            f.write(values)
+
+
+class EndgameTable:
+    """Read-only endgame table, memory-mapped so every worker process shares one copy in the page cache"""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces, count = HEADER.unpack_from(self.data, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} checkers endgame table")
+        self.offsets: Dict[Tuple[Material, int], int] = {}
+        for slot in range(count):
+            *material, side, offset = SLICE.unpack_from(self.data, HEADER.size + slot * SLICE.size)
+            self.offsets[(tuple(material), side)] = offset
+
+    def probe(self, position: CheckersPosition) -> Optional[EndgameResult]:
+        """Exact result for the side to move; None if the position has too many pieces"""
+        if (position.occupancy[0] | position.occupancy[1]).bit_count() > self.max_pieces:
+            return None
+        offset = self.offsets.get((material_of(position), position.side))
+        if offset is None:
+            return None
+        byte = self.data[offset + index(position)]
+        return decode(byte - 256 if byte > 127 else byte)
+
+    def close(self):
+        self.data.close()
+
+
+_table: Optional[EndgameTable] = None
+_table_loaded = False
+
+
+def get_endgame_table() -> Optional[EndgameTable]:
+    """The process-wide endgame table, opened on first use; None if no table file has been built"""
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        try:
+            _table = EndgameTable(TABLE_PATH)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Checkers endgame table not loaded: {e}")
+    return _table
@@ -1,156 +1,117 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from .checkers_bitboard import (
+    CheckersPosition, Move, MoveCache, JUMPS, PIECE_CHARS, move_to_dict, square_index, square_row_col
+)
+
+# Legal moves of recently seen positions, shared by every game in the process: the
+# move, state and game-over checks of one request all read the same generated list
+LEGAL_MOVES = MoveCache(4096)
+
 class CheckersGameLogic:
+    """Checkers rules for the API's 8x8 list board, backed by CheckersPosition.
+
+    A multi-jump can be played in one call (from the start square to the
+    final landing square) or one hop at a time: after a hop that can keep
+    capturing, `jump_from` holds the piece's square and the same player must
+    continue with it. As in a whole move, the pieces jumped so far stay on
+    the board (listed in `jump_captured`, and not jumpable again) until the
+    chain ends, so both ways accept exactly the same moves.
+    """
     def __init__(self):
         self.board = self.initialize_board()
         self.current_player = 'red'  # red starts first
         self.selected_piece = None
-        self.must_capture = False
-        
+        # (row, col) of a piece in the middle of a multi-jump, which must keep jumping
+        self.jump_from: Optional[Tuple[int, int]] = None
+        # (row, col) of the pieces that multi-jump has jumped so far; removed when it ends
+        self.jump_captured: List[Tuple[int, int]] = []
+
     def initialize_board(self) -> List[List[Optional[str]]]:
         """Initialize the checkers board with pieces"""
         board = [[None for _ in range(8)] for _ in range(8)]
-        
+
         # Place red pieces (top)
         for row in range(3):
             for col in range(8):
                 if (row + col) % 2 == 1:
                     board[row][col] = 'r'  # red piece
-        
+
         # Place white pieces (bottom)
         for row in range(5, 8):
             for col in range(8):
                 if (row + col) % 2 == 1:
                     board[row][col] = 'w'  # white piece
-                    
+
         return board
-    
+
+    def position(self, player: Optional[str] = None) -> CheckersPosition:
+        return CheckersPosition.from_board(self.board, player or self.current_player)
+
+    def _moves(self, position: CheckersPosition) -> List[Move]:
+        if self.jump_from and position.player == self.current_player:
+            # The rest of the multi-jump under way (its captured mask includes the earlier jumps)
+            captured = sum(1 << square_index(row, col) for row, col in self.jump_captured)
+            return position.continuation_moves(square_index(*self.jump_from), captured)
+        return list(LEGAL_MOVES.moves(position))
+
     def get_legal_moves(self, player: str) -> List[Dict[str, Any]]:
-        """Get all legal moves for a player"""
-        moves = []
-        capture_moves = []
-        
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and self.get_piece_color(piece) == player:
-                    piece_moves = self.get_piece_moves(row, col, piece)
-                    
-                    # Separate capture and regular moves
-                    for move in piece_moves:
-                        if move.get('capture'):
-                            capture_moves.append(move)
-                        else:
-                            moves.append(move)
-        
-        # If captures are available, only capture moves are legal
-        if capture_moves:
-            return capture_moves
-        return moves
-    
+        """Get all legal moves for a player (a multi-jump is one move, with its full path)"""
+        position = self.position(player)
+        return [move_to_dict(move, PIECE_CHARS[position.piece_at(move[0][0])]) for move in self._moves(position)]
+
     def get_piece_color(self, piece: str) -> str:
         """Get the color of a piece"""
         return 'red' if piece.lower() == 'r' else 'white'
-    
-    def get_piece_moves(self, row: int, col: int, piece: str) -> List[Dict[str, Any]]:
-        """Get possible moves for a specific piece"""
-        moves = []
-        color = self.get_piece_color(piece)
-        is_king = piece.isupper()
-        
-        # Directions: (row_delta, col_delta)
-        if color == 'red' or is_king:
-            # Red moves down or king moves both directions
-            moves.extend(self.get_moves_in_direction(row, col, piece, 1))
-        if color == 'white' or is_king:
-            # White moves up or king moves both directions
-            moves.extend(self.get_moves_in_direction(row, col, piece, -1))
-            
-        return moves
-    
-    def get_moves_in_direction(self, row: int, col: int, piece: str, row_delta: int) -> List[Dict[str, Any]]:
-        """Get moves in a specific direction"""
-        moves = []
-        color = self.get_piece_color(piece)
-        
-        # Check normal moves (1 square)
-        for col_delta in [-1, 1]:
-            new_row, new_col = row + row_delta, col + col_delta
-            if self.is_valid_position(new_row, new_col) and self.board[new_row][new_col] is None:
-                moves.append({
-                    'from_row': row,
-                    'from_col': col,
-                    'to_row': new_row,
-                    'to_col': new_col,
-                    'capture': False,
-                    'piece': piece
-                })
-        
-        # Check capture moves (2 squares)
-        for col_delta in [-2, 2]:
-            new_row, new_col = row + (2 * row_delta), col + col_delta
-            capture_row, capture_col = row + row_delta, col + (col_delta // 2)
-            
-            if (self.is_valid_position(new_row, new_col) and 
-                self.board[new_row][new_col] is None and
-                self.is_valid_position(capture_row, capture_col)):
-                
-                captured_piece = self.board[capture_row][capture_col]
-                if (captured_piece and 
-                    self.get_piece_color(captured_piece) != color and
-                    self.board[new_row][new_col] is None):
-                    
-                    moves.append({
-                        'from_row': row,
-                        'from_col': col,
-                        'to_row': new_row,
-                        'to_col': new_col,
-                        'capture': True,
-                        'captured_row': capture_row,
-                        'captured_col': capture_col,
-                        'piece': piece
-                    })
-        
-        return moves
-    
+
     def is_valid_position(self, row: int, col: int) -> bool:
         """Check if position is within board bounds"""
         return 0 <= row < 8 and 0 <= col < 8
-    
-    def make_move(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
-        """Make a move on the board"""
-        piece = self.board[from_row][from_col]
-        if not piece:
+
+    def make_move(self, from_row: int, from_col: int, to_row: int, to_col: int,
+                  path: Optional[List[List[int]]] = None) -> bool:
+        """Make a move on the board: a whole move, or the next hop of a multi-jump.
+
+        A target one step or jump away is always read as that hop, so every
+        chain can be played hop by hop; any other target is the final square
+        of a whole move. `path` ([row, col] per square, as in the move dicts)
+        picks one whole move exactly, as the AI's moves are applied.
+        """
+        from_sq, to_sq = square_index(from_row, from_col), square_index(to_row, to_col)
+        if from_sq < 0 or to_sq < 0:
             return False
-        
-        # Get all legal moves for this piece
-        legal_moves = self.get_piece_moves(from_row, from_col, piece)
-        move_made = None
-        
-        for move in legal_moves:
-            if (move['to_row'] == to_row and move['to_col'] == to_col):
-                move_made = move
-                break
-        
-        if not move_made:
+
+        position = self.position()
+        moves = [move for move in self._moves(position) if move[0][0] == from_sq]
+
+        hops = [move for move in moves if move[0][1] == to_sq]
+        if path is not None:
+            squares = tuple(square_index(row, col) for row, col in path)
+            move_made = next((move for move in moves if move[0] == squares), None)
+        elif hops:
+            move_made = next((move for move in hops if len(move[0]) == 2), None)
+        else:
+            move_made = next((move for move in moves if move[0][-1] == to_sq), None)
+
+        # The whole move (or the rest of one): every jumped piece goes
+        if move_made:
+            position.push(move_made)
+            self.board = position.to_board()
+            self.jump_from = None
+            self.jump_captured = []
+            # Switch player
+            self.current_player = 'white' if self.current_player == 'red' else 'red'
+            return True
+
+        # Or the next hop of a longer jump: the piece moves, the jumped piece stays until the chain ends
+        if path is not None or not hops:
             return False
-        
-        # Perform the move
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = None
-        
-        # Handle captures
-        if move_made['capture']:
-            self.board[move_made['captured_row']][move_made['captured_col']] = None
-        
-        # Check for promotion to king
-        if self.should_promote(to_row, piece):
-            self.board[to_row][to_col] = piece.upper()  # Make it a king
-        
-        # Switch player
-        self.current_player = 'white' if self.current_player == 'red' else 'red'
-        
+        over = next(jump[0] for jump in JUMPS[from_sq] if jump and jump[1] == to_sq)
+        position.push(((from_sq, to_sq), 0))
+        self.board = position.to_board()
+        self.jump_from = (to_row, to_col)
+        self.jump_captured = self.jump_captured + [square_row_col(over)]
         return True
-    
+
     def should_promote(self, row: int, piece: str) -> bool:
         """Check if a piece should be promoted to king"""
         color = self.get_piece_color(piece)
@@ -159,28 +120,17 @@ class CheckersGameLogic:
         if color == 'white' and row == 0:  # White reaches top
             return True
         return False
-    
+
     def is_game_over(self) -> bool:
-        """Check if the game is over"""
-        red_moves = self.get_legal_moves('red')
-        white_moves = self.get_legal_moves('white')
-        
-        return len(red_moves) == 0 or len(white_moves) == 0
-    
+        """Check if the game is over: the player to move has no legal move"""
+        return not self._moves(self.position())
+
     def get_winner(self) -> Optional[str]:
-        """Get the winner if game is over"""
+        """Get the winner if game is over (the player who just moved)"""
         if not self.is_game_over():
             return None
-        
-        red_moves = self.get_legal_moves('red')
-        white_moves = self.get_legal_moves('white')
-        
-        if len(red_moves) == 0:
-            return 'white'
-        elif len(white_moves) == 0:
-            return 'red'
-        return None
-    
+        return 'white' if self.current_player == 'red' else 'red'
+
     def get_board_state(self) -> Dict[str, Any]:
         """Get the current board state for API response"""
         return {
@@ -188,4 +138,4 @@ class CheckersGameLogic:
             'current_player': self.current_player,
             'game_over': self.is_game_over(),
             'winner': self.get_winner()
-        }
\ No newline at end of file
+        }
@@ -1,66 +1,76 @@
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+from typing import Collection, List, Dict, Any, Optional, Tuple
 import random
-import pymongo
 from .chess_logic import ChessGameLogic
-import os
-from dotenv import load_dotenv
+from .chess_bitboard import (
+    BitboardPosition, WHITE, BLACK, PAWN, FILE_MASKS,
+    move_from, move_to, move_to_dict,
+)
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, bound_flag
+from .search import (
+    RootBounds, SearchClock, SearchStats, SearchTimeout, SplitResult, iterative_deepening, resolve_search_budget,
+    split_root_search,
+)
 
-base_dir = Path(__file__).resolve().parent.parent.parent 
-env_path = base_dir / ".env"
-print(env_path)
-load_dotenv(dotenv_path=env_path) # Load variables from .env file
+# Indexed by piece type (pawn, knight, bishop, rook, queen, king)
+CAPTURE_VALUES = (1, 3, 3, 5, 9, 100)
+MATERIAL_VALUES = (1, 3, 3.25, 5, 9, 100)
+PIECE_TYPES = 'pnbrqk'
 
-# Ensure your .env file has keys: MONGO_URL and DB_NAME
-MONGO_URI = os.getenv("MONGODB_URL") 
-DB_NAME = os.getenv("DATABASE_NAME")
+# 2**16 slots per request; each ChessAI (one per move request) gets its own table
+TT_SIZE_BITS = 16
+# Evaluations are fractional; root scores closer than this count as a tie in a split search
+TIE_MARGIN = 1e-6
 
-# ==========================================
 
-class ChessMemory:
-    def __init__(self):
-        try:
-            print(MONGO_URI, DB_NAME)
-            self.client = pymongo.MongoClient(MONGO_URI)
-            self.db = self.client[DB_NAME]
-            self.collection = self.db["chess_learning_memory"]
-            print(f"✅ AI Brain connected to MongoDB Atlas: {DB_NAME}")
-        except Exception as e:
-            print(f"⚠️ AI Memory Connection Failed: {e}")
-            self.collection = None
+def move_to_str(move: int) -> str:
+    """Format a packed move the way move_history stores it (e.g. 'e2e4')"""
+    move_dict = move_to_dict(move)
+    return f"{move_dict['from']}{move_dict['to']}"
 
-    def serialize_board(self, board):
-        return str(board)
+def find_fatal_move(move_history: List[str]) -> Optional[Tuple[List[List[Optional[str]]], str]]:
+    """Replay a lost game up to the AI's last move; returns (board before it, the move)"""
+    from app.models.chess_models import create_initial_board
+    if len(move_history) < 2: return None
 
-    def mark_bad_move(self, board, move_str):
-        if self.collection is None: return
-        state_key = self.serialize_board(board)
-        self.collection.update_one(
-            {"state": state_key}, 
-            {"$addToSet": {"bad_moves": move_str}},
-            upsert=True
-        )
-        print(f"[AI Memory] 🧠 Learned: Avoid {move_str} in this position.")
+    temp_logic = ChessGameLogic(create_initial_board())
+    # Replay to state BEFORE AI made the bad move
+    for move_str in move_history[:-2]:
+        from_sq, to_sq = move_str[:2], move_str[2:4]
+        temp_logic.make_move(from_sq, to_sq)
 
-    def is_bad_move(self, board, move_str):
-        if self.collection is None: return False
-        state_key = self.serialize_board(board)
-        result = self.collection.find_one({
-            "state": state_key,
-            "bad_moves": move_str
-        })
-        return result is not None
+    return temp_logic.board, move_history[-2]
 
 class ChessAI:
     def __init__(self, difficulty: str):
         self.difficulty = difficulty
+        # Maximum depth for iterative deepening; the time budget usually stops it first
         self.depth_limits = {
             'easy': 1,
             'medium': 2, 
-            'hard': 3
+            'hard': 8
         }
+        # Default wall-clock budget per move in milliseconds
+        self.time_budgets = {
+            'easy': 250,
+            'medium': 1000,
+            'hard': 3000
+        }
+        self.transposition_table = TranspositionTable(TT_SIZE_BITS)
+        self.table_player: Optional[str] = None
+        # Only take table scores searched to exactly the depth needed, so a score never depends
+        # on what happened to be searched before (set for reproducible split searches)
+        self.reproducible = False
+        self.clock = SearchClock()
+        self.last_search: Optional[SearchStats] = None
+        # Principal variation found below each ply in the current iteration, and the last completed one
+        self.pv_lines: Dict[int, List[int]] = {}
+        self.previous_pv: List[int] = []
         self.position_weights = self._initialize_position_weights()
-        self.memory = ChessMemory() # MongoDB Brain
+        # Same tables flattened to square index for the bitboard evaluator
+        self.square_weights = [
+            [weight for row in self.position_weights[piece_type] for weight in row]
+            for piece_type in PIECE_TYPES
+        ]
 
     def _initialize_position_weights(self) -> Dict[str, List[List[float]]]:
         """Initialize positional weights for better piece placement"""
@@ -104,49 +114,50 @@ class ChessAI:
             ]
         }
 
-    def learn_from_loss(self, move_history: List[str]):
-        """Replay game and mark the fatal mistake in MongoDB"""
-        from app.models.chess_models import create_initial_board
-        temp_board = create_initial_board()
-        temp_logic = ChessGameLogic(temp_board)
-        
-        if len(move_history) < 2: return
-
-        last_ai_move_str = move_history[-2]
-        
-        # Replay to state BEFORE AI made the bad move
-        for i in range(len(move_history) - 2):
-            move_str = move_history[i]
-            from_sq, to_sq = move_str[:2], move_str[2:4]
-            temp_logic.make_move(from_sq, to_sq)
-            
-        self.memory.mark_bad_move(temp_logic.board, last_ai_move_str)
-
-    def get_best_move(self, board: List[List[Optional[str]]], player: str) -> Dict[str, Any]:
-        game_logic = ChessGameLogic([row[:] for row in board])
+    def get_best_move(self, board: List[List[Optional[str]]], player: str,
+                      time_budget_ms: Optional[int] = None,
+                      avoid_moves: Collection[str] = (), max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Pick a move within the difficulty's time budget (or the request's, if given).
+        Hard mode skips `avoid_moves` (learned bad moves, e.g. 'e2e4') unless nothing else is legal.
+        With `max_depth` and no time budget, medium and hard search to exactly that depth.
+        Search depth and node count are left in self.last_search."""
+        position = BitboardPosition.from_board(board, player)
+        self.clock = SearchClock(resolve_search_budget(time_budget_ms, self.time_budgets[self.difficulty], max_depth))
         
         if self.difficulty == 'easy':
-            return self.get_easy_move(game_logic, player)
+            move = self.get_easy_move(position, player)
+            self.last_search = SearchStats(self.depth_limits['easy'], self.clock.nodes,
+                                           round(self.clock.elapsed_ms(), 1), False)
         elif self.difficulty == 'medium':
-            return self.get_medium_move(game_logic, player)
+            self.start_search(player)
+            move = self.get_medium_move(position, player, max_depth)
         else:  # hard
-            return self.get_hard_move(game_logic, player)
+            self.start_search(player)
+            move = self.get_hard_move(position, player, avoid_moves, max_depth)
+        
+        return move_to_dict(move) if move is not None else {}
+
+    def start_search(self, player: str):
+        """Reset per-search state before searching for `player`"""
+        # Scores are from the AI's side, so entries from a search for the other colour can't be reused
+        if player != self.table_player:
+            self.transposition_table.clear()
+            self.table_player = player
+        # Entries from earlier searches (and other games) stay usable but can be overwritten
+        self.transposition_table.new_search()
 
-    def get_easy_move(self, game_logic: ChessGameLogic, player: str) -> Dict[str, Any]:
-        moves = game_logic.get_legal_moves(player)
-        if not moves: return {}
+    def get_easy_move(self, position: BitboardPosition, player: str) -> Optional[int]:
+        moves = position.generate_legal_moves()
+        self.clock.nodes += len(moves)
+        if not moves: return None
             
         capturing_moves = []
         for move in moves:
-            from_row, from_col = game_logic.from_square(move['from'])
-            to_row, to_col = game_logic.from_square(move['to'])
-            target = game_logic.board[to_row][to_col]
+            target = position.piece_at(move_to(move))
             
-            if target:
-                piece_values = {'p': 1, 'n': 3, 'b': 3, 'r': 5, 'q': 9, 'k': 100}
-                target_value = piece_values.get(target.lower(), 0)
-                moving_piece = game_logic.board[from_row][from_col]
-                moving_value = piece_values.get(moving_piece.lower(), 0)
+            if target >= 0:
+                target_value = CAPTURE_VALUES[target % 6]
+                moving_value = CAPTURE_VALUES[position.piece_at(move_from(move)) % 6]
                 
                 if target_value >= moving_value: 
                     capturing_moves.append((move, target_value))
@@ -158,13 +169,11 @@ class ChessAI:
         ranked_moves = []
         for move in moves:
             score = 0
-            to_row, to_col = game_logic.from_square(move['to'])
+            to_row, to_col = divmod(move_to(move), 8)
             
             if 2 <= to_row <= 5 and 2 <= to_col <= 5: score += 1
             
-            test_logic = ChessGameLogic([row[:] for row in game_logic.board])
-            test_logic.make_move(move['from'], move['to'])
-            if test_logic.is_check('white' if player == 'black' else 'black'):
+            if position.gives_check(move):
                 score += 3
                 
             ranked_moves.append((move, score))
@@ -175,86 +184,124 @@ class ChessAI:
         
         return random.choice(moves)
 
-    def get_medium_move(self, game_logic: ChessGameLogic, player: str) -> Dict[str, Any]:
-        depth = self.depth_limits['medium']
-        best_move = None
-        best_value = float('-inf')
-        
-        moves = game_logic.get_legal_moves(player)
+    def get_medium_move(self, position: BitboardPosition, player: str,
+                        max_depth: Optional[int] = None) -> Optional[int]:
+        moves = position.generate_legal_moves()
         random.shuffle(moves)
         
-        alpha = float('-inf')
-        beta = float('inf')
-        
-        for move in moves:
-            test_logic = ChessGameLogic([row[:] for row in game_logic.board])
-            test_logic.make_move(move['from'], move['to'])
-            
-            value = self.minimax(test_logic, depth - 1, alpha, beta, False, player)
-            
-            if value > best_value:
-                best_value = value
-                best_move = move
-                alpha = max(alpha, best_value)
-        
-        return best_move or (moves[0] if moves else {})
+        best_move, self.last_search = iterative_deepening(
+            lambda depth, pv: self.search_root(position, moves, depth, player, pv),
+            max_depth or self.depth_limits['medium'], self.clock,
+            fallback_move=moves[0] if moves else None
+        )
+        return best_move
 
-    def get_hard_move(self, game_logic: ChessGameLogic, player: str) -> Dict[str, Any]:
-        depth = self.depth_limits['hard']
-        best_move = None
-        best_value = float('-inf')
+    def get_hard_move(self, position: BitboardPosition, player: str,
+                      avoid_moves: Collection[str] = (), max_depth: Optional[int] = None) -> Optional[int]:
+        moves = position.generate_legal_moves()
+        moves = self.order_moves(position, moves, player)
         
-        moves = game_logic.get_legal_moves(player)
-        moves = self.order_moves(game_logic, moves, player)
-        
-        # --- INTELLIGENT FILTERING (MongoDB) ---
-        safe_moves = []
-        for move in moves:
-            move_str = f"{move['from']}{move['to']}"
-            if not self.memory.is_bad_move(game_logic.board, move_str):
-                safe_moves.append(move)
+        # --- INTELLIGENT FILTERING (moves learned as bad in this position) ---
+        safe_moves = [move for move in moves if move_to_str(move) not in avoid_moves]
         
         search_moves = safe_moves if safe_moves else moves
 
+        # Try the best move from any earlier search of this position first
+        entry = self.transposition_table.probe(position.hash)
+        if entry is not None and entry.best_move in search_moves:
+            search_moves.remove(entry.best_move)
+            search_moves.insert(0, entry.best_move)
+
+        best_move, self.last_search = iterative_deepening(
+            lambda depth, pv: self.search_root(position, search_moves, depth, player, pv),
+            max_depth or self.depth_limits['hard'], self.clock,
+            fallback_move=search_moves[0] if search_moves else None
+        )
+        return best_move
+
+    def get_split_move(self, board: List[List[Optional[str]]], player: str, share: int, shares: int,
+                       bounds: RootBounds, time_budget_ms: Optional[int] = None,
+                       avoid_moves: Collection[str] = (), max_depth: Optional[int] = None) -> SplitResult:
+        """This process's share of a hard search split over several processes by root move.
+        Moves in the result are dicts; with `max_depth` and no time budget it searches to that depth."""
+        position = BitboardPosition.from_board(board, player)
+        self.clock = SearchClock(resolve_search_budget(time_budget_ms, self.time_budgets['hard'], max_depth))
+        self.start_search(player)
+        self.previous_pv = []
+        
+        # Same order (and bad-move filtering) in every process, so root move indices agree
+        moves = self.order_moves(position, position.generate_legal_moves(), player)
+        moves = [move for move in moves if move_to_str(move) not in avoid_moves] or moves
+        root_ply = len(position.history)
+        
+        def search_move(move: int, depth: int, alpha: float) -> float:
+            position.push(move)
+            try:
+                return self.minimax(position, depth - 1, alpha, float('inf'), False, player, ply=1)
+            finally:
+                while len(position.history) > root_ply:
+                    position.pop()
+        
+        result = split_root_search(search_move, moves, share, shares, bounds,
+                                   max_depth or self.depth_limits['hard'], self.clock, TIE_MARGIN)
+        index, move = result.fallback
+        return result._replace(
+            best=[(score, index, move_to_dict(move)) for score, index, move in result.best],
+            fallback=(index, move_to_dict(move) if move is not None else None)
+        )
+
+    def search_root(self, position: BitboardPosition, moves: List[int], depth: int, player: str,
+                    previous_pv: List[int]):
+        """One iteration of iterative deepening: alpha-beta over the root moves to a fixed depth.
+        Returns (best move, score, principal variation)."""
+        self.previous_pv = previous_pv
+        ordered = moves[:]
+        if previous_pv and previous_pv[0] in ordered:
+            ordered.remove(previous_pv[0])
+            ordered.insert(0, previous_pv[0])
+        
+        best_move = None
+        best_value = float('-inf')
+        best_line: List[int] = []
         alpha = float('-inf')
         beta = float('inf')
+        root_ply = len(position.history)
         
-        for move in search_moves:
-            test_logic = ChessGameLogic([row[:] for row in game_logic.board])
-            test_logic.make_move(move['from'], move['to'])
-            
-            value = self.minimax(test_logic, depth - 1, alpha, beta, False, player)
-            
-            if value > best_value:
-                best_value = value
-                best_move = move
-            
-            alpha = max(alpha, best_value)
-            if beta <= alpha:
-                break
-        
-        return best_move or (moves[0] if moves else {})
+        try:
+            for move in ordered:
+                position.push(move)
+                value = self.minimax(position, depth - 1, alpha, beta, False, player, ply=1)
+                position.pop()
+                
+                if best_move is None or value > best_value:
+                    best_value = value
+                    best_move = move
+                    best_line = [move] + self.pv_lines.get(1, [])
+                
+                alpha = max(alpha, best_value)
+        except SearchTimeout:
+            # Unwind the moves the interrupted search left on the position
+            while len(position.history) > root_ply:
+                position.pop()
+            raise
+        
+        if best_move is not None:
+            self.transposition_table.store(position.hash, depth, EXACT, best_value, best_move)
+        return best_move, best_value, best_line
 
-    def order_moves(self, game_logic: ChessGameLogic, moves: List[Dict], player: str) -> List[Dict]:
+    def order_moves(self, position: BitboardPosition, moves: List[int], player: str) -> List[int]:
         scored_moves = []
         
         for move in moves:
             score = 0
-            from_row, from_col = game_logic.from_square(move['from'])
-            to_row, to_col = game_logic.from_square(move['to'])
-            
-            moving_piece = game_logic.board[from_row][from_col]
-            target_piece = game_logic.board[to_row][to_col]
+            target_piece = position.piece_at(move_to(move))
             
-            if target_piece:
-                piece_values = {'p': 1, 'n': 3, 'b': 3, 'r': 5, 'q': 9, 'k': 100}
-                victim_value = piece_values.get(target_piece.lower(), 0)
-                aggressor_value = piece_values.get(moving_piece.lower(), 0)
+            if target_piece >= 0:
+                victim_value = CAPTURE_VALUES[target_piece % 6]
+                aggressor_value = CAPTURE_VALUES[position.piece_at(move_from(move)) % 6]
                 score += 10 + victim_value - aggressor_value
             
-            test_logic = ChessGameLogic([row[:] for row in game_logic.board])
-            test_logic.make_move(move['from'], move['to'])
-            if test_logic.is_check('white' if player == 'black' else 'black'):
+            if position.gives_check(move):
                 score += 5
                 
             scored_moves.append((score, move))
@@ -262,52 +309,104 @@ class ChessAI:
         scored_moves.sort(key=lambda x: x[0], reverse=True)
         return [move for _, move in scored_moves]
 
-    def minimax(self, game_logic: ChessGameLogic, depth: int, alpha: float, beta: float, 
-                maximizing: bool, player: str) -> float:
-        current_player = player if maximizing else ('black' if player == 'white' else 'white')
+    def sort_captures_first(self, position: BitboardPosition, moves: List[int]):
+        """Cheap in-search ordering: MVV-LVA captures ahead of quiet moves (sorts in place)"""
+        mailbox = position.mailbox
         
-        if game_logic.is_checkmate(current_player):
-            return float('-inf') if maximizing else float('inf')
+        def capture_score(move: int) -> int:
+            victim = mailbox[move_to(move)]
+            if victim < 0:
+                return 0
+            return CAPTURE_VALUES[victim % 6] * 10 - CAPTURE_VALUES[mailbox[move_from(move)] % 6] + 1000
         
-        if game_logic.is_stalemate(current_player):
-            return 0
+        moves.sort(key=capture_score, reverse=True)
+
+    def minimax(self, position: BitboardPosition, depth: int, alpha: float, beta: float, 
+                maximizing: bool, player: str, ply: int = 0) -> float:
+        self.clock.tick()
+        self.pv_lines[ply] = []
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = self.transposition_table.probe(position.hash)
+        if entry is not None:
+            tt_move = entry.best_move
+            if entry.depth == depth or (entry.depth > depth and not self.reproducible):
+                if entry.flag == EXACT:
+                    return entry.value
+                if entry.flag == LOWER_BOUND:
+                    alpha = max(alpha, entry.value)
+                else:
+                    beta = min(beta, entry.value)
+                if beta <= alpha:
+                    return entry.value
         
-        if depth == 0:
-            return self.quiescence_search(game_logic, alpha, beta, maximizing, player)
+        # At the horizon only a side in check needs the full move list (to spot mate);
+        # otherwise quiescence search takes over with captures only
+        if depth == 0 and not position.is_check():
+            return self.quiescence_search(position, alpha, beta, maximizing, player)
+        
+        moves = position.generate_legal_moves()
         
-        moves = game_logic.get_legal_moves(current_player)
+        if not moves:
+            if position.is_check():  # Checkmate
+                return float('-inf') if maximizing else float('inf')
+            return 0  # Stalemate
         
+        if depth == 0:
+            return self.quiescence_search(position, alpha, beta, maximizing, player)
+        
+        # Captures first (most valuable victim, least valuable attacker), then the table's best
+        # move, then the previous iteration's principal variation move at this ply
+        self.sort_captures_first(position, moves)
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        if ply < len(self.previous_pv) and self.previous_pv[ply] in moves:
+            pv_move = self.previous_pv[ply]
+            moves.remove(pv_move)
+            moves.insert(0, pv_move)
+        
+        best_move = None
         if maximizing:
             max_eval = float('-inf')
             for move in moves:
-                test_logic = ChessGameLogic([row[:] for row in game_logic.board])
-                test_logic.make_move(move['from'], move['to'])
-                
-                eval = self.minimax(test_logic, depth - 1, alpha, beta, False, player)
-                max_eval = max(max_eval, eval)
+                position.push(move)
+                eval = self.minimax(position, depth - 1, alpha, beta, False, player, ply + 1)
+                position.pop()
+                if best_move is None or eval > max_eval:
+                    max_eval = eval
+                    best_move = move
+                    self.pv_lines[ply] = [move] + self.pv_lines.get(ply + 1, [])
                 alpha = max(alpha, eval)
                 
                 if beta <= alpha:
                     break
+            self.transposition_table.store(position.hash, depth, bound_flag(max_eval, alpha_orig, beta_orig),
+                                           max_eval, best_move)
             return max_eval
         else:
             min_eval = float('inf')
             for move in moves:
-                test_logic = ChessGameLogic([row[:] for row in game_logic.board])
-                test_logic.make_move(move['from'], move['to'])
-                
-                eval = self.minimax(test_logic, depth - 1, alpha, beta, True, player)
-                min_eval = min(min_eval, eval)
+                position.push(move)
+                eval = self.minimax(position, depth - 1, alpha, beta, True, player, ply + 1)
+                position.pop()
+                if best_move is None or eval < min_eval:
+                    min_eval = eval
+                    best_move = move
+                    self.pv_lines[ply] = [move] + self.pv_lines.get(ply + 1, [])
                 beta = min(beta, eval)
                 
                 if beta <= alpha:
                     break
+            self.transposition_table.store(position.hash, depth, bound_flag(min_eval, alpha_orig, beta_orig),
+                                           min_eval, best_move)
             return min_eval
 
-    def quiescence_search(self, game_logic: ChessGameLogic, alpha: float, beta: float, 
+    def quiescence_search(self, position: BitboardPosition, alpha: float, beta: float, 
                          maximizing: bool, player: str) -> float:
         """Quiescence search to avoid horizon effect"""
-        stand_pat = self.evaluate_position(game_logic, player)
+        self.clock.tick()
+        stand_pat = self.evaluate_position(position, player)
         
         if maximizing:
             if stand_pat >= beta: return beta
@@ -316,15 +415,13 @@ class ChessAI:
             if stand_pat <= alpha: return alpha
             beta = min(beta, stand_pat)
         
-        current_player = player if maximizing else ('black' if player == 'white' else 'white')
-        moves = game_logic.get_legal_moves(current_player)
-        capture_moves = [move for move in moves if self.is_capture_move(game_logic, move)]
+        capture_moves = position.generate_legal_moves(captures_only=True)
+        self.sort_captures_first(position, capture_moves)
         
         for move in capture_moves:
-            test_logic = ChessGameLogic([row[:] for row in game_logic.board])
-            test_logic.make_move(move['from'], move['to'])
-            
-            score = self.quiescence_search(test_logic, alpha, beta, not maximizing, player)
+            position.push(move)
+            score = self.quiescence_search(position, alpha, beta, not maximizing, player)
+            position.pop()
             
             if maximizing:
                 if score >= beta: return beta
@@ -333,85 +430,69 @@ class ChessAI:
                 if score <= alpha: return alpha
                 beta = min(beta, score)
         
-        return stand_pat
+        # Best of standing pat and the captures, clamped to the window like the cutoffs above
+        return alpha if maximizing else beta
 
-    def is_capture_move(self, game_logic: ChessGameLogic, move: Dict) -> bool:
-        from_row, from_col = game_logic.from_square(move['from'])
-        to_row, to_col = game_logic.from_square(move['to'])
-        return game_logic.board[to_row][to_col] is not None
+    def is_capture_move(self, position: BitboardPosition, move: int) -> bool:
+        return position.is_capture(move)
 
-    def evaluate_position(self, game_logic: ChessGameLogic, player: str) -> float:
+    def evaluate_position(self, position: BitboardPosition, player: str) -> float:
         """Comprehensive position evaluation"""
         score = 0
-        score += self.evaluate_material(game_logic)
-        score += self.evaluate_positional(game_logic)
-        score += self.evaluate_mobility(game_logic)
-        score += self.evaluate_pawn_structure(game_logic)
-        score += self.evaluate_king_safety(game_logic)
+        score += self.evaluate_material(position)
+        score += self.evaluate_positional(position)
+        score += self.evaluate_mobility(position)
+        score += self.evaluate_pawn_structure(position)
+        score += self.evaluate_king_safety(position)
         
         if player == 'black':
             score = -score
             
         return score
 
-    def evaluate_material(self, game_logic: ChessGameLogic) -> float:
+    def evaluate_material(self, position: BitboardPosition) -> float:
         score = 0
-        piece_values = {'p': 1, 'n': 3, 'b': 3.25, 'r': 5, 'q': 9, 'k': 100}
-        
-        for i in range(8):
-            for j in range(8):
-                piece = game_logic.board[i][j]
-                if piece:
-                    value = piece_values.get(piece.lower(), 0)
-                    if piece.isupper(): score += value
-                    else: score -= value
+        pieces = position.pieces
+        for piece_type, value in enumerate(MATERIAL_VALUES):
+            score += value * (pieces[piece_type].bit_count() - pieces[piece_type + 6].bit_count())
         return score
 
-    def evaluate_positional(self, game_logic: ChessGameLogic) -> float:
+    def evaluate_positional(self, position: BitboardPosition) -> float:
         score = 0
-        for i in range(8):
-            for j in range(8):
-                piece = game_logic.board[i][j]
-                if piece:
-                    piece_type = piece.lower()
-                    if piece_type in self.position_weights:
-                        weight = self.position_weights[piece_type][i][j]
-                        if piece.isupper(): score += weight
-                        else: score -= weight
+        for piece, bb in enumerate(position.pieces):
+            weights = self.square_weights[piece % 6]
+            total = 0
+            while bb:
+                low = bb & -bb
+                total += weights[low.bit_length() - 1]
+                bb ^= low
+            if piece < 6: score += total
+            else: score -= total
         return score
 
-    def evaluate_mobility(self, game_logic: ChessGameLogic) -> float:
+    def evaluate_mobility(self, position: BitboardPosition) -> float:
         # Simplified mobility to prevent recursion depth issues in evaluation
         # But we keep the structure so you can enable it if you optimize
         return 0
 
-    def evaluate_pawn_structure(self, game_logic: ChessGameLogic) -> float:
+    def evaluate_pawn_structure(self, position: BitboardPosition) -> float:
         score = 0
-        white_doubled = self.count_doubled_pawns(game_logic, 'white')
-        black_doubled = self.count_doubled_pawns(game_logic, 'black')
+        white_doubled = self.count_doubled_pawns(position, 'white')
+        black_doubled = self.count_doubled_pawns(position, 'black')
         score += (black_doubled - white_doubled) * 0.5
         
-        white_isolated = self.count_isolated_pawns(game_logic, 'white')
-        black_isolated = self.count_isolated_pawns(game_logic, 'black')
+        white_isolated = self.count_isolated_pawns(position, 'white')
+        black_isolated = self.count_isolated_pawns(position, 'black')
         score += (black_isolated - white_isolated) * 0.5
         return score
 
-    def count_doubled_pawns(self, game_logic: ChessGameLogic, player: str) -> int:
-        pawns_per_file = [0] * 8
-        pawn_piece = 'P' if player == 'white' else 'p'
-        for i in range(8):
-            for j in range(8):
-                if game_logic.board[i][j] == pawn_piece:
-                    pawns_per_file[j] += 1
-        return sum(1 for count in pawns_per_file if count > 1)
+    def count_doubled_pawns(self, position: BitboardPosition, player: str) -> int:
+        pawns = position.pieces[PAWN if player == 'white' else PAWN + 6]
+        return sum(1 for file_mask in FILE_MASKS if (pawns & file_mask).bit_count() > 1)
 
-    def count_isolated_pawns(self, game_logic: ChessGameLogic, player: str) -> int:
-        pawn_files = set()
-        pawn_piece = 'P' if player == 'white' else 'p'
-        for i in range(8):
-            for j in range(8):
-                if game_logic.board[i][j] == pawn_piece:
-                    pawn_files.add(j)
+    def count_isolated_pawns(self, position: BitboardPosition, player: str) -> int:
+        pawns = position.pieces[PAWN if player == 'white' else PAWN + 6]
+        pawn_files = {file for file, file_mask in enumerate(FILE_MASKS) if pawns & file_mask}
         
         isolated = 0
         for file in pawn_files:
@@ -419,8 +500,8 @@ class ChessAI:
                 isolated += 1
         return isolated
 
-    def evaluate_king_safety(self, game_logic: ChessGameLogic) -> float:
+    def evaluate_king_safety(self, position: BitboardPosition) -> float:
         score = 0
-        if game_logic.is_check('white'): score -= 0.5
-        if game_logic.is_check('black'): score += 0.5
-        return score
\ No newline at end of file
+        if position.is_check(WHITE): score -= 0.5
+        if position.is_check(BLACK): score += 0.5
+        return score
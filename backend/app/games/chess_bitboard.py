@@ -0,0 +1,409 @@
+import random
+from typing import List, Optional, Dict, Any
+
+# Squares are numbered row * 8 + col so they line up with the list-of-lists
+# board used by the API: square 0 is a8, square 7 is h8, square 63 is h1.
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+PIECE_CHARS = "PNBRQKpnbrqk"
+PIECE_INDEX = {char: index for index, char in enumerate(PIECE_CHARS)}
+COLOR_INDEX = {'white': WHITE, 'black': BLACK}
+COLOR_NAMES = ('white', 'black')
+
+FULL_BOARD = (1 << 64) - 1
+FILE_MASKS = [sum(1 << (row * 8 + col) for row in range(8)) for col in range(8)]
+
+
+# Zobrist keys come from a fixed seed so hashes are stable across processes
+# and restarts (they are safe to persist or share between workers).
+_zobrist_rng = random.Random(0x5EED_C4E55)
+ZOBRIST_PIECES = [[_zobrist_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+
+def _build_leaper_table(offsets) -> List[int]:
+    """Attack masks for pieces that jump a fixed set of offsets (knight, king, pawn)"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        mask = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                mask |= 1 << (r * 8 + c)
+        table.append(mask)
+    return table
+
+
+def _build_ray_table(dr: int, dc: int) -> List[int]:
+    """Squares reachable from each square in one direction on an empty board"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        mask = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            mask |= 1 << (r * 8 + c)
+            r += dr
+            c += dc
+        table.append(mask)
+    return table
+
+
+KNIGHT_ATTACKS = _build_leaper_table([(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                                      (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _build_leaper_table([(1, 0), (-1, 0), (0, 1), (0, -1),
+                                    (1, 1), (1, -1), (-1, 1), (-1, -1)])
+# White pawns move up the board (towards row 0), black pawns move down
+PAWN_ATTACKS = [_build_leaper_table([(-1, -1), (-1, 1)]),
+                _build_leaper_table([(1, -1), (1, 1)])]
+
+# Rays are split by whether they run towards higher or lower square indices,
+# which tells us whether the nearest blocker is the lowest or highest set bit.
+ROOK_RAYS_UP = [_build_ray_table(1, 0), _build_ray_table(0, 1)]
+ROOK_RAYS_DOWN = [_build_ray_table(-1, 0), _build_ray_table(0, -1)]
+BISHOP_RAYS_UP = [_build_ray_table(1, 1), _build_ray_table(1, -1)]
+BISHOP_RAYS_DOWN = [_build_ray_table(-1, 1), _build_ray_table(-1, -1)]
+
+
+def _slide(sq: int, occupied: int, rays_up: List[List[int]], rays_down: List[List[int]]) -> int:
+    attacks = 0
+    for rays in rays_up:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in rays_down:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    return _slide(sq, occupied, ROOK_RAYS_UP, ROOK_RAYS_DOWN)
+
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    return _slide(sq, occupied, BISHOP_RAYS_UP, BISHOP_RAYS_DOWN)
+
+
+def encode_move(from_sq: int, to_sq: int, promotion: int = 0) -> int:
+    """Pack a move into a single int: 6 bits from, 6 bits to, 3 bits promotion piece type"""
+    return from_sq | (to_sq << 6) | (promotion << 12)
+
+
+def move_from(move: int) -> int:
+    return move & 63
+
+
+def move_to(move: int) -> int:
+    return (move >> 6) & 63
+
+
+def move_promotion(move: int) -> int:
+    return move >> 12
+
+
+def square_name(sq: int) -> str:
+    """Convert a square index to chess notation (e.g., 0 -> 'a8')"""
+    row, col = divmod(sq, 8)
+    return f"{chr(97 + col)}{8 - row}"
+
+
+def square_index(name: str) -> int:
+    """Convert chess notation to a square index (e.g., 'a8' -> 0)"""
+    return (8 - int(name[1])) * 8 + (ord(name[0]) - 97)
+
+
+def move_to_dict(move: int) -> Dict[str, Any]:
+    """Convert a packed move to the {'from', 'to'} dict used by the API"""
+    return {"from": square_name(move & 63), "to": square_name((move >> 6) & 63)}
+
+
+def placement_key(board: List[List[Optional[str]]]) -> int:
+    """Zobrist hash of the piece placement alone, as a signed 64-bit int (fits Mongo's Int64)"""
+    key = 0
+    for row in range(8):
+        for col, piece in enumerate(board[row]):
+            if piece:
+                key ^= ZOBRIST_PIECES[PIECE_INDEX[piece]][row * 8 + col]
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def placement_fen(board: List[List[Optional[str]]]) -> str:
+    """Piece-placement field of a FEN, e.g. 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR'"""
+    ranks = []
+    for row in board:
+        rank, empty = "", 0
+        for piece in row:
+            if piece:
+                rank += (str(empty) if empty else "") + piece
+                empty = 0
+            else:
+                empty += 1
+        ranks.append(rank + (str(empty) if empty else ""))
+    return "/".join(ranks)
+
+
+class BitboardPosition:
+    """Compact chess position: one 64-bit int per piece type and colour.
+
+    Follows the same rules as ChessGameLogic (no castling or en passant,
+    pawns always promote to a queen) so that moves chosen by the search are
+    accepted by the route's legality check.
+    """
+    __slots__ = ('pieces', 'occupancy', 'mailbox', 'side', 'history', 'hash')
+
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.mailbox: List[int] = [-1] * 64
+        self.side = WHITE
+        # Zobrist hash, updated incrementally as pieces move
+        self.hash = 0
+        # Undo stack of (move, moved piece, captured piece) for push/pop
+        self.history: List[tuple] = []
+
+    @classmethod
+    def from_board(cls, board: List[List[Optional[str]]], player: str = 'white') -> 'BitboardPosition':
+        """Build a position from the API's 8x8 list board"""
+        position = cls()
+        for row in range(8):
+            for col in range(8):
+                piece = board[row][col]
+                if piece:
+                    position._put(PIECE_INDEX[piece], row * 8 + col)
+        position.side = COLOR_INDEX[player]
+        if position.side == BLACK:
+            position.hash ^= ZOBRIST_BLACK_TO_MOVE
+        return position
+
+    def to_board(self) -> List[List[Optional[str]]]:
+        """Convert back to the API's 8x8 list board"""
+        return [
+            [PIECE_CHARS[p] if p >= 0 else None for p in self.mailbox[row * 8:row * 8 + 8]]
+            for row in range(8)
+        ]
+
+    def copy(self) -> 'BitboardPosition':
+        position = BitboardPosition.__new__(BitboardPosition)
+        position.pieces = self.pieces[:]
+        position.occupancy = self.occupancy[:]
+        position.mailbox = self.mailbox[:]
+        position.side = self.side
+        position.history = self.history[:]
+        position.hash = self.hash
+        return position
+
+    @property
+    def player(self) -> str:
+        return COLOR_NAMES[self.side]
+
+    def _put(self, piece: int, sq: int):
+        bit = 1 << sq
+        self.pieces[piece] |= bit
+        self.occupancy[piece // 6] |= bit
+        self.mailbox[sq] = piece
+        self.hash ^= ZOBRIST_PIECES[piece][sq]
+
+    def _remove(self, piece: int, sq: int):
+        bit = 1 << sq
+        self.pieces[piece] ^= bit
+        self.occupancy[piece // 6] ^= bit
+        self.mailbox[sq] = -1
+        self.hash ^= ZOBRIST_PIECES[piece][sq]
+
+    def compute_hash(self) -> int:
+        """Zobrist hash computed from scratch (the incremental `hash` should always match it)"""
+        key = ZOBRIST_BLACK_TO_MOVE if self.side == BLACK else 0
+        for sq, piece in enumerate(self.mailbox):
+            if piece >= 0:
+                key ^= ZOBRIST_PIECES[piece][sq]
+        return key
+
+    def piece_at(self, sq: int) -> int:
+        """Piece index on a square, or -1 if empty"""
+        return self.mailbox[sq]
+
+    def is_capture(self, move: int) -> bool:
+        return self.mailbox[(move >> 6) & 63] >= 0
+
+    def push(self, move: int):
+        """Play a move in place, recording what is needed to undo it"""
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        promotion = move >> 12
+        piece = self.mailbox[from_sq]
+        captured = self.mailbox[to_sq]
+
+        if captured >= 0:
+            self._remove(captured, to_sq)
+        self._remove(piece, from_sq)
+        self._put((piece // 6) * 6 + promotion if promotion else piece, to_sq)
+        self.side ^= 1
+        self.hash ^= ZOBRIST_BLACK_TO_MOVE
+        self.history.append((move, piece, captured))
+
+    def pop(self) -> int:
+        """Undo the last pushed move and return it"""
+        move, piece, captured = self.history.pop()
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+
+        self._remove(self.mailbox[to_sq], to_sq)
+        self._put(piece, from_sq)
+        if captured >= 0:
+            self._put(captured, to_sq)
+        self.side ^= 1
+        self.hash ^= ZOBRIST_BLACK_TO_MOVE
+        return move
+
+    def king_square(self, color: int) -> int:
+        king = self.pieces[color * 6 + KING]
+        return (king & -king).bit_length() - 1
+
+    def is_square_attacked(self, sq: int, by_color: int) -> bool:
+        pieces = self.pieces
+        base = by_color * 6
+        if PAWN_ATTACKS[by_color ^ 1][sq] & pieces[base + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[sq] & pieces[base + KING]:
+            return True
+        occupied = self.occupancy[0] | self.occupancy[1]
+        diagonal = pieces[base + BISHOP] | pieces[base + QUEEN]
+        if diagonal and bishop_attacks(sq, occupied) & diagonal:
+            return True
+        straight = pieces[base + ROOK] | pieces[base + QUEEN]
+        if straight and rook_attacks(sq, occupied) & straight:
+            return True
+        return False
+
+    def is_check(self, color: Optional[int] = None) -> bool:
+        """Check if a colour (default: side to move) is in check. A missing king counts as check."""
+        if color is None:
+            color = self.side
+        king_sq = self.king_square(color)
+        if king_sq < 0:
+            return True
+        return self.is_square_attacked(king_sq, color ^ 1)
+
+    def gives_check(self, move: int) -> bool:
+        self.push(move)
+        check = self.is_check()
+        self.pop()
+        return check
+
+    def generate_pseudo_legal_moves(self, captures_only: bool = False) -> List[int]:
+        """Moves for the side to move, ignoring whether they leave the king in check"""
+        us = self.side
+        base = us * 6
+        pieces = self.pieces
+        own = self.occupancy[us]
+        enemy = self.occupancy[us ^ 1]
+        occupied = own | enemy
+        targets = enemy if captures_only else ~own & FULL_BOARD
+        moves = []
+
+        # Pawns
+        step = -8 if us == WHITE else 8
+        start_row = 6 if us == WHITE else 1
+        promotion_row = 0 if us == WHITE else 7
+        bb = pieces[base + PAWN]
+        while bb:
+            low = bb & -bb
+            sq = low.bit_length() - 1
+            bb ^= low
+            attacks = PAWN_ATTACKS[us][sq] & enemy
+            forward = sq + step
+            if not captures_only and 0 <= forward < 64 and not (occupied >> forward) & 1:
+                promotion = QUEEN if forward // 8 == promotion_row else 0
+                moves.append(sq | (forward << 6) | (promotion << 12))
+                double = forward + step
+                if sq // 8 == start_row and not (occupied >> double) & 1:
+                    moves.append(sq | (double << 6))
+            while attacks:
+                low_target = attacks & -attacks
+                to_sq = low_target.bit_length() - 1
+                attacks ^= low_target
+                promotion = QUEEN if to_sq // 8 == promotion_row else 0
+                moves.append(sq | (to_sq << 6) | (promotion << 12))
+
+        # Knights and king
+        for piece_type, table in ((KNIGHT, KNIGHT_ATTACKS), (KING, KING_ATTACKS)):
+            bb = pieces[base + piece_type]
+            while bb:
+                low = bb & -bb
+                sq = low.bit_length() - 1
+                bb ^= low
+                attacks = table[sq] & targets
+                while attacks:
+                    low_target = attacks & -attacks
+                    attacks ^= low_target
+                    moves.append(sq | ((low_target.bit_length() - 1) << 6))
+
+        # Sliding pieces
+        bishops = pieces[base + BISHOP] | pieces[base + QUEEN]
+        rooks = pieces[base + ROOK] | pieces[base + QUEEN]
+        for bb, rays_up, rays_down in ((bishops, BISHOP_RAYS_UP, BISHOP_RAYS_DOWN),
+                                       (rooks, ROOK_RAYS_UP, ROOK_RAYS_DOWN)):
+            while bb:
+                low = bb & -bb
+                sq = low.bit_length() - 1
+                bb ^= low
+                attacks = _slide(sq, occupied, rays_up, rays_down) & targets
+                while attacks:
+                    low_target = attacks & -attacks
+                    attacks ^= low_target
+                    moves.append(sq | ((low_target.bit_length() - 1) << 6))
+
+        return moves
+
+    def pinned_pieces(self, color: int, king_sq: int) -> int:
+        """Bitboard of `color`'s pieces pinned to its king by an enemy slider"""
+        own = self.occupancy[color]
+        occupied = own | self.occupancy[color ^ 1]
+        base = (color ^ 1) * 6
+        queens = self.pieces[base + QUEEN]
+        pinned = 0
+        for attacks_fn, sliders in ((rook_attacks, self.pieces[base + ROOK] | queens),
+                                    (bishop_attacks, self.pieces[base + BISHOP] | queens)):
+            if not sliders:
+                continue
+            seen = attacks_fn(king_sq, occupied)
+            blockers = seen & own
+            while blockers:
+                low = blockers & -blockers
+                blockers ^= low
+                # Removing the blocker reveals a slider behind it -> pinned
+                if attacks_fn(king_sq, occupied ^ low) & ~seen & sliders:
+                    pinned |= low
+        return pinned
+
+    def generate_legal_moves(self, captures_only: bool = False) -> List[int]:
+        """Legal moves for the side to move (moves that don't leave own king in check)"""
+        us = self.side
+        king_sq = self.king_square(us)
+        if king_sq < 0:
+            return []  # No king: treated as permanently in check, like ChessGameLogic
+        in_check = self.is_square_attacked(king_sq, us ^ 1)
+        pinned = 0 if in_check else self.pinned_pieces(us, king_sq)
+
+        legal = []
+        for move in self.generate_pseudo_legal_moves(captures_only):
+            from_sq = move & 63
+            # When not in check, only king moves and pinned pieces need a make/unmake test
+            if not in_check and from_sq != king_sq and not (pinned >> from_sq) & 1:
+                legal.append(move)
+                continue
+            self.push(move)
+            if not self.is_check(us):
+                legal.append(move)
+            self.pop()
+        return legal
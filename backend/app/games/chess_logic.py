@@ -3,6 +3,8 @@ from typing import List, Optional, Tuple, Dict, Any
 class ChessGameLogic:
     def __init__(self, board: List[List[Optional[str]]]):
         self.board = board
+        # Undo stack of (move, from_row, from_col, to_row, to_col, piece, captured)
+        self.move_stack: List[Tuple[Dict[str, Any], int, int, int, int, str, Optional[str]]] = []
         self.piece_values = {
             'p': 1, 'n': 3, 'b': 3, 'r': 5, 'q': 9, 'k': 100,
             'P': -1, 'N': -3, 'B': -3, 'R': -5, 'Q': -9, 'K': -100
@@ -18,13 +20,13 @@ class ChessGameLogic:
                     piece_moves = self.get_piece_moves(i, j, piece)
                     # Filter moves that would leave king in check
                     for move in piece_moves:
-                        # Create a temporary logic instance to test the move
-                        test_board = [row[:] for row in self.board]  # Deep copy of the board
-                        test_logic = ChessGameLogic(test_board)
-                        test_logic.make_move(move['from'], move['to'])
+                        # Try the move in place and undo it afterwards
+                        self.push(move)
+                        in_check = self.is_check(player)
+                        self.pop()
                         
                         # Only add move if it doesn't result in self-check
-                        if not test_logic.is_check(player):
+                        if not in_check:
                             all_moves.append(move)
         return all_moves
 
@@ -160,6 +162,27 @@ class ChessGameLogic:
         
         return True
 
+    def push(self, move: Dict[str, Any]) -> bool:
+        """Make a move in place and record it on the undo stack"""
+        from_row, from_col = self.from_square(move['from'])
+        to_row, to_col = self.from_square(move['to'])
+        piece = self.board[from_row][from_col]
+        captured = self.board[to_row][to_col]
+        
+        if not self.make_move(move['from'], move['to'], move.get('promotion')):
+            return False
+
+        # The piece as it was before moving, so pop also undoes a promotion
+        self.move_stack.append((move, from_row, from_col, to_row, to_col, piece, captured))
+        return True
+
+    def pop(self) -> Dict[str, Any]:
+        """Undo the last pushed move, restoring any captured piece and the unpromoted pawn"""
+        move, from_row, from_col, to_row, to_col, piece, captured = self.move_stack.pop()
+        self.board[from_row][from_col] = piece
+        self.board[to_row][to_col] = captured
+        return move
+
     def evaluate_board(self) -> float:
         """Evaluate the board position (positive favors white, negative favors black)"""
         score = 0
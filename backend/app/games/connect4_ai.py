@@ -1,26 +1,108 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Optional, Tuple
 import random
 from .connect4_logic import Connect4GameLogic
+from .connect4_bitboard import (
+    Connect4Position, COLUMN_MASKS, CENTER_ORDER, MAX_MOVES, evaluate, winning_cells
+)
+from .connect4_book import get_book
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND, bound_flag
+from .search import (
+    RootBounds, SearchClock, SearchStats, SearchTimeout, SplitResult, iterative_deepening, resolve_search_budget,
+    split_root_search,
+)
+
+# A forced win scores WIN_SCORE minus the number of stones on the board when it
+# lands, so quicker wins (and slower losses) are preferred. Because it depends
+# on the stone count and not the search ply, it is safe to keep in the TT.
+WIN_SCORE = 1000000
+WIN_THRESHOLD = WIN_SCORE - MAX_MOVES - 1
+
+TT_SIZE_BITS = 18
 
 class Connect4AI:
     def __init__(self, difficulty: str):
         self.difficulty = difficulty
+        # Maximum depth for iterative deepening; the time budget usually stops it first
         self.depth_limits = {
             'easy': 1,
             'medium': 3,
-            'hard': 5
+            'hard': MAX_MOVES
+        }
+        # Default wall-clock budget per move in milliseconds
+        self.time_budgets = {
+            'easy': 250,
+            'medium': 1000,
+            'hard': 3000
         }
+        # Hard mode plays straight from the opening book when the position is in it
+        self.use_book = difficulty == 'hard'
+        self.transposition_table = TranspositionTable(TT_SIZE_BITS)
+        # Only take table scores searched to exactly the depth needed, so a score never depends
+        # on what happened to be searched before (set for reproducible split searches)
+        self.reproducible = False
+        self.table_player: Optional[str] = None
+        self.killers: List[List[Optional[int]]] = []
+        self.clock = SearchClock()
+        self.last_search: Optional[SearchStats] = None
+        self.pv_lines: Dict[int, List[int]] = {}
+        self.previous_pv: List[int] = []
 
-    def get_best_move(self, board: List[List[Optional[str]]], player: str) -> int:
-        """Get the best move based on difficulty level"""
-        game_logic = Connect4GameLogic([row[:] for row in board])
+    def get_best_move(self, board: List[List[Optional[str]]], player: str,
+                      time_budget_ms: Optional[int] = None, max_depth: Optional[int] = None) -> int:
+        """Get the best move based on difficulty level (search stats are left in self.last_search).
+        With `max_depth` and no time budget, medium and hard search to exactly that depth."""
+        self.clock = SearchClock(resolve_search_budget(time_budget_ms, self.time_budgets[self.difficulty], max_depth))
         
         if self.difficulty == 'easy':
-            return self.get_easy_move(game_logic, player)
-        elif self.difficulty == 'medium':
-            return self.get_medium_move(game_logic, player)
+            move = self.get_easy_move(Connect4GameLogic([row[:] for row in board]), player)
+            self.last_search = SearchStats(self.depth_limits['easy'], self.clock.nodes,
+                                           round(self.clock.elapsed_ms(), 1), False)
+            return move
+        
+        position = Connect4Position.from_board(board, player)
+        if self.use_book:
+            book_move = self.get_book_move(position)
+            if book_move is not None:
+                return book_move
+        
+        self.start_search(player)
+        if self.difficulty == 'medium':
+            return self.get_medium_move(position, max_depth)
         else:  # hard
-            return self.get_hard_move(game_logic, player)
+            return self.get_hard_move(position, max_depth)
+
+    def start_search(self, player: str):
+        """Reset per-search state before searching for `player`"""
+        # Leaf scores are from the AI's side, so entries from a search for the other colour can't be reused
+        if player != self.table_player:
+            self.transposition_table.clear()
+            self.table_player = player
+        self.transposition_table.new_search()
+        self.killers = [[None, None] for _ in range(MAX_MOVES + 1)]
+
+    def get_book_move(self, position: Connect4Position) -> Optional[int]:
+        """Look the position up in the opening book (memory-mapped, binary search)"""
+        book = get_book()
+        entry = book.probe(position) if book is not None else None
+        if entry is None or not position.can_play(entry.column):
+            return None
+        self.last_search = SearchStats(book.depth, 0, round(self.clock.elapsed_ms(), 1), False, book=True)
+        return entry.column
+
+    def analyse(self, position: Connect4Position, depth: int) -> Tuple[int, float]:
+        """Search to a fixed depth with no time limit; returns (best column, score). Used to build the book."""
+        self.clock = SearchClock()
+        self.start_search('red' if position.moves % 2 == 0 else 'yellow')
+        legal_moves = [col for col in CENTER_ORDER if position.can_play(col)]
+        result = {'score': 0.0}
+        
+        def search_depth(current_depth: int, previous_pv: List[int]):
+            move, score, line = self.search_root(position, legal_moves, current_depth, previous_pv)
+            result['score'] = score
+            return move, score, line
+        
+        best_move, self.last_search = iterative_deepening(search_depth, depth, self.clock, legal_moves[0])
+        return best_move, result['score']
 
     def get_easy_move(self, game_logic: Connect4GameLogic, player: str) -> int:
         """Easy AI: Random moves with basic strategy"""
@@ -28,164 +110,223 @@ class Connect4AI:
         
         # First, check for immediate wins
         for col in legal_moves:
-            test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-            row = test_logic.drop_piece(col, player)
-            if row is not None and test_logic.check_winner(row, col):
+            row = game_logic.drop_piece(col, player)
+            won = row is not None and game_logic.check_winner(row, col)
+            game_logic.undo_piece(col)
+            if won:
                 return col
         
         # Then, block opponent's immediate wins
         opponent = 'yellow' if player == 'red' else 'red'
         for col in legal_moves:
-            test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-            row = test_logic.drop_piece(col, opponent)
-            if row is not None and test_logic.check_winner(row, col):
+            row = game_logic.drop_piece(col, opponent)
+            won = row is not None and game_logic.check_winner(row, col)
+            game_logic.undo_piece(col)
+            if won:
                 return col
         
-        # Prefer center columns
-        center_cols = [3, 2, 4, 1, 5, 0, 6]
-        for col in center_cols:
-            if col in legal_moves:
-                return col
+        # Otherwise take the best one-ply score from the running window evaluation
+        # (its center bonus keeps the preference for the middle), random among ties
+        scores = {}
+        for col in legal_moves:
+            game_logic.drop_piece(col, player)
+            scores[col] = game_logic.evaluate_position(player)
+            game_logic.undo_piece(col)
+        best_score = max(scores.values())
+        return random.choice([col for col in legal_moves if scores[col] == best_score])
+
+    def get_medium_move(self, position: Connect4Position, max_depth: Optional[int] = None) -> int:
+        """Medium AI: Shallow negamax with shuffled root moves"""
+        legal_moves = position.legal_moves()
+        random.shuffle(legal_moves)  # Add some randomness
         
-        return random.choice(legal_moves)
+        best_move, self.last_search = iterative_deepening(
+            lambda depth, pv: self.search_root(position, legal_moves, depth, pv),
+            max_depth or self.depth_limits['medium'], self.clock,
+            fallback_move=legal_moves[0] if legal_moves else None
+        )
+        return best_move
 
-    def get_medium_move(self, game_logic: Connect4GameLogic, player: str) -> int:
-        """Medium AI: Minimax with limited depth"""
-        depth = self.depth_limits['medium']
-        best_move = None
-        best_value = float('-inf')
+    def get_hard_move(self, position: Connect4Position, max_depth: Optional[int] = None) -> int:
+        """Hard AI: Bitboard negamax with alpha-beta, transposition table and killer moves"""
+        legal_moves = [col for col in CENTER_ORDER if position.can_play(col)]
         
-        legal_moves = game_logic.get_legal_moves()
-        random.shuffle(legal_moves)  # Add some randomness
+        best_move, self.last_search = iterative_deepening(
+            lambda depth, pv: self.search_root(position, legal_moves, depth, pv),
+            max_depth or self.depth_limits['hard'], self.clock,
+            fallback_move=legal_moves[0] if legal_moves else None
+        )
+        return best_move
+
+    def get_split_move(self, board: List[List[Optional[str]]], player: str, share: int, shares: int,
+                       bounds: RootBounds, time_budget_ms: Optional[int] = None,
+                       max_depth: Optional[int] = None) -> SplitResult:
+        """This process's share of a hard search split over several processes by root column.
+        With `max_depth` and no time budget it searches to that depth."""
+        self.clock = SearchClock(resolve_search_budget(time_budget_ms, self.time_budgets['hard'], max_depth))
+        position = Connect4Position.from_board(board, player)
+        if self.use_book:
+            book_move = self.get_book_move(position)
+            if book_move is not None:
+                return SplitResult([], (0, book_move), 0, self.last_search.time_ms, False, book=True)
         
-        alpha = float('-inf')
-        beta = float('inf')
+        self.start_search(player)
+        self.previous_pv = []
+        legal_moves = [col for col in CENTER_ORDER if position.can_play(col)]
+        root_moves = len(position.history)
         
-        for col in legal_moves:
-            test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-            test_logic.drop_piece(col, player)
-            
-            value = self.minimax(test_logic, depth - 1, alpha, beta, False, player)
-            
-            if value > best_value:
-                best_value = value
-                best_move = col
-            
-            alpha = max(alpha, best_value)
+        def search_move(col: int, depth: int, alpha: float) -> float:
+            if position.is_winning_move(col):
+                return float('inf')
+            position.play(col)
+            try:
+                value = -self.negamax(position, depth - 1, float('-inf'), -alpha, ply=1)
+            finally:
+                while len(position.history) > root_moves:
+                    position.undo()
+            # Forced results as +-inf, like search_root, so every process stops at the depth that proves them
+            if abs(value) >= WIN_THRESHOLD:
+                return float('inf') if value > 0 else float('-inf')
+            return value
         
-        return best_move or legal_moves[0]
+        # Scores are whole numbers, so a margin of 1 keeps ties exact
+        return split_root_search(search_move, legal_moves, share, shares, bounds,
+                                 max_depth or self.depth_limits['hard'], self.clock, 1)
 
-    def get_hard_move(self, game_logic: Connect4GameLogic, player: str) -> int:
-        """Hard AI: Advanced minimax with alpha-beta pruning"""
-        depth = self.depth_limits['hard']
-        best_move = None
-        best_value = float('-inf')
-        
-        legal_moves = game_logic.get_legal_moves()
+    def search_root(self, position: Connect4Position, legal_moves: List[int], depth: int,
+                    previous_pv: List[int]):
+        """One iterative-deepening iteration: returns (best column, score, principal variation)"""
+        self.previous_pv = previous_pv
+        ordered = legal_moves[:]
+        if previous_pv and previous_pv[0] in ordered:
+            ordered.remove(previous_pv[0])
+            ordered.insert(0, previous_pv[0])
         
-        # Order moves for better alpha-beta performance
-        legal_moves = self.order_moves(game_logic, legal_moves, player)
+        # Take an immediate win without searching
+        for col in ordered:
+            if position.is_winning_move(col):
+                return col, float('inf'), [col]
         
+        best_move = None
+        best_value = float('-inf')
+        best_line: List[int] = []
         alpha = float('-inf')
         beta = float('inf')
+        root_moves = len(position.history)
         
-        for col in legal_moves:
-            test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-            test_logic.drop_piece(col, player)
-            
-            value = self.minimax(test_logic, depth - 1, alpha, beta, False, player)
-            
-            if value > best_value:
-                best_value = value
-                best_move = col
-            
-            alpha = max(alpha, best_value)
-            if beta <= alpha:
-                break
-        
-        return best_move or legal_moves[0]
-
-    def order_moves(self, game_logic: Connect4GameLogic, moves: List[int], player: str) -> List[int]:
-        """Order moves for better alpha-beta performance"""
-        scored_moves = []
+        try:
+            for col in ordered:
+                position.play(col)
+                if best_move is None:
+                    value = -self.negamax(position, depth - 1, -beta, -alpha, ply=1)
+                else:
+                    value = -self.negamax(position, depth - 1, -alpha - 1, -alpha, ply=1)
+                    if value > alpha:
+                        value = -self.negamax(position, depth - 1, -beta, -alpha, ply=1)
+                position.undo()
+                
+                if best_move is None or value > best_value:
+                    best_value = value
+                    best_move = col
+                    best_line = [col] + self.pv_lines.get(1, [])
+                
+                alpha = max(alpha, best_value)
+        except SearchTimeout:
+            # Unwind whatever the interrupted search left on the board
+            while len(position.history) > root_moves:
+                position.undo()
+            raise
         
-        for col in moves:
-            score = 0
-            
-            # Center preference
-            if col == 3:  # Center column
-                score += 3
-            elif col in [2, 4]:  # Near center
-                score += 2
-            elif col in [1, 5]:  # Outer center
-                score += 1
-            
-            # Check for immediate wins
-            test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-            row_pos = test_logic.drop_piece(col, player)
-            if row_pos is not None and test_logic.check_winner(row_pos, col):
-                score += 100
-            
-            # Check for opponent's immediate wins to block
-            opponent = 'yellow' if player == 'red' else 'red'
-            test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-            row_pos = test_logic.drop_piece(col, opponent)
-            if row_pos is not None and test_logic.check_winner(row_pos, col):
-                score += 50
-            
-            scored_moves.append((score, col))
+        self.transposition_table.store(position.key, depth, EXACT, best_value, best_move)
         
-        scored_moves.sort(key=lambda x: x[0], reverse=True)
-        return [col for _, col in scored_moves]
+        # Report forced results as +-inf so iterative deepening stops early
+        if abs(best_value) >= WIN_THRESHOLD:
+            best_value = float('inf') if best_value > 0 else float('-inf')
+        return best_move, best_value, best_line
 
-    def minimax(self, game_logic: Connect4GameLogic, depth: int, alpha: float, beta: float, 
-                maximizing: bool, player: str) -> float:
-        """Minimax algorithm with alpha-beta pruning"""
+    def negamax(self, position: Connect4Position, depth: int, alpha: float, beta: float, ply: int,
+                own_wins: Optional[int] = None) -> float:
+        """Negamax with alpha-beta pruning; the score is from the side to move's point of view.
+
+        `own_wins` are the side to move's winning cells if the caller already knows them.
+        """
+        self.clock.tick()
+        self.pv_lines[ply] = []
+        
         # Check terminal conditions
-        legal_moves = game_logic.get_legal_moves()
-        current_player = player if maximizing else ('yellow' if player == 'red' else 'red')
+        if position.moves == MAX_MOVES:
+            return 0
+        if own_wins is None:
+            own_wins = winning_cells(position.current, position.mask)
+        if own_wins & position.playable_cells():
+            return WIN_SCORE - (position.moves + 1)
         
-        # Check for win
-        for col in legal_moves:
-            test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-            row_pos = test_logic.drop_piece(col, current_player)
-            if row_pos is not None and test_logic.check_winner(row_pos, col):
-                if maximizing:
-                    return float('inf')
-                else:
-                    return float('-inf')
+        if depth <= 0:
+            # Evaluated from the AI's point of view, like the original minimax
+            if ply % 2 == 0:
+                return evaluate(position.current, position.opponent)
+            return -evaluate(position.opponent, position.current)
         
-        # Check for draw
-        if not legal_moves:
-            return 0
+        # Moves that don't let the opponent win straight away; none means we lose next turn
+        opponent_wins = winning_cells(position.opponent, position.mask)
+        candidates = position.non_losing_moves(opponent_wins)
+        if not candidates:
+            return -(WIN_SCORE - (position.moves + 2))
+        if position.moves >= MAX_MOVES - 2:
+            return 0  # Board fills up before anyone can connect four
         
-        if depth == 0:
-            return game_logic.evaluate_position(player)
+        key = position.key
+        tt_move = None
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            tt_move = entry.best_move
+            if entry.depth == depth or (entry.depth > depth and not self.reproducible):
+                if entry.flag == EXACT:
+                    return entry.value
+                if entry.flag == LOWER_BOUND:
+                    alpha = max(alpha, entry.value)
+                elif entry.flag == UPPER_BOUND:
+                    beta = min(beta, entry.value)
+                if alpha >= beta:
+                    return entry.value
         
-        if maximizing:
-            max_eval = float('-inf')
-            for col in legal_moves:
-                test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-                test_logic.drop_piece(col, player)
-                
-                eval = self.minimax(test_logic, depth - 1, alpha, beta, False, player)
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
-                
-                if beta <= alpha:
-                    break
-            return max_eval
-        else:
-            min_eval = float('inf')
-            opponent = 'yellow' if player == 'red' else 'red'
-            for col in legal_moves:
-                test_logic = Connect4GameLogic([row[:] for row in game_logic.board])
-                test_logic.drop_piece(col, opponent)
-                
-                eval = self.minimax(test_logic, depth - 1, alpha, beta, True, player)
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                
-                if beta <= alpha:
-                    break
-            return min_eval
\ No newline at end of file
+        # Order: previous principal variation, TT move, killers, then center-first
+        killers = self.killers[ply]
+        pv_move = self.previous_pv[ply] if ply < len(self.previous_pv) else None
+        ordered = []
+        for col in (pv_move, tt_move, killers[0], killers[1]) + CENTER_ORDER:
+            if col is not None and col not in ordered and candidates & COLUMN_MASKS[col]:
+                ordered.append(col)
+        
+        original_alpha = alpha
+        best_value = float('-inf')
+        best_move = None
+        for col in ordered:
+            position.play(col)
+            # The opponent's winning cells carry over to the child, minus the one we just filled
+            child_wins = opponent_wins & ~position.mask
+            if best_move is None:
+                value = -self.negamax(position, depth - 1, -beta, -alpha, ply + 1, child_wins)
+            else:
+                # Principal variation search: prove the move is no better with a null window,
+                # and only re-search with the full window if it is
+                value = -self.negamax(position, depth - 1, -alpha - 1, -alpha, ply + 1, child_wins)
+                if alpha < value < beta:
+                    value = -self.negamax(position, depth - 1, -beta, -alpha, ply + 1, child_wins)
+            position.undo()
+            
+            if value > best_value:
+                best_value = value
+                best_move = col
+                self.pv_lines[ply] = [col] + self.pv_lines.get(ply + 1, [])
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        if col != killers[0]:
+                            killers[1] = killers[0]
+                            killers[0] = col
+                        break
+        
+        self.transposition_table.store(key, depth, bound_flag(best_value, original_alpha, beta),
+                                       best_value, best_move)
+        return best_value
@@ -0,0 +1,204 @@
+from typing import List, Optional
+from .connect4_logic import WINDOW_SCORES
+
+# Board geometry. Each column is stored as ROWS bits plus one empty sentinel
+# bit on top, so bit index = col * HEIGHT + row, where row 0 is the BOTTOM row
+# (the API board's row 5).
+ROWS = 6
+COLS = 7
+HEIGHT = ROWS + 1
+MAX_MOVES = ROWS * COLS
+
+BOTTOM_MASKS = [1 << (col * HEIGHT) for col in range(COLS)]
+TOP_MASKS = [1 << (col * HEIGHT + ROWS - 1) for col in range(COLS)]
+COLUMN_MASKS = [((1 << ROWS) - 1) << (col * HEIGHT) for col in range(COLS)]
+BOTTOM_MASK = sum(BOTTOM_MASKS)
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+CENTER_COLUMN_MASK = COLUMN_MASKS[COLS // 2]
+
+# Columns from the middle outwards: the usual best guess for move ordering
+CENTER_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+
+def cell_bit(row: int, col: int) -> int:
+    """Bit for an API board cell (row 0 = top row)"""
+    return 1 << (col * HEIGHT + (ROWS - 1 - row))
+
+
+def _build_windows() -> List[int]:
+    """Masks of all 69 four-cell lines a player could complete"""
+    windows = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + 3 * dr, col + 3 * dc
+                if 0 <= end_row < ROWS and 0 <= end_col < COLS:
+                    windows.append(sum(cell_bit(row + i * dr, col + i * dc) for i in range(4)))
+    return windows
+
+
+WINDOWS = _build_windows()
+
+
+def has_alignment(stones: int) -> bool:
+    """True if `stones` contains four in a row (vertical, horizontal or diagonal)"""
+    for shift in (1, HEIGHT, HEIGHT - 1, HEIGHT + 1):
+        pairs = stones & (stones >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def winning_cells(stones: int, mask: int) -> int:
+    """Empty cells that would complete four in a row for `stones` (playable now or not)"""
+    # Vertical: three stacked stones below the cell
+    cells = (stones << 1) & (stones << 2) & (stones << 3)
+    for shift in (HEIGHT, HEIGHT - 1, HEIGHT + 1):
+        pair = (stones << shift) & (stones << (2 * shift))
+        cells |= pair & (stones << (3 * shift))
+        cells |= pair & (stones >> shift)
+        pair = (stones >> shift) & (stones >> (2 * shift))
+        cells |= pair & (stones << shift)
+        cells |= pair & (stones >> (3 * shift))
+    return cells & (BOARD_MASK ^ mask)
+
+
+class Connect4Position:
+    """Two-bitboard Connect 4 position: stones of the side to move plus all occupied cells.
+
+    play()/undo() work in place, so a search never copies the board.
+    `key` (current + mask) identifies a position uniquely.
+    """
+    __slots__ = ('current', 'mask', 'moves', 'history')
+
+    def __init__(self, current: int = 0, mask: int = 0, moves: int = 0):
+        self.current = current
+        self.mask = mask
+        self.moves = moves
+        self.history: List[int] = []
+
+    @classmethod
+    def from_board(cls, board: List[List[Optional[str]]], player: str) -> 'Connect4Position':
+        """Build from the API board ('R'/'Y'/None, row 0 at the top) with `player` to move"""
+        own_piece = 'R' if player == 'red' else 'Y'
+        current = mask = moves = 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = board[row][col]
+                if piece is not None:
+                    bit = cell_bit(row, col)
+                    mask |= bit
+                    moves += 1
+                    if piece == own_piece:
+                        current |= bit
+        return cls(current, mask, moves)
+
+    @property
+    def key(self) -> int:
+        return self.current + self.mask
+
+    @property
+    def opponent(self) -> int:
+        return self.current ^ self.mask
+
+    def can_play(self, col: int) -> bool:
+        return not self.mask & TOP_MASKS[col]
+
+    def legal_moves(self) -> List[int]:
+        return [col for col in range(COLS) if not self.mask & TOP_MASKS[col]]
+
+    def play(self, col: int):
+        """Drop a stone for the side to move (column must not be full)"""
+        stone = (self.mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+        self.history.append(stone)
+        self.current ^= self.mask
+        self.mask |= stone
+        self.moves += 1
+
+    def undo(self):
+        """Take back the last play()"""
+        stone = self.history.pop()
+        self.mask ^= stone
+        self.current ^= self.mask
+        self.moves -= 1
+
+    def is_winning_move(self, col: int) -> bool:
+        stone = (self.mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+        return bool(stone) and has_alignment(self.current | stone)
+
+    def playable_cells(self) -> int:
+        """The lowest empty cell of every column that isn't full"""
+        return (self.mask + BOTTOM_MASK) & BOARD_MASK
+
+    def can_win_next(self) -> bool:
+        return bool(winning_cells(self.current, self.mask) & self.playable_cells())
+
+    def non_losing_moves(self, opponent_wins: Optional[int] = None) -> int:
+        """Cells the side to move can play without handing the opponent an immediate win.
+
+        Returns 0 when every move loses (the opponent has two threats, or our
+        only block gives them a win on top of it). Pass `opponent_wins` if the
+        opponent's winning cells are already known.
+        """
+        if opponent_wins is None:
+            opponent_wins = winning_cells(self.opponent, self.mask)
+        playable = self.playable_cells()
+        forced = playable & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                return 0  # Two threats at once: can't block both
+            playable = forced
+        # Never play directly underneath an opponent winning cell
+        return playable & ~(opponent_wins >> 1)
+
+
+# Weights of a window holding only one side's stones, by stone count
+OWN_WINDOW_SCORES = tuple(WINDOW_SCORES[count][0] for count in range(4))
+OPPONENT_WINDOW_SCORES = tuple(WINDOW_SCORES[0][count] for count in range(4))
+
+
+def _window_starts(shift: int) -> int:
+    """Cells that start a four-cell window running in the +shift direction"""
+    starts = 0
+    for window in WINDOWS:
+        low = window & -window
+        if window == low * (1 | 1 << shift | 1 << 2 * shift | 1 << 3 * shift):
+            starts |= low
+    return starts
+
+
+# (shift, window start cells) for vertical, horizontal and both diagonals
+LINE_DIRECTIONS = tuple((shift, _window_starts(shift)) for shift in (1, HEIGHT, HEIGHT - 1, HEIGHT + 1))
+
+
+def _window_counts(stones: int, blockers: int):
+    """Number of windows holding exactly 1, 2 and 3 of `stones` and none of `blockers`.
+
+    Every window start is counted in parallel: the four cells of each window
+    are lined up on top of its start bit by shifting, then added bitwise.
+    """
+    ones = twos = threes = 0
+    for shift, starts in LINE_DIRECTIONS:
+        open_windows = starts & ~(blockers | blockers >> shift | blockers >> 2 * shift | blockers >> 3 * shift)
+        if not open_windows:
+            continue
+        a, b = stones, stones >> shift
+        c, d = stones >> 2 * shift, stones >> 3 * shift
+        sum_ab, carry_ab = a ^ b, a & b
+        sum_cd, carry_cd = c ^ d, c & d
+        low_bit = sum_ab ^ sum_cd
+        high_bit = carry_ab ^ carry_cd ^ (sum_ab & sum_cd)
+        ones += (open_windows & low_bit & ~high_bit).bit_count()
+        twos += (open_windows & high_bit & ~low_bit).bit_count()
+        threes += (open_windows & high_bit & low_bit).bit_count()
+    return ones, twos, threes
+
+
+def evaluate(own: int, opponent: int) -> int:
+    """Static evaluation for the owner of `own`, same weights as Connect4GameLogic.evaluate_position"""
+    score = 3 * ((own & CENTER_COLUMN_MASK).bit_count() - (opponent & CENTER_COLUMN_MASK).bit_count())
+    ones, twos, threes = _window_counts(own, opponent)
+    score += ones * OWN_WINDOW_SCORES[1] + twos * OWN_WINDOW_SCORES[2] + threes * OWN_WINDOW_SCORES[3]
+    ones, twos, threes = _window_counts(opponent, own)
+    score += ones * OPPONENT_WINDOW_SCORES[1] + twos * OPPONENT_WINDOW_SCORES[2] + threes * OPPONENT_WINDOW_SCORES[3]
+    return score
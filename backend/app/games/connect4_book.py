@@ -0,0 +1,98 @@
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from .connect4_bitboard import Connect4Position, COLS, HEIGHT
+
+# File layout (little-endian):
+#   header  "C4BK", version u16, max plies u16, search depth u16, entry count u32
+#   entries sorted by key: key u64, score i32, best column u8
+BOOK_MAGIC = b"C4BK"
+BOOK_VERSION = 1
+HEADER = struct.Struct("<4sHHHI")
+ENTRY = struct.Struct("<QiB")
+
+DEFAULT_BOOK_PATH = Path(__file__).resolve().parent.parent / "data" / "connect4_book.bin"
+BOOK_PATH = Path(os.getenv("CONNECT4_BOOK_PATH", DEFAULT_BOOK_PATH))
+
+COLUMN_BITS = (1 << HEIGHT) - 1
+
+
+class BookMove(NamedTuple):
+    column: int
+    score: int  # From the side to move's point of view, as Connect4AI scores it
+
+
+def mirror_key(key: int) -> int:
+    """Key of the left-right mirrored position (columns are independent 7-bit fields)"""
+    mirrored = 0
+    for col in range(COLS):
+        mirrored |= ((key >> (col * HEIGHT)) & COLUMN_BITS) << ((COLS - 1 - col) * HEIGHT)
+    return mirrored
+
+
+def canonical_key(key: int) -> Tuple[int, bool]:
+    """The smaller of a key and its mirror image, and whether the mirror was taken"""
+    mirrored = mirror_key(key)
+    return (mirrored, True) if mirrored < key else (key, False)
+
+
+def write_book(path: Path, entries: Iterable[Tuple[int, int, int]], max_plies: int, depth: int):
+    """Write (canonical key, score, best column) entries as a sorted book file"""
+    entries = sorted(entries)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION, max_plies, depth, len(entries)))
+        for key, score, column in entries:
+            f.write(ENTRY.pack(key, score, column))
+
+
+class Connect4Book:
+    """Read-only opening book, memory-mapped so every worker process shares one copy in the page cache"""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_plies, self.depth, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} Connect 4 book")
+
+    def _key_at(self, index: int) -> int:
+        return struct.unpack_from("<Q", self.data, HEADER.size + index * ENTRY.size)[0]
+
+    def probe(self, position: Connect4Position) -> Optional[BookMove]:
+        """Binary search for the position (or its mirror image); None if it isn't in the book"""
+        if position.moves > self.max_plies:
+            return None
+        key, mirrored = canonical_key(position.key)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count or self._key_at(low) != key:
+            return None
+        _, score, column = ENTRY.unpack_from(self.data, HEADER.size + low * ENTRY.size)
+        return BookMove(COLS - 1 - column if mirrored else column, score)
+
+    def close(self):
+        self.data.close()
+
+
+_book: Optional[Connect4Book] = None
+_book_loaded = False
+
+
+def get_book() -> Optional[Connect4Book]:
+    """The process-wide book, opened on first use; None if no book file has been built"""
+    global _book, _book_loaded
+    if not _book_loaded:
+        _book_loaded = True
+        try:
+            _book = Connect4Book(BOOK_PATH)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Connect 4 opening book not loaded: {e}")
+    return _book
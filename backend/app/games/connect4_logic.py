@@ -1,16 +1,62 @@
 from typing import List, Optional, Tuple, Dict, Any
 
+ROWS = 6
+COLS = 7
+CENTER_COL = COLS // 2
+
+def _build_windows() -> List[Tuple[Tuple[int, int], ...]]:
+    """Every four-cell line on the board (69 of them) as (row, col) cells"""
+    windows = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                if 0 <= row + 3 * dr < ROWS and 0 <= col + 3 * dc < COLS:
+                    windows.append(tuple((row + i * dr, col + i * dc) for i in range(4)))
+    return windows
+
+WINDOWS = _build_windows()
+
+# For each cell, the indexes of the windows passing through it (3 to 13 each)
+CELL_WINDOWS: List[List[List[int]]] = [[[] for _ in range(COLS)] for _ in range(ROWS)]
+for _index, _cells in enumerate(WINDOWS):
+    for _row, _col in _cells:
+        CELL_WINDOWS[_row][_col].append(_index)
+
+# Score of one window by (own pieces, opponent pieces) in it; same values as evaluate_sequence
+WINDOW_SCORES = [[0] * 5 for _ in range(5)]
+WINDOW_SCORES[3][0], WINDOW_SCORES[2][0], WINDOW_SCORES[1][0] = 100, 10, 1
+WINDOW_SCORES[0][3], WINDOW_SCORES[0][2] = -80, -5
+
 class Connect4GameLogic:
     def __init__(self, board: List[List[Optional[str]]]):
         self.board = board
-        self.rows = 6
-        self.cols = 7
+        self.rows = ROWS
+        self.cols = COLS
+        # Incremental evaluation state, built on the first evaluate_position() call and
+        # then kept up to date by drop_piece()/undo_piece(): [red, yellow] pieces per
+        # window, and the running evaluate_position() score for each side
+        self.window_counts: Optional[List[List[int]]] = None
+        self.scores = {'R': 0, 'Y': 0}
 
     def drop_piece(self, column: int, player: str) -> Optional[int]:
         """Drop a piece in the specified column. Returns row where piece landed, or None if column is full."""
         for row in range(self.rows - 1, -1, -1):
             if self.board[row][column] is None:
-                self.board[row][column] = 'R' if player == 'red' else 'Y'
+                piece = 'R' if player == 'red' else 'Y'
+                self.board[row][column] = piece
+                if self.window_counts is not None:
+                    self.update_windows(row, column, piece, 1)
+                return row
+        return None
+
+    def undo_piece(self, column: int) -> Optional[int]:
+        """Remove the top piece of a column. Returns the row it was taken from, or None if the column is empty."""
+        for row in range(self.rows):
+            piece = self.board[row][column]
+            if piece is not None:
+                if self.window_counts is not None:
+                    self.update_windows(row, column, piece, -1)
+                self.board[row][column] = None
                 return row
         return None
 
@@ -59,7 +105,63 @@ class Connect4GameLogic:
         return all(self.board[0][col] is not None for col in range(self.cols))
 
     def evaluate_position(self, player: str) -> float:
-        """Evaluate the current board position for the given player"""
+        """Evaluate the current board position for the given player.
+
+        O(1) after the first call: the score is maintained incrementally by
+        drop_piece()/undo_piece(), touching only the windows through the
+        changed cell. Boards edited directly (not through those methods) must
+        call reset_evaluation().
+        """
+        if self.window_counts is None:
+            self.reset_evaluation()
+        return self.scores['R'] if player == 'red' else self.scores['Y']
+
+    def reset_evaluation(self):
+        """Recount every window from scratch"""
+        self.window_counts = [[0, 0] for _ in WINDOWS]
+        for index, cells in enumerate(WINDOWS):
+            counts = self.window_counts[index]
+            for row, col in cells:
+                piece = self.board[row][col]
+                if piece == 'R':
+                    counts[0] += 1
+                elif piece == 'Y':
+                    counts[1] += 1
+        
+        self.scores = {'R': 0, 'Y': 0}
+        for red, yellow in self.window_counts:
+            self.scores['R'] += WINDOW_SCORES[red][yellow]
+            self.scores['Y'] += WINDOW_SCORES[yellow][red]
+        
+        # Center column preference
+        for row in range(self.rows):
+            piece = self.board[row][CENTER_COL]
+            if piece is not None:
+                other = 'Y' if piece == 'R' else 'R'
+                self.scores[piece] += 3
+                self.scores[other] -= 3
+
+    def update_windows(self, row: int, col: int, piece: str, delta: int):
+        """Add (delta=1) or remove (delta=-1) `piece` at (row, col) in the window counts and scores"""
+        side = 0 if piece == 'R' else 1
+        scores = self.scores
+        for index in CELL_WINDOWS[row][col]:
+            counts = self.window_counts[index]
+            red, yellow = counts
+            scores['R'] -= WINDOW_SCORES[red][yellow]
+            scores['Y'] -= WINDOW_SCORES[yellow][red]
+            counts[side] += delta
+            red, yellow = counts
+            scores['R'] += WINDOW_SCORES[red][yellow]
+            scores['Y'] += WINDOW_SCORES[yellow][red]
+        
+        if col == CENTER_COL:
+            other = 'Y' if piece == 'R' else 'R'
+            scores[piece] += 3 * delta
+            scores[other] -= 3 * delta
+
+    def rescan_position(self, player: str) -> float:
+        """Evaluate by scanning every window of the board (reference for the incremental score)"""
         opponent = 'yellow' if player == 'red' else 'red'
         player_piece = 'R' if player == 'red' else 'Y'
         opponent_piece = 'Y' if player == 'red' else 'R'
@@ -1,9 +1,199 @@
 import heapq
+from collections import OrderedDict
 from typing import List, Tuple, Dict, Optional
 
+INFINITY = float('inf')
+
+# Planners kept alive between /next-move calls (least recently used is dropped first)
+MAX_SESSIONS = 256
+# Above this many changed cells a repair costs about as much as a fresh search
+MAX_REPAIR_CELLS = 16
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)] # R, D, L, U
+
+
+def cell_cost(cell_type: str) -> float:
+    """Cost of stepping onto a cell; walls can't be entered"""
+    if cell_type == "mud":
+        return 5
+    if cell_type == "wall":
+        return INFINITY
+    return 1
+
+
+class MazePlanner:
+    """Incremental (LPA*-style) planner for one maze session, in the spirit of Moving Target D* Lite.
+
+    The search runs forwards from the cat: g(s) is the cheapest cost from
+    the cat to s and parent(s) is the neighbour that cost comes through.
+    Between calls the previous search is repaired instead of thrown away:
+
+      - changed cells only re-check the cells whose cost changed
+      - the mouse moving just re-keys the open list for the new heuristic
+      - the cat stepping onto a cell of its old search tree keeps that
+        cell's branch of the tree and reopens the rest
+
+    `update` returns False when the state can't be reused (the cat jumped
+    somewhere its old search never reached) and the caller starts afresh.
+    """
+
+    def __init__(self, grid: List[List[str]], cat: Tuple[int, int], mouse: Tuple[int, int]):
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.grid = [row[:] for row in grid]
+        self.neighbours = {(r, c): self._neighbours((r, c)) for r in range(self.rows) for c in range(self.cols)}
+        self.cat = cat
+        self.mouse = mouse
+        self.g: Dict[Tuple[int, int], float] = {}
+        self.rhs: Dict[Tuple[int, int], float] = {cat: 0}
+        self.parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {cat: None}
+        # Open list with lazy deletion: a heap entry is live only while it matches open_keys
+        self.open_heap = []
+        self.open_keys: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self.expanded = 0
+        self._push(cat)
+
+    def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        # Manhattan distance; consistent because every step costs at least 1
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def cost(self, pos: Tuple[int, int]) -> float:
+        return cell_cost(self.grid[pos[0]][pos[1]])
+
+    def _neighbours(self, pos: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+        return tuple(
+            (pos[0] + dr, pos[1] + dc) for dr, dc in DIRECTIONS
+            if 0 <= pos[0] + dr < self.rows and 0 <= pos[1] + dc < self.cols
+        )
+
+    def calculate_key(self, pos: Tuple[int, int]) -> Tuple[float, float]:
+        best = min(self.g.get(pos, INFINITY), self.rhs.get(pos, INFINITY))
+        return (best + self.heuristic(pos, self.mouse), best)
+
+    def _push(self, pos: Tuple[int, int]):
+        key = self.calculate_key(pos)
+        self.open_keys[pos] = key
+        heapq.heappush(self.open_heap, (key, pos))
+
+    def _top(self):
+        """Smallest live (key, pos) in the open list, dropping stale heap entries"""
+        while self.open_heap:
+            key, pos = self.open_heap[0]
+            if self.open_keys.get(pos) == key:
+                return key, pos
+            heapq.heappop(self.open_heap)
+        return (INFINITY, INFINITY), None
+
+    def _rekey_open(self):
+        """Recompute every open key (after the cat or the mouse moved) and rebuild the heap"""
+        self.open_keys = {pos: self.calculate_key(pos) for pos in self.open_keys}
+        self.open_heap = [(key, pos) for pos, key in self.open_keys.items()]
+        heapq.heapify(self.open_heap)
+
+    def update_vertex(self, pos: Tuple[int, int]):
+        if pos != self.cat:
+            best, best_parent = INFINITY, None
+            step = self.cost(pos)
+            if step != INFINITY:
+                for n in self.neighbours[pos]:
+                    candidate = self.g.get(n, INFINITY) + step
+                    if candidate < best:
+                        best, best_parent = candidate, n
+            self.rhs[pos] = best
+            self.parent[pos] = best_parent
+        self.open_keys.pop(pos, None)
+        if self.g.get(pos, INFINITY) != self.rhs.get(pos, INFINITY):
+            self._push(pos)
+
+    def compute_shortest_path(self):
+        while True:
+            top_key, pos = self._top()
+            if pos is None:
+                return
+            mouse_g = self.g.get(self.mouse, INFINITY)
+            if top_key >= self.calculate_key(self.mouse) and self.rhs.get(self.mouse, INFINITY) == mouse_g:
+                return
+            self.expanded += 1
+            del self.open_keys[pos]
+            if self.g.get(pos, INFINITY) > self.rhs[pos]:
+                self.g[pos] = self.rhs[pos]
+                for n in self.neighbours[pos]:
+                    self.update_vertex(n)
+            else:
+                self.g[pos] = INFINITY
+                self.update_vertex(pos)
+                for n in self.neighbours[pos]:
+                    self.update_vertex(n)
+
+    def changed_cells(self, grid: List[List[str]]) -> List[Tuple[int, int]]:
+        return [
+            (r, c) for r in range(self.rows) if grid[r] != self.grid[r]
+            for c in range(self.cols) if grid[r][c] != self.grid[r][c]
+        ]
+
+    def move_cat(self, cat: Tuple[int, int]) -> bool:
+        """Re-root the search tree at the cat's new cell; False if that cell was never reached"""
+        if self.g.get(cat, INFINITY) == INFINITY or self.rhs.get(cat) != self.g[cat]:
+            return False
+
+        # Everything hanging off the old root except the new root's branch
+        # loses its path; the branch keeps its costs, which are all offset by
+        # the same g(cat) and so still compare correctly against each other
+        removed = set()
+        stack = [self.cat]
+        while stack:
+            pos = stack.pop()
+            removed.add(pos)
+            for n in self.neighbours[pos]:
+                if n != cat and n not in removed and self.parent.get(n) == pos:
+                    stack.append(n)
+
+        self.cat = cat
+        self.parent[cat] = None
+        for pos in removed:
+            self.g.pop(pos, None)
+            self.rhs.pop(pos, None)
+            self.parent.pop(pos, None)
+            self.open_keys.pop(pos, None)
+        # Forgotten cells next to the kept branch can be reached through it again
+        for pos in removed:
+            self.update_vertex(pos)
+        return True
+
+    def update(self, grid: List[List[str]], cat: Tuple[int, int], mouse: Tuple[int, int], changed: List[Tuple[int, int]]) -> bool:
+        """Apply the new positions and cell changes to the search state; False if it must be rebuilt"""
+        for r, c in changed:
+            self.grid[r][c] = grid[r][c]
+        for pos in changed:
+            # In a forward search the cost of a cell only enters its own rhs
+            self.update_vertex(pos)
+
+        if cat != self.cat:
+            if changed:
+                # Settle the changes first so the cat's new cell has a valid cost
+                self.compute_shortest_path()
+            if not self.move_cat(cat):
+                return False
+        self.mouse = mouse
+        self._rekey_open()
+        return True
+
+    def plan(self) -> List[Tuple[int, int]]:
+        """Cheapest path from the cat to the mouse (both ends included), or [] if there is none"""
+        self.compute_shortest_path()
+        if self.g.get(self.mouse, INFINITY) == INFINITY:
+            return []
+
+        path = [self.mouse]
+        while path[-1] != self.cat and len(path) <= self.rows * self.cols:
+            path.append(self.parent[path[-1]])
+        return path[::-1] if path[-1] == self.cat else []
+
+
 class MazeAI:
     def __init__(self):
-        self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)] # R, D, L, U
+        self.directions = DIRECTIONS
+        self.planners: "OrderedDict[str, MazePlanner]" = OrderedDict()
 
     def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
         # Manhattan distance
@@ -19,48 +209,71 @@ class MazeAI:
     def solve_astar(self, grid: List[List[str]], start: Tuple[int, int], target: Tuple[int, int]):
         rows = len(grid)
         cols = len(grid[0])
-        
-        # Priority Queue: (f_score, g_score, current_pos, path)
-        pq = [(0, 0, start, [])]
+
+        # Priority Queue: (f_score, g_score, current_pos); the path is rebuilt from came_from
+        pq = [(self.heuristic(start, target), 0, start)]
         visited = set()
         g_scores = {start: 0}
-        
-        came_from = {} # For path reconstruction if needed, currently storing in tuple
-        
+        came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
         while pq:
-            f, g, current, path = heapq.heappop(pq)
-            
+            f, g, current = heapq.heappop(pq)
+
             if current == target:
-                return path + [current]
-            
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                return path[::-1]
+
             if current in visited:
                 continue
             visited.add(current)
-            
+
             for dr, dc in self.directions:
                 nr, nc = current[0] + dr, current[1] + dc
-                
+
                 if 0 <= nr < rows and 0 <= nc < cols:
                     cell = grid[nr][nc]
                     if cell == "wall":
                         continue
-                        
+
                     new_cost = g + self.get_cost(cell)
                     neighbor = (nr, nc)
-                    
+
                     if neighbor not in g_scores or new_cost < g_scores[neighbor]:
                         g_scores[neighbor] = new_cost
+                        came_from[neighbor] = current
                         h = self.heuristic(neighbor, target)
-                        new_path = path + [current]
-                        heapq.heappush(pq, (new_cost + h, new_cost, neighbor, new_path))
-        
+                        heapq.heappush(pq, (new_cost + h, new_cost, neighbor))
+
         return [] # No path found
 
-    def get_next_move(self, grid, cat_pos, mouse_pos):
-        path = self.solve_astar(grid, (cat_pos.row, cat_pos.col), (mouse_pos.row, mouse_pos.col))
-        
+    def plan_session(self, session_id: str, grid: List[List[str]], start: Tuple[int, int], target: Tuple[int, int]):
+        """Path from start to target, repairing the session's previous search when the maze barely changed"""
+        planner = self.planners.get(session_id)
+        changed = None
+        if planner is not None and planner.rows == len(grid) and planner.cols == len(grid[0]):
+            changed = planner.changed_cells(grid)
+
+        if changed is None or len(changed) > MAX_REPAIR_CELLS or not planner.update(grid, start, target, changed):
+            planner = MazePlanner(grid, start, target)
+
+        self.planners[session_id] = planner
+        self.planners.move_to_end(session_id)
+        if len(self.planners) > MAX_SESSIONS:
+            self.planners.popitem(last=False)
+        return planner.plan()
+
+    def get_next_move(self, grid, cat_pos, mouse_pos, session_id: Optional[str] = None):
+        start, target = (cat_pos.row, cat_pos.col), (mouse_pos.row, mouse_pos.col)
+        if session_id:
+            path = self.plan_session(session_id, grid, start, target)
+        else:
+            path = self.solve_astar(grid, start, target)
+
         # Path[0] is current pos, Path[1] is next step
         if len(path) > 1:
             next_step = path[1]
             return {"row": next_step[0], "col": next_step[1], "path": path}
-        return {"row": cat_pos.row, "col": cat_pos.col, "path": []}
\ No newline at end of file
+        return {"row": cat_pos.row, "col": cat_pos.col, "path": []}
@@ -1,20 +1,82 @@
 import heapq
-from typing import List, Tuple, Dict
+from collections import OrderedDict, deque
+from typing import List, Optional, Tuple, Dict
 import random
 
-class Node:
-    def __init__(self, position: Tuple[int, int], parent=None):
-        self.position = position
-        self.parent = parent
-        self.g = 0 # Distance from start
-        self.h = 0 # Heuristic (distance to end)
-        self.f = 0 # Total cost
-
-    def __eq__(self, other):
-        return self.position == other.position
-    
-    def __lt__(self, other):
-        return self.f < other.f
+WALL = 1
+
+class WallLayout:
+    """The static part of a Pacman grid: walls packed into bytes (1 = wall), row-major.
+
+    Dots, Pacman and ghosts change every frame but walls only change between
+    levels, so `key` (width + wall bytes) identifies a maze exactly and is what
+    cached distance fields are stored under.
+    """
+    __slots__ = ('rows', 'cols', 'walls', 'key')
+
+    def __init__(self, grid: List[List[int]]):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.walls = bytes(1 if cell == WALL else 0 for row in grid for cell in row)
+        self.key = (self.cols, self.walls)
+
+    def is_open(self, x: int, y: int) -> bool:
+        return 0 <= x < self.cols and 0 <= y < self.rows and not self.walls[y * self.cols + x]
+
+    def distances_from(self, target: Tuple[int, int]) -> List[int]:
+        """BFS distance from every cell to `target` (-1 = unreachable or wall), indexed y * cols + x"""
+        cols = self.cols
+        distances = [-1] * (self.rows * cols)
+        if not self.is_open(*target):
+            return distances
+        start = target[1] * cols + target[0]
+        distances[start] = 0
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            x, y = index % cols, index // cols
+            next_distance = distances[index] + 1
+            for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if self.is_open(nx, ny):
+                    neighbour = ny * cols + nx
+                    if distances[neighbour] < 0:
+                        distances[neighbour] = next_distance
+                        queue.append(neighbour)
+        return distances
+
+class DistanceCache:
+    """LRU of BFS distance fields keyed by (wall layout, target tile).
+
+    Several ghosts chase the same tile every frame and corner targets never
+    move, so most lookups are hits; a miss costs one O(cells) BFS.
+    """
+
+    def __init__(self, max_fields: int = 512):
+        self.max_fields = max_fields
+        self.fields: "OrderedDict[Tuple, List[int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, layout: WallLayout, target: Tuple[int, int]) -> Optional[List[int]]:
+        """The target's field if it is already cached, without building it"""
+        key = (layout.key, target)
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+        return field
+
+    def distances(self, layout: WallLayout, target: Tuple[int, int]) -> List[int]:
+        field = self.cached(layout, target)
+        if field is not None:
+            return field
+        self.misses += 1
+        key = (layout.key, target)
+        field = layout.distances_from(target)
+        self.fields[key] = field
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
 
 class PacmanAI:
     def __init__(self):
@@ -25,15 +87,42 @@ class PacmanAI:
             "LEFT": (-1, 0),
             "RIGHT": (1, 0)
         }
+        self.distance_cache = DistanceCache()
 
     def get_next_move(self, grid: List[List[int]], ghost_pos: Tuple[int, int], pacman_pos: Tuple[int, int], ghost_type: str) -> str:
-        """Decide the next move based on Ghost Personality"""
+        """Decide the next move based on Ghost Personality.
+
+        Only one ghost chases Pacman's tile in this call, so unless its field is
+        already cached the chase is one A* search rather than a whole-maze BFS.
+        """
+        return self.choose_move(WallLayout(grid), ghost_pos, pacman_pos, ghost_type, share_fields=False)
+
+    def get_ghost_moves(self, grid: List[List[int]], pacman_pos: Tuple[int, int], ghosts: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+        """Next move for every ghost from one parse of the grid.
+
+        Blinky, Pinky and Inky all chase Pacman's tile, so after the first of
+        them the distance field towards it comes straight from the cache and
+        the whole tick costs at most one BFS (two while Clyde is fleeing).
+        """
+        layout = WallLayout(grid)
+        return {
+            ghost_type: self.choose_move(layout, ghost_pos, pacman_pos, ghost_type)
+            for ghost_type, ghost_pos in ghosts.items()
+        }
+
+    def choose_move(self, layout: WallLayout, ghost_pos: Tuple[int, int], pacman_pos: Tuple[int, int], ghost_type: str,
+                    share_fields: bool = True) -> str:
+        """Pick the target for this ghost's personality and take one step towards it.
+
+        Corner targets never move, so they always get a cached distance field;
+        Pacman's tile gets one when `share_fields` (several ghosts chase it).
+        """
         
         target = pacman_pos
 
         # PERSONALITY AI: Adjust target based on ghost type
         if ghost_type == "blinky":
-            # Blinky: Chases directly (Standard A*)
+            # Blinky: Chases directly (shortest path)
             target = pacman_pos
         elif ghost_type == "pinky":
             # Pinky: Tries to ambush (Target 4 tiles ahead of Pacman)
@@ -44,7 +133,7 @@ class PacmanAI:
             # Clyde: Chases, but if too close (dist < 8), runs away to bottom-left corner
             dist = abs(ghost_pos[0] - pacman_pos[0]) + abs(ghost_pos[1] - pacman_pos[1])
             if dist < 5:
-                target = (1, len(grid) - 2) # Corner
+                target = (1, layout.rows - 2) # Corner
             else:
                 target = pacman_pos
         else:
@@ -53,117 +142,90 @@ class PacmanAI:
                 return random.choice(list(self.directions.keys()))
             target = pacman_pos
 
-        # Calculate path using A*
-        path = self.astar_search(grid, ghost_pos, target)
+        # Follow a shortest path towards the target
+        direction = self.step_towards(layout, ghost_pos, target, build_field=share_fields or target != pacman_pos)
         
-        if not path or len(path) < 2:
+        if direction is None:
             # No path found or already there, pick random valid move
-            valid_moves = self.get_valid_moves(grid, ghost_pos)
+            valid_moves = [
+                direction for direction, (dx, dy) in self.directions.items()
+                if layout.is_open(ghost_pos[0] + dx, ghost_pos[1] + dy)
+            ]
             return random.choice(valid_moves) if valid_moves else "IDLE"
-
-        # The next step in the path
-        next_step = path[1] # index 0 is current pos
-        
-        # Determine direction string from coordinate change
-        dx = next_step[0] - ghost_pos[0]
-        dy = next_step[1] - ghost_pos[1]
         
-        if dx == 1: return "RIGHT"
-        if dx == -1: return "LEFT"
-        if dy == 1: return "DOWN"
-        if dy == -1: return "UP"
+        return direction
+
+    def step_towards(self, layout: WallLayout, pos: Tuple[int, int], target: Tuple[int, int],
+                     build_field: bool = True) -> Optional[str]:
+        """First direction of a shortest path from pos to target, or None if unreachable or already there.
+
+        Reads the target's cached distance field, building it if `build_field`;
+        without a field the path comes from a single A* search.
+        """
+        distances = self.distance_cache.cached(layout, target)
+        if distances is None and build_field:
+            distances = self.distance_cache.distances(layout, target)
+        if distances is None:
+            path = self.astar_search(layout, pos, target)
+            if not path or len(path) < 2:
+                return None
+            step = (path[1][0] - pos[0], path[1][1] - pos[1])
+            return next(direction for direction, delta in self.directions.items() if delta == step)
+
+        if not layout.is_open(*pos):
+            return None
+        distance = distances[pos[1] * layout.cols + pos[0]]
+        if distance <= 0:
+            return None
         
-        return "IDLE"
+        for direction, (dx, dy) in self.directions.items():
+            nx, ny = pos[0] + dx, pos[1] + dy
+            if layout.is_open(nx, ny) and distances[ny * layout.cols + nx] == distance - 1:
+                return direction
+        return None
 
     def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
         """Manhattan Distance: |x1 - x2| + |y1 - y2|"""
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-    def get_valid_moves(self, grid: List[List[int]], pos: Tuple[int, int]) -> List[str]:
-        moves = []
-        rows = len(grid)
-        cols = len(grid[0])
-        
-        for direction, (dx, dy) in self.directions.items():
-            nx, ny = pos[0] + dx, pos[1] + dy
-            
-            # Check bounds
-            if 0 <= nx < cols and 0 <= ny < rows:
-                # Check walls (Assuming 1 is wall)
-                if grid[ny][nx] != 1:
-                    moves.append(direction)
-        return moves
-
-    def astar_search(self, grid: List[List[int]], start: Tuple[int, int], end: Tuple[int, int]):
-        """A* Pathfinding Algorithm"""
-        
-        # Ensure start and end are valid
-        rows = len(grid)
-        cols = len(grid[0])
-        
-        # Create start and end node
-        start_node = Node(start, None)
-        end_node = Node(end, None)
-
-        open_list = []
-        closed_list = []
-
-        heapq.heappush(open_list, start_node)
-
-        # Max iterations to prevent infinite loops in bad grids
-        iterations = 0
-        max_iterations = 200 
-
-        while open_list:
-            iterations += 1
-            if iterations > max_iterations:
-                return None # Too expensive, fallback
-
-            # Get current node
-            current_node = heapq.heappop(open_list)
-            closed_list.append(current_node)
+    def astar_search(self, layout: WallLayout, start: Tuple[int, int], end: Tuple[int, int]):
+        """A* Pathfinding Algorithm; returns the list of positions from start to end, or None"""
+        if not layout.is_open(*start) or not layout.is_open(*end):
+            return None
+
+        # Heap entries are (f, h, tie-breaker, position). A position can be pushed
+        # again with a better g; the stale entry is skipped when popped.
+        g_score: Dict[Tuple[int, int], int] = {start: 0}
+        parents: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+        closed = set()
+        counter = 0
+        h = self.heuristic(start, end)
+        open_heap = [(h, h, counter, start)]
+
+        while open_heap:
+            _, _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            closed.add(current)
 
             # Found the goal
-            if current_node == end_node:
+            if current == end:
                 path = []
-                current = current_node
                 while current is not None:
-                    path.append(current.position)
-                    current = current.parent
+                    path.append(current)
+                    current = parents[current]
                 return path[::-1] # Return reversed path
 
-            # Generate children
-            children = []
-            for direction, (dx, dy) in self.directions.items():
-                node_position = (current_node.position[0] + dx, current_node.position[1] + dy)
-
-                # Check within range
-                if node_position[0] > (cols - 1) or node_position[0] < 0 or node_position[1] > (rows - 1) or node_position[1] < 0:
-                    continue
-
-                # Make sure walkable terrain
-                if grid[node_position[1]][node_position[0]] == 1:
-                    continue
-
-                new_node = Node(node_position, current_node)
-                children.append(new_node)
-
-            # Loop through children
-            for child in children:
-                # Child is on the closed list
-                if len([closed_child for closed_child in closed_list if closed_child == child]) > 0:
+            child_g = g_score[current] + 1
+            for dx, dy in self.directions.values():
+                child = (current[0] + dx, current[1] + dy)
+                if child in closed or not layout.is_open(*child):
                     continue
-
-                # Create the f, g, and h values
-                child.g = current_node.g + 1
-                child.h = self.heuristic(child.position, end_node.position)
-                child.f = child.g + child.h
-
-                # Child is already in the open list
-                if len([open_node for open_node in open_list if child == open_node and child.g > open_node.g]) > 0:
-                    continue
-
-                # Add the child to the open list
-                heapq.heappush(open_list, child)
-        
-        return None
\ No newline at end of file
+                if child_g < g_score.get(child, child_g + 1):
+                    g_score[child] = child_g
+                    parents[child] = current
+                    h = self.heuristic(child, end)
+                    counter += 1
+                    heapq.heappush(open_heap, (child_g + h, h, counter, child))
+
+        return None
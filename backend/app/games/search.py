@@ -0,0 +1,223 @@
+import sys
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+# Hard ceiling for a per-request budget so one client can't pin a worker
+MAX_TIME_BUDGET_MS = 10000
+
+# How often (in nodes) the clock is actually read
+CLOCK_CHECK_INTERVAL = 1024
+
+
+class SearchTimeout(Exception):
+    """Raised from inside a search when its time budget has run out"""
+
+
+class SearchStats(NamedTuple):
+    depth: int       # Deepest fully completed iteration
+    nodes: int       # Nodes searched across all iterations
+    time_ms: float
+    timed_out: bool  # True if the last iteration was abandoned
+    book: bool = False  # True if the move came from an opening book, not a search
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class SearchClock:
+    """Counts nodes and enforces a wall-clock budget for one search"""
+    __slots__ = ('start', 'deadline', 'budget_ms', 'nodes', 'iterations')
+
+    def __init__(self, budget_ms: Optional[float] = None):
+        self.start = time.perf_counter()
+        self.budget_ms = budget_ms
+        self.deadline = self.start + budget_ms / 1000 if budget_ms is not None else None
+        self.nodes = 0
+        # (depth, nodes so far, elapsed ms) as each iterative-deepening iteration completes
+        self.iterations: List[Tuple[int, int, float]] = []
+
+    def tick(self):
+        """Call once per node; raises SearchTimeout once the deadline has passed"""
+        self.nodes += 1
+        if (self.deadline is not None and not self.nodes % CLOCK_CHECK_INTERVAL
+                and time.perf_counter() >= self.deadline):
+            raise SearchTimeout()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+
+def resolve_time_budget(requested_ms: Optional[int], default_ms: int) -> int:
+    """Pick the request's budget if given, clamped to [1, MAX_TIME_BUDGET_MS]"""
+    if requested_ms is None:
+        return default_ms
+    return max(1, min(int(requested_ms), MAX_TIME_BUDGET_MS))
+
+
+def resolve_search_budget(requested_ms: Optional[int], default_ms: int,
+                          max_depth: Optional[int] = None) -> Optional[int]:
+    """Like resolve_time_budget, but a fixed-depth search with no requested budget gets no time limit"""
+    if max_depth is not None and requested_ms is None:
+        return None
+    return resolve_time_budget(requested_ms, default_ms)
+
+
+def iterative_deepening(search_depth: Callable[[int, List[Any]], Tuple[Any, float, List[Any]]],
+                        max_depth: int, clock: SearchClock,
+                        fallback_move: Any = None) -> Tuple[Any, SearchStats]:
+    """Run search_depth(1), search_depth(2), ... until max_depth or the clock runs out.
+
+    search_depth(depth, previous_pv) must return (best_move, score, pv) for a
+    complete search to `depth`, where previous_pv is the principal variation
+    of the last completed iteration (use it to order moves). Returns the best
+    move of the deepest completed iteration, or `fallback_move` if not even
+    depth 1 finished.
+    """
+    best_move = fallback_move
+    completed_depth = 0
+    pv: List[Any] = []
+    timed_out = False
+
+    for depth in range(1, max_depth + 1):
+        try:
+            move, score, line = search_depth(depth, pv)
+        except SearchTimeout:
+            timed_out = True
+            break
+
+        completed_depth = depth
+        clock.iterations.append((depth, clock.nodes, round(clock.elapsed_ms(), 1)))
+        if move is not None:
+            best_move = move
+        pv = line if line else ([move] if move is not None else [])
+
+        # A forced win or loss won't change with more depth
+        if score in (float('inf'), float('-inf')):
+            break
+        # Each iteration costs several times the last; don't start one we can't finish
+        if clock.budget_ms is not None and clock.elapsed_ms() * 2 > clock.budget_ms:
+            break
+
+    return best_move, SearchStats(completed_depth, clock.nodes, round(clock.elapsed_ms(), 1), timed_out)
+
+
+# --- Root splitting: one search's root moves spread over several processes ---
+
+# Depths a shared root bound is kept for
+MAX_SPLIT_DEPTH = 64
+# Entries per search in the shared array: a generation tag, then one bound per depth
+SPLIT_SLOT_SIZE = MAX_SPLIT_DEPTH + 1
+
+
+class RootBounds:
+    """Best exact root score found so far at each depth by the processes splitting one search.
+
+    `values` is a multiprocessing.Array('d') shared with the other processes
+    (or a plain list when the search isn't split) and `slot` picks this
+    search's entries in it. A slot is reused once its search is done, but a
+    process still finishing a cancelled search only ever writes to its own
+    generation of it.
+    """
+    __slots__ = ('values', 'offset', 'generation')
+
+    def __init__(self, values=None, slot: int = 0, generation: int = 0):
+        self.values = values if values is not None else [0.0] + [float('-inf')] * MAX_SPLIT_DEPTH
+        self.offset = slot * SPLIT_SLOT_SIZE
+        self.generation = generation
+
+    def reset(self):
+        """Claim the slot for a new search (run before its processes start)"""
+        lock = getattr(self.values, 'get_lock', None)
+        with lock() if lock is not None else nullcontext():
+            self.values[self.offset] = self.generation
+            for depth in range(1, MAX_SPLIT_DEPTH + 1):
+                self.values[self.offset + depth] = float('-inf')
+
+    def get(self, depth: int) -> float:
+        return self.values[self.offset + depth]
+
+    def raise_to(self, depth: int, value: float):
+        lock = getattr(self.values, 'get_lock', None)
+        if lock is None:
+            self.values[self.offset + depth] = max(self.get(depth), value)
+            return
+        with lock():
+            if self.values[self.offset] == self.generation and value > self.values[self.offset + depth]:
+                self.values[self.offset + depth] = value
+
+
+class SplitResult(NamedTuple):
+    best: List[Tuple[float, int, Any]]  # (score, root move index, move) per completed depth
+    fallback: Tuple[int, Any]           # (index, move) to play if no depth completed
+    nodes: int
+    time_ms: float
+    timed_out: bool
+    book: bool = False                  # The move came from an opening book: `fallback` holds it
+
+
+def split_root_search(search_move: Callable[[Any, int, float], float], moves: List[Any], share: int, shares: int,
+                      bounds: RootBounds, max_depth: int, clock: SearchClock, tie_margin: float) -> SplitResult:
+    """Search root moves share, share + shares, ... of `moves` with iterative deepening.
+
+    search_move(move, depth, alpha) must return the move's score to `depth`
+    (exact when above alpha, an upper bound otherwise). Each move is searched
+    with the best exact score any process has found at this depth as alpha,
+    less `tie_margin`: a move that only ties still gets its exact score, so
+    merge_split_results can break ties by root order and the chosen move
+    doesn't depend on which process got there first.
+    """
+    mine = [(index, move) for index, move in enumerate(moves) if index % shares == share]
+    completed: List[Tuple[float, int, Any]] = []
+    timed_out = False
+
+    for depth in range(1, min(max_depth, MAX_SPLIT_DEPTH) + 1):
+        best = None       # best exact score among this share's moves
+        fail_low = None   # best upper bound, used only if no move beat alpha
+        try:
+            for index, move in mine:
+                alpha = bounds.get(depth)
+                if best is not None:
+                    alpha = max(alpha, best[0])
+                # Capped so another forced win can still be told apart from a worse move
+                alpha = min(alpha, sys.float_info.max) - tie_margin
+                value = search_move(move, depth, alpha)
+                if value > alpha:
+                    if best is None or value > best[0]:
+                        best = (value, index, move)
+                        bounds.raise_to(depth, value)
+                elif fail_low is None or value > fail_low[0]:
+                    fail_low = (value, index, move)
+        except SearchTimeout:
+            timed_out = True
+            break
+
+        if best is None and fail_low is None:
+            break  # No root moves in this share
+        completed.append(best if best is not None else fail_low)
+        # A forced win won't change with more depth
+        if bounds.get(depth) == float('inf'):
+            break
+        if clock.budget_ms is not None and clock.elapsed_ms() * 2 > clock.budget_ms:
+            break
+
+    return SplitResult(completed, mine[0] if mine else (len(moves), None), clock.nodes,
+                       round(clock.elapsed_ms(), 1), timed_out)
+
+
+def merge_split_results(results: List[SplitResult]) -> Tuple[Any, SearchStats]:
+    """Best move at the deepest depth every share completed (ties go to the earlier root move)"""
+    for result in results:
+        if result.book:
+            return result.fallback[1], SearchStats(len(result.best), 0, result.time_ms, False, book=True)
+    nodes = sum(result.nodes for result in results)
+    time_ms = max((result.time_ms for result in results), default=0.0)
+    timed_out = any(result.timed_out for result in results)
+    searched = [result for result in results if result.fallback[1] is not None]
+    depth = min((len(result.best) for result in searched), default=0)
+    if depth == 0:
+        fallbacks = [result.fallback for result in searched]
+        move = min(fallbacks, key=lambda fallback: fallback[0])[1] if fallbacks else None
+        return move, SearchStats(0, nodes, time_ms, timed_out)
+    score, index, move = max((result.best[depth - 1] for result in searched), key=lambda best: (best[0], -best[1]))
+    return move, SearchStats(depth, nodes, time_ms, timed_out)
@@ -1,60 +1,99 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from app.models.game_models import Player, GameStatus
 
+# Board key: base-3 number with one digit per cell (row-major: 0 = empty, 1 = X,
+# 2 = O) and a tenth digit for the side to move (1 = X, 2 = O)
+CELL_DIGITS = {None: 0, 'X': 1, 'O': 2}
+POWERS = tuple(3 ** index for index in range(10))
+MOVER_POWER = POWERS[9]
+
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+    (0, 4, 8), (2, 4, 6)              # diagonals
+)
+
+# Perfect-play table: key -> ((cell index, score), ...) for every legal move of
+# the side to move. Scores are the minimax values the old search produced: a
+# win k plies after the move scores 10 - k, a loss k - 10, a draw 0.
+_solutions: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+
+
+def encode_board(board: List[List[Optional[str]]], player: str) -> int:
+    """Base-3 key of a 3x3 board with `player` to move"""
+    key = CELL_DIGITS[player] * MOVER_POWER
+    for index in range(9):
+        key += CELL_DIGITS[board[index // 3][index % 3]] * POWERS[index]
+    return key
+
+
+def _line_winner(cells: List[int]) -> int:
+    """Digit of the player with three in a row, or 0"""
+    for a, b, c in LINES:
+        if cells[a] and cells[a] == cells[b] == cells[c]:
+            return cells[a]
+    return 0
+
+
+def _solve(cells: List[int], key: int) -> int:
+    """Fill the table for this position and everything after it; returns its value for the side to move"""
+    if key not in _solutions:
+        mover = key // MOVER_POWER
+        other = 3 - mover
+        moves = []
+        for index in range(9):
+            if cells[index]:
+                continue
+            cells[index] = mover
+            if _line_winner(cells) == mover:
+                score = 10
+            elif 0 not in cells:
+                score = 0
+            else:
+                child_key = key + mover * POWERS[index] + (other - mover) * MOVER_POWER
+                # The opponent's value, seen from our side and one ply further away
+                score = -_solve(cells, child_key)
+                score += -1 if score > 0 else (1 if score < 0 else 0)
+            cells[index] = 0
+            moves.append((index, score))
+        _solutions[key] = tuple(moves)
+
+    moves = _solutions[key]
+    return max(score for _, score in moves) if moves else 0
+
+
+def move_scores(board: List[List[Optional[str]]], player: str) -> Dict[Tuple[int, int], int]:
+    """Minimax score of every legal move for `player` (empty if the game is already over)"""
+    cells = [CELL_DIGITS[board[index // 3][index % 3]] for index in range(9)]
+    if _line_winner(cells):
+        return {}
+    key = encode_board(board, player)
+    if key not in _solutions:
+        _solve(cells, key)
+    return {(index // 3, index % 3): score for index, score in _solutions[key]}
+
+
+# Every position reachable from the empty board is solved once at import
+_solve([0] * 9, CELL_DIGITS['X'] * MOVER_POWER)
+
+
 class TicTacToeAI:
     def __init__(self, player: Player):
         self.player = player
         self.opponent = Player.O if player == Player.X else Player.X
 
     def get_best_move(self, board: List[List[Optional[str]]]) -> Tuple[int, int]:
-        """Get the best move using Minimax algorithm"""
-        best_score = float('-inf')
-        best_move = (-1, -1)
-        
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] is None:
-                    board[i][j] = self.player
-                    score = self.minimax(board, 0, False)
-                    board[i][j] = None
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_move = (i, j)
-        
-        return best_move
-
-    def minimax(self, board: List[List[Optional[str]]], depth: int, is_maximizing: bool) -> int:
-        """Minimax algorithm with alpha-beta pruning"""
-        result = self.check_winner(board)
-        
-        if result == self.player:
-            return 10 - depth
-        elif result == self.opponent:
-            return depth - 10
-        elif self.is_board_full(board):
-            return 0
-
-        if is_maximizing:
-            best_score = float('-inf')
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] is None:
-                        board[i][j] = self.player
-                        score = self.minimax(board, depth + 1, False)
-                        board[i][j] = None
-                        best_score = max(score, best_score)
-            return best_score
-        else:
-            best_score = float('inf')
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] is None:
-                        board[i][j] = self.opponent
-                        score = self.minimax(board, depth + 1, True)
-                        board[i][j] = None
-                        best_score = min(score, best_score)
-            return best_score
+        """Get the best move from the precomputed minimax table"""
+        optimal = self.get_optimal_moves(board)
+        return optimal[0][0] if optimal else (-1, -1)
+
+    def get_optimal_moves(self, board: List[List[Optional[str]]]) -> List[Tuple[Tuple[int, int], int]]:
+        """All moves that share the best score, as ((row, col), score) in row-major order"""
+        scores = move_scores(board, self.player)
+        if not scores:
+            return []
+        best_score = max(scores.values())
+        return [(move, score) for move, score in scores.items() if score == best_score]
 
     def check_winner(self, board: List[List[Optional[str]]]) -> Optional[str]:
         """Check if there's a winner"""
@@ -82,4 +121,4 @@ class TicTacToeAI:
             for j in range(3):
                 if board[i][j] is None:
                     return False
-        return True
\ No newline at end of file
+        return True
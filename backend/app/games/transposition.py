@@ -0,0 +1,68 @@
+from typing import List, NamedTuple, Optional, Any
+
+# Bound types: what the stored value tells us about the true score
+EXACT = 0        # Value is the exact minimax score
+LOWER_BOUND = 1  # Search failed high: true score >= value
+UPPER_BOUND = 2  # Search failed low: true score <= value
+
+
+class TTEntry(NamedTuple):
+    key: int
+    depth: int
+    flag: int
+    value: float
+    best_move: Any
+    generation: int
+
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed by a 64-bit position hash.
+
+    Each key maps to a single slot (key & mask). When two positions collide
+    the new entry replaces the old one if it comes from a deeper search, is
+    for the same position, or the old entry is left over from a previous
+    search generation. Memory use never grows past `size` entries.
+    """
+
+    def __init__(self, size_bits: int = 16):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.entries: List[Optional[TTEntry]] = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Look up a position; returns None on a miss or a slot held by another position"""
+        self.probes += 1
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: float, best_move: Any = None):
+        index = key & self.mask
+        current = self.entries[index]
+        if (current is None or current.key == key or depth >= current.depth
+                or current.generation != self.generation):
+            self.entries[index] = TTEntry(key, depth, flag, value, best_move, self.generation)
+
+    def new_search(self):
+        """Age existing entries so the next search may overwrite them regardless of depth"""
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+
+def bound_flag(value: float, alpha: float, beta: float) -> int:
+    """Classify a search result against the window it was searched with"""
+    if value <= alpha:
+        return UPPER_BOUND
+    if value >= beta:
+        return LOWER_BOUND
+    return EXACT
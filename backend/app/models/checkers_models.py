@@ -4,6 +4,11 @@ from typing import List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 
+class CheckersDifficulty(str, Enum):
+    EASY = "easy"
+    MEDIUM = "medium"
+    HARD = "hard"
+
 class CheckersPlayer(str, Enum):
     WHITE = "white"
     BLACK = "black"
@@ -25,8 +30,21 @@ class CheckersMove(BaseModel):
     player: CheckersPlayer
 
 class CheckersGame(BaseModel):
+    """A stored checkers game; board cells hold CheckersGameLogic's 'r'/'w' pieces ('R'/'W' for kings)"""
     id: Optional[str] = None
-    state: GameState
-    moves: List[CheckersMove] = []
+    board: List[List[Optional[str]]] = Field(default_factory=lambda: create_initial_board())
+    current_player: str = "red"
+    difficulty: CheckersDifficulty = CheckersDifficulty.MEDIUM
+    moves: List[List[int]] = []  # [from_row, from_col, to_row, to_col] per move
+    jump_from: Optional[List[int]] = None  # [row, col] of a piece partway through a multi-jump
+    jump_captured: List[List[int]] = []  # [row, col] of the pieces it has jumped (still on the board)
+    version: int = 0  # bumped on every save; stale writes are rejected
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+def create_initial_board() -> List[List[Optional[str]]]:
+    """Red on the top three rows, white on the bottom three, dark squares only"""
+    return [
+        [('r' if row < 3 else 'w' if row > 4 else None) if (row + col) % 2 == 1 else None for col in range(8)]
+        for row in range(8)
+    ]
\ No newline at end of file
@@ -57,6 +57,7 @@ class ChessGame(BaseModel):
     moves: List[ChessMove] = []
     move_history: List[str] = []
     captured_pieces: Dict[str, List[str]] = {"white": [], "black": []}
+    version: int = 0  # bumped on every save; stale writes are rejected
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
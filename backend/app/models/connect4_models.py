@@ -36,6 +36,7 @@ class Connect4Game(BaseModel):
     status: Connect4GameStatus = Connect4GameStatus.IN_PROGRESS
     difficulty: Connect4Difficulty = Connect4Difficulty.MEDIUM
     moves: List[Connect4Move] = []
+    version: int = 0  # bumped on every save; stale writes are rejected
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
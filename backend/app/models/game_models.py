@@ -28,6 +28,7 @@ class TicTacToeGame(BaseModel):
     current_player: Player = Player.X
     status: GameStatus = GameStatus.IN_PROGRESS
     moves: List[TicTacToeMove] = []
+    version: int = 0  # bumped on every save; stale writes are rejected
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
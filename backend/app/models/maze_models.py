@@ -23,4 +23,6 @@ class MazeState(BaseModel):
     mouse_pos: Position
 
 class MazeMoveRequest(BaseModel):
-    state: MazeState
\ No newline at end of file
+    state: MazeState
+    # Same id on every move of a game lets the AI repair its last plan instead of searching again
+    session_id: Optional[str] = None
\ No newline at end of file
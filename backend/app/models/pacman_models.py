@@ -26,4 +26,7 @@ class GhostMoveRequest(BaseModel):
 
 class MoveResponse(BaseModel):
     direction: str
-    target_pos: Tuple[int, int]
\ No newline at end of file
+    target_pos: Tuple[int, int]
+
+class GhostMovesResponse(BaseModel):
+    moves: Dict[str, MoveResponse] # One entry per ghost in the request's game_state.ghosts
\ No newline at end of file
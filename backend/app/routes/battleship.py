@@ -1,22 +1,57 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List
-from app.games.battleship_ai import BattleshipAI
+import asyncio
+import os
+import random
+from fastapi import APIRouter, Request
+from pydantic import BaseModel, conint
+from typing import List, Optional
+from app.games.battleship_ai import MC_MAX_SAMPLES, BattleshipAI, sample_fleets
+from app.games.search import resolve_time_budget
+from app.services.engine_pool import engine_pool
 
 router = APIRouter(prefix="/api/battleship", tags=["Battleship"])
 ai_engine = BattleshipAI()
 
+# Sample budgets above this are split across the engine workers
+SAMPLES_PER_WORKER = int(os.getenv("BATTLESHIP_SAMPLES_PER_WORKER", 20000))
+
 class BattleshipRequest(BaseModel):
     board: List[List[int]] 
     difficulty: str = "hard" # Default
+    ships_remaining: Optional[List[int]] = None # Lengths still afloat; the full fleet if omitted
+    samples: Optional[conint(gt=0)] = None # Hard only: fleets to sample (server default if omitted)
+    time_limit_ms: Optional[conint(gt=0)] = None # Hard only: cap on sampling time
+
+async def choose_move(request: BattleshipRequest, http_request: Request):
+    if request.difficulty != "hard":
+        return ai_engine.get_best_move(request.board, request.difficulty, request.ships_remaining)
+
+    # Hard: sample fleets in the engine pool, one share per worker for big budgets
+    ships = request.ships_remaining or ai_engine.ships
+    # Both are clamped on the server so one request can't hold every worker
+    samples = min(request.samples or ai_engine.samples, MC_MAX_SAMPLES)
+    time_limit_ms = resolve_time_budget(request.time_limit_ms, ai_engine.time_limit_ms)
+    jobs = max(1, min(engine_pool.workers, samples // SAMPLES_PER_WORKER))
+    results = await asyncio.gather(*(
+        engine_pool.run("battleship", sample_fleets, request.board, ships, -(-samples // jobs), time_limit_ms,
+                        random.getrandbits(32), request=http_request)
+        for _ in range(jobs)
+    ))
+    counts = [sum(cell) for cell in zip(*(cell_counts for cell_counts, _ in results))]
+    fleets = sum(drawn for _, drawn in results)
+
+    move = ai_engine.best_sampled_cell(request.board, counts, fleets)
+    if move is None:
+        # Nothing consistent with the board could be sampled; use the heuristic modes
+        move = ai_engine.heuristic_move(request.board, "hard", ships)
+    return move
 
 @router.post("/next-move")
-async def get_battleship_move(request: BattleshipRequest):
+async def get_battleship_move(request: BattleshipRequest, http_request: Request):
     # Pass difficulty to AI
-    row, col = ai_engine.get_best_move(request.board, request.difficulty)
+    row, col = await choose_move(request, http_request)
     return {"row": row, "col": col}
 
 @router.post("/hint")
-async def get_hint(request: BattleshipRequest):
-    row, col = ai_engine.get_best_move(request.board, request.difficulty)
-    return {"row": row, "col": col}
\ No newline at end of file
+async def get_hint(request: BattleshipRequest, http_request: Request):
+    row, col = await choose_move(request, http_request)
+    return {"row": row, "col": col}
@@ -1,108 +1,140 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from typing import Optional
 from app.games.checkers_logic import CheckersGameLogic
-from app.games.checkers_ai import CheckersAI
+from app.services.engine_pool import engine_pool, checkers_best_move
+from app.services.game_store import game_store
 # app/routes/checkers.py
-from app.models.checkers_models import GameState, CheckersMove, CheckersGame
+from app.models.checkers_models import CheckersGame, CheckersDifficulty
 
 router = APIRouter()
 
-# Store active games (in production, use database)
-active_games = {}
+# Games live in the shared game store: cached in memory while active, kept in Mongo
+COLLECTION = "checkers_games"
+
+def game_logic_for(game: CheckersGame) -> CheckersGameLogic:
+    """Rules engine positioned at the stored game's board"""
+    game_logic = CheckersGameLogic()
+    game_logic.board = game.board
+    game_logic.current_player = game.current_player
+    game_logic.jump_from = tuple(game.jump_from) if game.jump_from else None
+    game_logic.jump_captured = [tuple(square) for square in game.jump_captured]
+    return game_logic
+
+def human_moves(game_logic: CheckersGameLogic):
+    """Red's legal moves for the UI to offer (only the rest of the chain mid multi-jump), or none off turn"""
+    if game_logic.current_player != 'red':
+        return []
+    return game_logic.get_legal_moves('red')
+
+async def load_game(game_id: str) -> CheckersGame:
+    game = await game_store.load(COLLECTION, game_id, CheckersGame)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return game
 
 @router.post("/new")
-async def new_checkers_game(difficulty: str = "medium"):
+async def new_checkers_game(difficulty: CheckersDifficulty = CheckersDifficulty.MEDIUM):
     """Start a new checkers game"""
-    game_id = str(len(active_games) + 1)
-    game_logic = CheckersGameLogic()
-    ai = CheckersAI(difficulty)
-    
-    active_games[game_id] = {
-        'logic': game_logic,
-        'ai': ai,
-        'difficulty': difficulty
-    }
-    
+    game = CheckersGame(difficulty=difficulty)
+    game_id = await game_store.create(COLLECTION, game)
+
     return {
         "game_id": game_id,
-        "board": game_logic.board,
-        "current_player": game_logic.current_player,
+        "board": game.board,
+        "current_player": game.current_player,
+        "valid_moves": human_moves(game_logic_for(game)),
         "message": "New checkers game started"
     }
 
 @router.post("/{game_id}/move")
-async def make_checkers_move(game_id: str, from_row: int, from_col: int, to_row: int, to_col: int):
+async def make_checkers_move(game_id: str, from_row: int, from_col: int, to_row: int, to_col: int,
+                             request: Request, time_budget_ms: Optional[int] = None):
     """Make a move in checkers"""
-    if game_id not in active_games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game_data = active_games[game_id]
-    game_logic = game_data['logic']
-    
+    game = await load_game(game_id)
+    game_logic = game_logic_for(game)
+
     # Validate move
     if game_logic.current_player != 'red':  # Only human (red) can move directly
         raise HTTPException(status_code=400, detail="Not your turn")
-    
-    # Make the move
+
+    # Make the move on the loaded copy; a cancelled AI search leaves the stored game untouched
     success = game_logic.make_move(from_row, from_col, to_row, to_col)
     if not success:
         raise HTTPException(status_code=400, detail="Invalid move")
-    
+    game.moves.append([from_row, from_col, to_row, to_col])
+
     response = {
         "move_made": True,
         "board": game_logic.board,
         "current_player": game_logic.current_player,
+        "jump_from": game_logic.jump_from,
+        "jump_captured": game_logic.jump_captured,
+        "valid_moves": human_moves(game_logic),
         "game_over": game_logic.is_game_over(),
         "winner": game_logic.get_winner()
     }
-    
+
     # If game continues and it's AI's turn, make AI move
     if not game_logic.is_game_over() and game_logic.current_player == 'white':
-        ai_move = await make_ai_move(game_id)
+        ai_move = await make_ai_move(game, game_logic, time_budget_ms, request)
         response['ai_move'] = ai_move
         # Update response with state AFTER AI move
         response['board'] = game_logic.board
         response['current_player'] = game_logic.current_player
+        response['valid_moves'] = human_moves(game_logic)
         response['game_over'] = game_logic.is_game_over()
         response['winner'] = game_logic.get_winner()
-    
+
+    # Save the human move and the AI reply together
+    game.board = game_logic.board
+    game.current_player = game_logic.current_player
+    game.jump_from = list(game_logic.jump_from) if game_logic.jump_from else None
+    game.jump_captured = [list(square) for square in game_logic.jump_captured]
+    await game_store.save(COLLECTION, game_id, game)
+
     return response
 
-async def make_ai_move(game_id: str):
+async def make_ai_move(game: CheckersGame, game_logic: CheckersGameLogic, time_budget_ms: Optional[int] = None,
+                       request: Optional[Request] = None):
     """Make AI move"""
-    game_data = active_games[game_id]
-    game_logic = game_data['logic']
-    ai = game_data['ai']
-    
-    # Get AI move
-    ai_move = ai.get_best_move(game_logic.board, 'white')
-    
+    # Get AI move (searched in the engine pool)
+    ai_move, ai_search = await engine_pool.run(
+        "checkers", checkers_best_move, game_logic.board, 'white', game.difficulty.value, time_budget_ms,
+        request=request
+    )
+
     if ai_move:
-        # Make the AI move
+        # Make the AI move (a multi-jump is played whole, along its path)
         game_logic.make_move(
             ai_move['from_row'], ai_move['from_col'],
-            ai_move['to_row'], ai_move['to_col']
+            ai_move['to_row'], ai_move['to_col'],
+            path=ai_move.get('path')
         )
-        
+        game.moves.append([ai_move['from_row'], ai_move['from_col'], ai_move['to_row'], ai_move['to_col']])
+
         return {
             "from_row": ai_move['from_row'],
             "from_col": ai_move['from_col'],
             "to_row": ai_move['to_row'],
             "to_col": ai_move['to_col'],
-            "capture": ai_move.get('capture', False)
+            "capture": ai_move.get('capture', False),
+            "path": ai_move.get('path', []),
+            "captured": ai_move.get('captured', []),
+            "search": ai_search
         }
     return None
 
 @router.get("/{game_id}")
 async def get_checkers_game_state(game_id: str):
     """Get current game state"""
-    if game_id not in active_games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game_logic = active_games[game_id]['logic']
-    
+    game_logic = game_logic_for(await load_game(game_id))
+
     return {
         "board": game_logic.board,
         "current_player": game_logic.current_player,
+        "jump_from": game_logic.jump_from,
+        "jump_captured": game_logic.jump_captured,
+        "valid_moves": human_moves(game_logic),
         "game_over": game_logic.is_game_over(),
         "winner": game_logic.get_winner()
     }
@@ -110,8 +142,7 @@ async def get_checkers_game_state(game_id: str):
 @router.delete("/{game_id}")
 async def delete_checkers_game(game_id: str):
     """Delete a checkers game"""
-    if game_id in active_games:
-        del active_games[game_id]
+    if await game_store.delete(COLLECTION, game_id):
         return {"message": "Game deleted"}
-    
-    raise HTTPException(status_code=404, detail="Game not found")
\ No newline at end of file
+
+    raise HTTPException(status_code=404, detail="Game not found")
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from typing import Optional
 from app.models.chess_models import ChessGame, ChessMove, ChessPlayer, GameStatus, ChessDifficulty
-from app.games.chess_ai import ChessAI
 from app.games.chess_logic import ChessGameLogic
-from app.database import get_collection
-from bson import ObjectId
-from datetime import datetime
+from app.services.chess_memory import chess_memory
+from app.services.game_store import game_store
+from app.services.engine_pool import engine_pool, chess_best_move, chess_split_search
 import json
 
 router = APIRouter(prefix="/api/chess", tags=["Chess"])
@@ -12,16 +12,11 @@ router = APIRouter(prefix="/api/chess", tags=["Chess"])
 @router.post("/new-game")
 async def create_new_game(difficulty: ChessDifficulty = ChessDifficulty.MEDIUM):
     """Create a new chess game"""
-    collection = get_collection("chess_games")
-    
     new_game = ChessGame(difficulty=difficulty)
-    game_dict = new_game.dict()
-    game_dict["_id"] = ObjectId()
-    
-    result = await collection.insert_one(game_dict)
+    game_id = await game_store.create("chess_games", new_game)
     
     return {
-        "game_id": str(result.inserted_id),
+        "game_id": game_id,
         "board": new_game.board,
         "current_player": new_game.current_player,
         "status": new_game.status,
@@ -29,17 +24,13 @@ async def create_new_game(difficulty: ChessDifficulty = ChessDifficulty.MEDIUM):
     }
 
 @router.post("/{game_id}/move")
-async def make_move(game_id: str, move: ChessMove):
-    """Make a move in the chess game"""
-    collection = get_collection("chess_games")
-    
-    # Get the game
-    game_data = await collection.find_one({"_id": ObjectId(game_id)})
-    if not game_data:
+async def make_move(game_id: str, move: ChessMove, request: Request, time_budget_ms: Optional[int] = None):
+    """Make a move in the chess game (time_budget_ms overrides the AI's default thinking time)"""
+    # Get the game (from the hot cache when it's active)
+    game = await game_store.load("chess_games", game_id, ChessGame)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    game = ChessGame(**game_data)
-    
     # Validate move
     if game.status != GameStatus.IN_PROGRESS and game.status != GameStatus.CHECK:
         raise HTTPException(status_code=400, detail="Game is already over")
@@ -77,9 +68,8 @@ async def make_move(game_id: str, move: ChessMove):
         # 🔥 CRITICAL CHANGE: THIS TRIGGERS THE LEARNING 🔥
         # ======================================================
         if game.status == GameStatus.WHITE_WON:
-            print("AI Lost! Triggering reinforcement learning...")
-            ai = ChessAI(game.difficulty.value)
-            ai.learn_from_loss(game.move_history)
+            print("AI Lost! Queueing reinforcement learning...")
+            chess_memory.learn_from_loss(game.move_history)
         # ======================================================
             
     elif game_logic.is_stalemate(opponent.value):
@@ -89,30 +79,31 @@ async def make_move(game_id: str, move: ChessMove):
     else:
         game.status = GameStatus.IN_PROGRESS
         
-    # Update game in database (Human move)
-    await collection.update_one(
-        {"_id": ObjectId(game_id)},
-        {
-            "$set": {
-                "board": game.board,
-                "current_player": opponent, 
-                "status": game.status,
-                "moves": [move.dict() for move in game.moves],
-                "move_history": game.move_history,
-                "updated_at": datetime.utcnow()
-            }
-        }
-    )
+    # Search for the AI reply before saving anything, so a request cancelled
+    # mid-search (client disconnected) leaves the stored game untouched
+    ai_move_data, ai_search = None, None
+    ai_to_move = (game.status == GameStatus.IN_PROGRESS or game.status == GameStatus.CHECK) and \
+        opponent == ChessPlayer.BLACK
+    if ai_to_move:
+        # Hard mode steers clear of moves it has lost with before in this position
+        avoid_moves = await chess_memory.bad_moves(game.board) if game.difficulty == ChessDifficulty.HARD else ()
+        if game.difficulty == ChessDifficulty.HARD and engine_pool.split_workers > 1:
+            # Root moves spread over several engine workers
+            ai_move_data, ai_search = await engine_pool.run_split(
+                "chess", chess_split_search, game.board, 'black', game.difficulty.value, time_budget_ms,
+                avoid_moves, request=request
+            )
+        else:
+            ai_move_data, ai_search = await engine_pool.run(
+                "chess", chess_best_move, game.board, 'black', game.difficulty.value, time_budget_ms, avoid_moves,
+                request=request
+            )
     
     # Update local game object for AI processing
     game.current_player = opponent
 
     # If game is still in progress and it's AI's turn (Black), make AI move
-    if (game.status == GameStatus.IN_PROGRESS or game.status == GameStatus.CHECK) and \
-       game.current_player == ChessPlayer.BLACK:
-        
-        ai = ChessAI(game.difficulty.value)
-        ai_move_data = ai.get_best_move(game.board, 'black')
+    if ai_to_move:
         
         # 1. SAFETY CHECK: Did AI actually find a move?
         if ai_move_data and 'from' in ai_move_data and 'to' in ai_move_data:
@@ -156,56 +147,46 @@ async def make_move(game_id: str, move: ChessMove):
                 print("🚨 AI tried to play an illegal move! Forcing Loss.")
                 game.status = GameStatus.WHITE_WON
                 # Trigger learning for this crash
-                ai.learn_from_loss(game.move_history)
+                chess_memory.learn_from_loss(game.move_history)
         else:
             # AI returned NO move (It gave up/Checkmate)
             print("🏳️ AI has no moves left. You win!")
             game.status = GameStatus.WHITE_WON
-            ai.learn_from_loss(game.move_history)
+            chess_memory.learn_from_loss(game.move_history)
 
-        # Update with AI move (or Game Over status)
-        await collection.update_one(
-            {"_id": ObjectId(game_id)},
-            {
-                "$set": {
-                    "board": game.board,
-                    "current_player": game.current_player,
-                    "status": game.status,
-                    "moves": [move.dict() for move in game.moves],
-                    "move_history": game.move_history,
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
+    # Save the human move and the AI reply (or Game Over status) together
+    await game_store.save("chess_games", game_id, game)
+    
     return {
         "board": game.board,
         "current_player": game.current_player,
         "status": game.status,
         "last_move": move.dict(),
-        "difficulty": game.difficulty
+        "difficulty": game.difficulty,
+        "ai_search": ai_search
     }
 
+@router.get("/learning/stats")
+async def get_learning_stats():
+    """Background learning queue: depth, processing lag and throughput"""
+    return chess_memory.stats()
+
 @router.get("/{game_id}")
 async def get_game_state(game_id: str):
     """Get current game state"""
-    collection = get_collection("chess_games")
-    
-    game_data = await collection.find_one({"_id": ObjectId(game_id)})
-    if not game_data:
+    game = await game_store.load("chess_games", game_id, ChessGame)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    return ChessGame(**game_data)
+    return game
 
 @router.get("/{game_id}/legal-moves")
 async def get_legal_moves(game_id: str, square: str):
     """Get legal moves for a piece at the given square"""
-    collection = get_collection("chess_games")
-    
-    game_data = await collection.find_one({"_id": ObjectId(game_id)})
-    if not game_data:
+    game = await game_store.load("chess_games", game_id, ChessGame)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    game = ChessGame(**game_data)
     game_logic = ChessGameLogic(game.board)
     
     # Get the piece at the square
@@ -1,32 +1,20 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from typing import Optional
 from app.models.connect4_models import Connect4Game, Connect4Move, Connect4Player, Connect4GameStatus, Connect4Difficulty
-from app.games.connect4_ai import Connect4AI
 from app.games.connect4_logic import Connect4GameLogic
-from app.database import get_collection
-from bson import ObjectId
-from datetime import datetime
+from app.services.engine_pool import engine_pool, connect4_best_move, connect4_split_search
+from app.services.game_store import game_store
 
 router = APIRouter(prefix="/api/connect4", tags=["Connect 4"])
 
-def safe_object_id(id_str: str):
-    """Safely handle ObjectId conversion for both real and mock databases"""
-    try:
-        return ObjectId(id_str)
-    except:
-        return id_str
-
 @router.post("/new-game")
 async def create_new_game(difficulty: Connect4Difficulty = Connect4Difficulty.MEDIUM):
     """Create a new Connect 4 game"""
-    collection = get_collection("connect4_games")
-    
     new_game = Connect4Game(difficulty=difficulty)
-    game_dict = new_game.dict()
-    
-    result = await collection.insert_one(game_dict)
+    game_id = await game_store.create("connect4_games", new_game)
     
     return {
-        "game_id": str(result.inserted_id),
+        "game_id": game_id,
         "board": new_game.board,
         "current_player": new_game.current_player,
         "status": new_game.status,
@@ -34,17 +22,13 @@ async def create_new_game(difficulty: Connect4Difficulty = Connect4Difficulty.ME
     }
 
 @router.post("/{game_id}/move")
-async def make_move(game_id: str, move: Connect4Move):
-    """Make a move in the Connect 4 game"""
-    collection = get_collection("connect4_games")
-    
-    # Get the game
-    game_data = await collection.find_one({"_id": safe_object_id(game_id)})
-    if not game_data:
+async def make_move(game_id: str, move: Connect4Move, request: Request, time_budget_ms: Optional[int] = None):
+    """Make a move in the Connect 4 game (time_budget_ms overrides the AI's default thinking time)"""
+    # Get the game (from the hot cache when it's active)
+    game = await game_store.load("connect4_games", game_id, Connect4Game)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    game = Connect4Game(**game_data)
-    
     # Validate move
     if game.status != Connect4GameStatus.IN_PROGRESS:
         raise HTTPException(status_code=400, detail="Game is already over")
@@ -81,25 +65,25 @@ async def make_move(game_id: str, move: Connect4Move):
     if game.status == Connect4GameStatus.IN_PROGRESS:
         game.current_player = Connect4Player.YELLOW if game.current_player == Connect4Player.RED else Connect4Player.RED
     
-    # Update game in database
-    await collection.update_one(
-        {"_id": safe_object_id(game_id)},
-        {
-            "$set": {
-                "board": game.board,
-                "current_player": game.current_player,
-                "status": game.status,
-                "moves": [move.dict() for move in game.moves],
-                "updated_at": datetime.utcnow()
-            }
-        }
-    )
+    # Search for the AI reply before saving anything, so a request cancelled
+    # mid-search (client disconnected) leaves the stored game untouched
+    ai_column, ai_search = None, None
+    ai_to_move = game.status == Connect4GameStatus.IN_PROGRESS and game.current_player == Connect4Player.YELLOW
+    if ai_to_move:
+        if game.difficulty == Connect4Difficulty.HARD and engine_pool.split_workers > 1:
+            # Root columns spread over several engine workers
+            ai_column, ai_search = await engine_pool.run_split(
+                "connect4", connect4_split_search, game.board, 'yellow', game.difficulty.value, time_budget_ms,
+                request=request
+            )
+        else:
+            ai_column, ai_search = await engine_pool.run(
+                "connect4", connect4_best_move, game.board, 'yellow', game.difficulty.value, time_budget_ms,
+                request=request
+            )
     
     # If game is still in progress and it's AI's turn, make AI move
-    if game.status == Connect4GameStatus.IN_PROGRESS and game.current_player == Connect4Player.YELLOW:
-        ai = Connect4AI(game.difficulty.value)
-        ai_column = ai.get_best_move(game.board, 'yellow')
-        
+    if ai_to_move:
         # Make AI move
         ai_logic = Connect4GameLogic(game.board)
         ai_row = ai_logic.drop_piece(ai_column, 'yellow')
@@ -123,50 +107,35 @@ async def make_move(game_id: str, move: Connect4Move):
             # Switch back to human player if game continues
             if game.status == Connect4GameStatus.IN_PROGRESS:
                 game.current_player = Connect4Player.RED
-            
-            # Update with AI move
-            await collection.update_one(
-                {"_id": safe_object_id(game_id)},
-                {
-                    "$set": {
-                        "board": game.board,
-                        "current_player": game.current_player,
-                        "status": game.status,
-                        "moves": [move.dict() for move in game.moves],
-                        "updated_at": datetime.utcnow()
-                    }
-                }
-            )
+    
+    # Save the human move and the AI reply together
+    await game_store.save("connect4_games", game_id, game)
     
     return {
         "board": game.board,
         "current_player": game.current_player,
         "status": game.status,
         "last_move": move.dict(),
-        "difficulty": game.difficulty
+        "difficulty": game.difficulty,
+        "ai_search": ai_search
     }
 
 @router.get("/{game_id}")
 async def get_game_state(game_id: str):
     """Get current game state"""
-    collection = get_collection("connect4_games")
-    
-    game_data = await collection.find_one({"_id": safe_object_id(game_id)})
-    if not game_data:
+    game = await game_store.load("connect4_games", game_id, Connect4Game)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    return Connect4Game(**game_data)
+    return game
 
 @router.get("/{game_id}/legal-moves")
 async def get_legal_moves(game_id: str):
     """Get all legal moves for the current player"""
-    collection = get_collection("connect4_games")
-    
-    game_data = await collection.find_one({"_id": safe_object_id(game_id)})
-    if not game_data:
+    game = await game_store.load("connect4_games", game_id, Connect4Game)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    game = Connect4Game(**game_data)
     game_logic = Connect4GameLogic(game.board)
     
     return {"legal_moves": game_logic.get_legal_moves()}
\ No newline at end of file
@@ -7,6 +7,7 @@ ai = MazeAI()
 
 @router.post("/next-move")
 async def get_cat_move(request: MazeMoveRequest):
-    """Calculates the next move for the AI Cat using A*"""
-    result = ai.get_next_move(request.state.grid, request.state.cat_pos, request.state.mouse_pos)
+    """Calculates the next move for the AI Cat (A*, or an incremental replan when a session_id is sent)"""
+    result = ai.get_next_move(request.state.grid, request.state.cat_pos, request.state.mouse_pos,
+                              request.session_id)
     return result
\ No newline at end of file
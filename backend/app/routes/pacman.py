@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from app.models.pacman_models import GhostMoveRequest, MoveResponse
+from app.models.pacman_models import GameState, GhostMoveRequest, GhostMovesResponse, MoveResponse
 from app.games.pacman_ai import PacmanAI
 
 router = APIRouter(prefix="/api/pacman", tags=["Pacman"])
@@ -37,4 +37,24 @@ async def get_ghost_move(request: GhostMoveRequest):
 
     except Exception as e:
         print(f"Error in Pacman AI: {e}")
-        return MoveResponse(direction="IDLE", target_pos=(0,0))
\ No newline at end of file
+        return MoveResponse(direction="IDLE", target_pos=(0,0))
+
+@router.post("/ghost-moves", response_model=GhostMovesResponse)
+async def get_ghost_moves(game_state: GameState):
+    """
+    Moves for every ghost in one request: the grid is sent, validated and
+    parsed once per tick, and the ghosts chasing Pacman share one BFS.
+    """
+    pacman_pos = (game_state.pacman.x, game_state.pacman.y)
+    ghosts = {ghost_type: (ghost.x, ghost.y) for ghost_type, ghost in game_state.ghosts.items()}
+
+    try:
+        directions = ai_engine.get_ghost_moves(game_state.grid, pacman_pos, ghosts)
+    except Exception as e:
+        print(f"Error in Pacman AI: {e}")
+        directions = {ghost_type: "IDLE" for ghost_type in ghosts}
+
+    return GhostMovesResponse(moves={
+        ghost_type: MoveResponse(direction=direction, target_pos=pacman_pos)
+        for ghost_type, direction in directions.items()
+    })
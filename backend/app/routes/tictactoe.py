@@ -1,25 +1,18 @@
 from fastapi import APIRouter, HTTPException
 from app.models.game_models import TicTacToeGame, TicTacToeMove, Player, GameStatus
-from app.games.tic_tac_toe_ai import TicTacToeAI
-from app.database import get_collection
-from bson import ObjectId
-from datetime import datetime
+from app.games.tic_tac_toe_ai import TicTacToeAI, move_scores
+from app.services.game_store import game_store
 
 router = APIRouter(prefix="/api/tictactoe", tags=["Tic Tac Toe"])
 
 @router.post("/new-game")
 async def create_new_game():
     """Create a new Tic Tac Toe game"""
-    collection = get_collection("tictactoe_games")
-    
     new_game = TicTacToeGame()
-    game_dict = new_game.dict()
-    game_dict["_id"] = ObjectId()
-    
-    result = await collection.insert_one(game_dict)
+    game_id = await game_store.create("tictactoe_games", new_game)
     
     return {
-        "game_id": str(result.inserted_id),
+        "game_id": game_id,
         "board": new_game.board,
         "current_player": new_game.current_player,
         "status": new_game.status
@@ -28,15 +21,11 @@ async def create_new_game():
 @router.post("/{game_id}/move")
 async def make_move(game_id: str, move: TicTacToeMove):
     """Make a move in the Tic Tac Toe game"""
-    collection = get_collection("tictactoe_games")
-    
-    # Get the game
-    game_data = await collection.find_one({"_id": ObjectId(game_id)})
-    if not game_data:
+    # Get the game (from the hot cache when it's active)
+    game = await game_store.load("tictactoe_games", game_id, TicTacToeGame)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    game = TicTacToeGame(**game_data)
-    
     # Validate move
     if game.status != GameStatus.IN_PROGRESS:
         raise HTTPException(status_code=400, detail="Game is already over")
@@ -60,20 +49,6 @@ async def make_move(game_id: str, move: TicTacToeMove):
     else:
         game.current_player = Player.O if game.current_player == Player.X else Player.X
     
-    # Update game in database
-    await collection.update_one(
-        {"_id": ObjectId(game_id)},
-        {
-            "$set": {
-                "board": game.board,
-                "current_player": game.current_player,
-                "status": game.status,
-                "moves": [move.dict() for move in game.moves],
-                "updated_at": datetime.utcnow()
-            }
-        }
-    )
-    
     # If game is still in progress and it's AI's turn, make AI move
     if game.status == GameStatus.IN_PROGRESS and game.current_player == Player.O:
         ai = TicTacToeAI(Player.O)
@@ -91,20 +66,9 @@ async def make_move(game_id: str, move: TicTacToeMove):
             game.status = GameStatus.DRAW
         else:
             game.current_player = Player.X
-        
-        # Update with AI move
-        await collection.update_one(
-            {"_id": ObjectId(game_id)},
-            {
-                "$set": {
-                    "board": game.board,
-                    "current_player": game.current_player,
-                    "status": game.status,
-                    "moves": [move.dict() for move in game.moves],
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
+    
+    # Save the player move and the AI reply together
+    await game_store.save("tictactoe_games", game_id, game)
     
     return {
         "board": game.board,
@@ -116,13 +80,31 @@ async def make_move(game_id: str, move: TicTacToeMove):
 @router.get("/{game_id}")
 async def get_game_state(game_id: str):
     """Get current game state"""
-    collection = get_collection("tictactoe_games")
+    game = await game_store.load("tictactoe_games", game_id, TicTacToeGame)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
     
-    game_data = await collection.find_one({"_id": ObjectId(game_id)})
-    if not game_data:
+    return game
+
+@router.get("/{game_id}/analysis")
+async def get_move_analysis(game_id: str):
+    """Perfect-play score of every legal move for the player to move, and which moves are optimal"""
+    game = await game_store.load("tictactoe_games", game_id, TicTacToeGame)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    return TicTacToeGame(**game_data)
+    if game.status != GameStatus.IN_PROGRESS:
+        return {"player": game.current_player, "moves": [], "optimal_moves": []}
+    
+    scores = move_scores(game.board, game.current_player.value)
+    best_score = max(scores.values()) if scores else None
+    moves = [{"row": row, "col": col, "score": score} for (row, col), score in scores.items()]
+    
+    return {
+        "player": game.current_player,
+        "moves": moves,
+        "optimal_moves": [move for move in moves if move["score"] == best_score]
+    }
 
 def check_winner(board):
     """Check for winner"""
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+
+from app.database import get_collection
+from app.games.chess_ai import find_fatal_move
+from app.games.chess_bitboard import placement_fen, placement_key
+
+# Positions whose bad-move sets are kept in memory (least recently used is dropped first)
+CHESS_MEMORY_CACHE_SIZE = int(os.getenv("CHESS_MEMORY_CACHE_SIZE", 4096))
+# Lost games waiting to be learned from; past this, new ones go straight to the spool file
+CHESS_LEARNING_QUEUE_SIZE = int(os.getenv("CHESS_LEARNING_QUEUE_SIZE", 10000))
+# Lost games learned from per bulk_write
+CHESS_LEARNING_BATCH_SIZE = int(os.getenv("CHESS_LEARNING_BATCH_SIZE", 100))
+# How long shutdown waits for the queue to drain before spooling what's left
+CHESS_LEARNING_DRAIN_SECONDS = float(os.getenv("CHESS_LEARNING_DRAIN_SECONDS", 5))
+# Pending games are saved here at shutdown and picked up again on the next start
+CHESS_LEARNING_SPOOL = Path(os.getenv(
+    "CHESS_LEARNING_SPOOL", Path(__file__).resolve().parent.parent.parent / "chess_learning_pending.jsonl"
+))
+
+COLLECTION = "chess_learning_memory"
+# One document per position: two positions can share a Zobrist key, so the FEN is part of the unique index
+INDEX_FIELDS = [("key", 1), ("fen", 1)]
+# The index it replaces, which made the second of two colliding positions fail to upsert
+OLD_KEY_INDEX = "key_1"
+
+Board = List[List[Optional[str]]]
+
+
+class LearningEvent(NamedTuple):
+    move_history: List[str]
+    enqueued_at: float  # time.time(), so lag survives a restart through the spool file
+
+
+def position_key(board: Board) -> Tuple[int, str]:
+    """(Zobrist key, placement FEN) identifying a position in the collection.
+
+    The 64-bit key is what's indexed and looked up; the FEN is stored next to
+    it and matched too, so a hash collision reads as an unknown position
+    rather than another position's bad moves.
+    """
+    return placement_key(board), placement_fen(board)
+
+
+def fatal_positions(events: List[LearningEvent]) -> Dict[Tuple[int, str], Set[str]]:
+    """Replay each lost game; the AI's losing moves grouped by the position they were played from"""
+    positions: Dict[Tuple[int, str], Set[str]] = {}
+    for event in events:
+        fatal = find_fatal_move(event.move_history)
+        if fatal is not None:
+            board, move_str = fatal
+            positions.setdefault(position_key(board), set()).add(move_str)
+    return positions
+
+
+class ChessMemory:
+    """The hard chess AI's learned bad moves, on the shared Motor client.
+
+    Each position's whole `bad_moves` set comes back from a single find_one
+    and is cached, including positions with no document, so the common case
+    of looking up a position again costs no round trip at all.
+
+    Learning is off the request path: lost games are queued and a background
+    task replays them in batches and records the losing moves with one
+    bulk_write per batch.
+    """
+
+    def __init__(self, cache_size: int = CHESS_MEMORY_CACHE_SIZE, queue_size: int = CHESS_LEARNING_QUEUE_SIZE,
+                 batch_size: int = CHESS_LEARNING_BATCH_SIZE, spool_path: Path = CHESS_LEARNING_SPOOL):
+        self.cache_size = max(1, cache_size)
+        # Keyed by (Zobrist key, FEN) like the collection, so colliding positions never share an entry
+        self.cache: "OrderedDict[Tuple[int, str], FrozenSet[str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.queue: "asyncio.Queue[LearningEvent]" = asyncio.Queue(maxsize=max(1, queue_size))
+        self.batch_size = max(1, batch_size)
+        self.spool_path = spool_path
+        self.learner: Optional[asyncio.Task] = None
+        self.in_flight: List[LearningEvent] = []
+        self.learned = 0
+        self.batches = 0
+        self.failed = 0
+        self.spooled = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    # --- lifecycle ---
+
+    def start(self):
+        """Reload games spooled by the last shutdown and start the learning task"""
+        if self.learner is not None:
+            return
+        for event in self._read_spool():
+            self.enqueue(event)
+        self.learner = asyncio.create_task(self._learn_continuously())
+
+    async def stop(self, drain_seconds: float = CHESS_LEARNING_DRAIN_SECONDS):
+        """Give the queue a moment to drain, then save whatever is still pending to the spool file"""
+        if self.learner is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), drain_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self.learner.cancel()
+        try:
+            await self.learner
+        except asyncio.CancelledError:
+            pass
+        self.learner = None
+
+        pending = self.in_flight
+        self.in_flight = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+            self.queue.task_done()
+        if pending:
+            self._write_spool(pending)
+            print(f"⚠️ Saved {len(pending)} unprocessed chess learning events to {self.spool_path}")
+
+    async def ensure_indexes(self):
+        collection = get_collection(COLLECTION)
+        # Partial, so documents not yet migrated (no key) can't collide on null
+        await collection.create_index(INDEX_FIELDS, unique=True, partialFilterExpression={"key": {"$exists": True}})
+        if OLD_KEY_INDEX in await collection.index_information():
+            await collection.drop_index(OLD_KEY_INDEX)
+
+    # --- lookups ---
+
+    async def bad_moves(self, board: Board) -> FrozenSet[str]:
+        """Moves learned as losing in this position (e.g. {'e2e4'}); empty if the lookup fails"""
+        position = position_key(board)
+        key, fen = position
+        moves = self.cache.get(position)
+        if moves is not None:
+            self.hits += 1
+            self.cache.move_to_end(position)
+            return moves
+
+        self.misses += 1
+        try:
+            doc = await get_collection(COLLECTION).find_one({"key": key, "fen": fen}, {"bad_moves": 1, "_id": 0})
+        except Exception as e:
+            print(f"⚠️ AI Memory lookup failed: {e}")
+            return frozenset()
+        moves = frozenset(doc.get("bad_moves", ())) if doc else frozenset()
+        self._remember(position, moves)
+        return moves
+
+    # --- learning ---
+
+    def learn_from_loss(self, move_history: List[str]):
+        """Queue a game the AI lost; its last move gets marked bad in the background"""
+        self.enqueue(LearningEvent(list(move_history), time.time()))
+
+    def enqueue(self, event: LearningEvent):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Never block or drop: the event waits in the spool file for the next start
+            self._write_spool([event])
+
+    async def _learn_continuously(self):
+        while True:
+            self.in_flight = [await self.queue.get()]
+            while len(self.in_flight) < self.batch_size and not self.queue.empty():
+                self.in_flight.append(self.queue.get_nowait())
+            try:
+                await self._learn_batch(self.in_flight)
+            except Exception as e:
+                # Mongo is unreachable or rejected the batch: keep the events for the next start
+                print(f"⚠️ AI Memory update failed, spooling {len(self.in_flight)} games: {e}")
+                self.failed += len(self.in_flight)
+                self._write_spool(self.in_flight)
+            for _ in self.in_flight:
+                self.queue.task_done()
+            self.in_flight = []
+
+    async def _learn_batch(self, events: List[LearningEvent]):
+        lag_ms = (time.time() - events[0].enqueued_at) * 1000
+        self.last_lag_ms = round(lag_ms, 1)
+        self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+
+        # Replaying is pure Python; a thread keeps it from holding up the event loop between games
+        positions = await asyncio.to_thread(fatal_positions, events)
+        if positions:
+            await get_collection(COLLECTION).bulk_write([
+                UpdateOne({"key": key, "fen": fen}, {"$addToSet": {"bad_moves": {"$each": sorted(moves)}}}, upsert=True)
+                for (key, fen), moves in positions.items()
+            ], ordered=False)
+        for position, moves in positions.items():
+            if position in self.cache:
+                self._remember(position, self.cache[position] | moves)
+        self.learned += len(events)
+        self.batches += 1
+        print(f"[AI Memory] 🧠 Learned from {len(events)} lost games ({len(positions)} positions).")
+
+    def _read_spool(self) -> List[LearningEvent]:
+        if not self.spool_path.exists():
+            return []
+        events = []
+        with open(self.spool_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    data = json.loads(line)
+                    events.append(LearningEvent(data["move_history"], data["enqueued_at"]))
+        self.spool_path.unlink()
+        print(f"Reloaded {len(events)} pending chess learning events from {self.spool_path}")
+        return events
+
+    def _write_spool(self, events: List[LearningEvent]):
+        with open(self.spool_path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event._asdict()) + "\n")
+        self.spooled += len(events)
+
+    def _remember(self, position: Tuple[int, str], moves: FrozenSet[str]):
+        self.cache[position] = moves
+        self.cache.move_to_end(position)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        oldest = self.in_flight[0].enqueued_at if self.in_flight else None
+        return {
+            "queue_depth": self.queue.qsize(),
+            "in_flight": len(self.in_flight),
+            "learned": self.learned,
+            "batches": self.batches,
+            "failed": self.failed,
+            "spooled": self.spooled,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+            "oldest_in_flight_ms": round((time.time() - oldest) * 1000, 1) if oldest else 0.0,
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+        }
+
+
+chess_memory = ChessMemory()
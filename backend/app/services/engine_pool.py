@@ -0,0 +1,271 @@
+import asyncio
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from app.games.chess_ai import ChessAI
+from app.games.connect4_ai import Connect4AI
+from app.games.checkers_ai import CheckersAI
+from app.games.connect4_book import get_book
+from app.games.checkers_endgame import get_endgame_table
+from app.games.search import SPLIT_SLOT_SIZE, RootBounds, merge_split_results
+
+# --- CONFIGURATION ---
+ENGINE_WORKERS = int(os.getenv("ENGINE_WORKERS", os.cpu_count() or 2))
+# Searches per game type allowed to run at once (defaults to every worker)
+ENGINE_MAX_RUNNING = int(os.getenv("ENGINE_MAX_RUNNING", ENGINE_WORKERS))
+# Searches per game type allowed to wait for a slot before we answer 503
+ENGINE_MAX_QUEUED = int(os.getenv("ENGINE_MAX_QUEUED", 8))
+ENGINE_START_METHOD = os.getenv("ENGINE_START_METHOD", "spawn")
+# Workers one hard chess or Connect 4 search is split over by root move (1 searches in a single worker)
+ENGINE_SPLIT_WORKERS = int(os.getenv("ENGINE_SPLIT_WORKERS", 1))
+# Split searches that can run at once (each needs a slot of shared root bounds)
+ENGINE_SPLIT_SLOTS = int(os.getenv("ENGINE_SPLIT_SLOTS", 64))
+
+# How often a waiting request checks whether its client has gone away
+DISCONNECT_POLL_SECONDS = 0.1
+
+GAME_TYPES = ("chess", "connect4", "checkers", "battleship")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+class EngineOverloaded(HTTPException):
+    """Too many searches already queued for this game type"""
+
+    def __init__(self, game: str):
+        super().__init__(status_code=503, detail=f"{game} engine is busy, try again shortly",
+                         headers={"Retry-After": "1"})
+
+
+class SearchCancelled(HTTPException):
+    """The client disconnected before its search finished"""
+
+    def __init__(self):
+        super().__init__(status_code=499, detail="Client closed request")
+
+
+# ======================================================
+# Worker side: these run inside the pool processes
+# ======================================================
+
+# AI objects are kept per process so transposition tables stay warm between requests
+_engines: Dict[Tuple[str, str], Any] = {}
+# Root bounds shared by the workers of each split search (a multiprocessing.Array, see EnginePool.start)
+_root_bounds = None
+
+
+def _init_worker(root_bounds):
+    global _root_bounds
+    _root_bounds = root_bounds
+
+
+def _engine(engine_class, difficulty: str):
+    # Only the known levels get an engine, so the cache (and its tables) stays bounded
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty: {difficulty!r}")
+    key = (engine_class.__name__, difficulty)
+    if key not in _engines:
+        _engines[key] = engine_class(difficulty)
+    return _engines[key]
+
+
+def _search_stats(ai) -> Optional[Dict[str, Any]]:
+    return ai.last_search.to_dict() if ai.last_search else None
+
+
+def warm_up() -> int:
+    """Build every engine and map the opening book and endgame table up front so the first real request doesn't pay for it"""
+    get_book()
+    get_endgame_table()
+    for difficulty in DIFFICULTIES:
+        _engine(ChessAI, difficulty)
+        _engine(Connect4AI, difficulty)
+        _engine(CheckersAI, difficulty)
+    return os.getpid()
+
+
+def chess_best_move(board, player: str, difficulty: str, time_budget_ms: Optional[int] = None,
+                    avoid_moves: Collection[str] = ()):
+    ai = _engine(ChessAI, difficulty)
+    move = ai.get_best_move(board, player, time_budget_ms, avoid_moves)
+    return move, _search_stats(ai)
+
+
+def connect4_best_move(board, player: str, difficulty: str, time_budget_ms: Optional[int] = None):
+    ai = _engine(Connect4AI, difficulty)
+    column = ai.get_best_move(board, player, time_budget_ms)
+    return column, _search_stats(ai)
+
+
+def checkers_best_move(board, player: str, difficulty: str, time_budget_ms: Optional[int] = None):
+    ai = _engine(CheckersAI, difficulty)
+    move = ai.get_best_move(board, player, time_budget_ms)
+    return move, _search_stats(ai)
+
+
+def _split_search(ai, seed: Optional[int], search: Callable):
+    """Run one share of a split search; a seed makes it reproducible (empty table, seeded RNG, exact-depth hits)"""
+    if seed is not None:
+        random.seed(seed)
+        ai.transposition_table.clear()
+    ai.reproducible = seed is not None
+    try:
+        return search()
+    finally:
+        ai.reproducible = False
+
+
+def chess_split_search(share: int, shares: int, slot: int, generation: int, board, player: str, difficulty: str,
+                       time_budget_ms: Optional[int] = None, avoid_moves: Collection[str] = (),
+                       max_depth: Optional[int] = None, seed: Optional[int] = None):
+    ai = _engine(ChessAI, difficulty)
+    bounds = RootBounds(_root_bounds, slot, generation)
+    return _split_search(ai, seed, lambda: ai.get_split_move(
+        board, player, share, shares, bounds, time_budget_ms, avoid_moves, max_depth
+    ))
+
+
+def connect4_split_search(share: int, shares: int, slot: int, generation: int, board, player: str, difficulty: str,
+                          time_budget_ms: Optional[int] = None, max_depth: Optional[int] = None,
+                          seed: Optional[int] = None):
+    ai = _engine(Connect4AI, difficulty)
+    bounds = RootBounds(_root_bounds, slot, generation)
+    return _split_search(ai, seed, lambda: ai.get_split_move(
+        board, player, share, shares, bounds, time_budget_ms, max_depth
+    ))
+
+
+# ======================================================
+# Server side: used from the async route handlers
+# ======================================================
+
+class GameQueue:
+    """Bounded admission for one game type: `running` slots plus a short waiting line"""
+
+    def __init__(self, max_running: int, max_queued: int):
+        self.slots = asyncio.Semaphore(max_running)
+        self.limit = max_running + max_queued
+        self.pending = 0
+
+
+class EnginePool:
+    """Runs CPU-bound AI searches in worker processes so the event loop stays responsive"""
+
+    def __init__(self, workers: int = ENGINE_WORKERS, max_running: int = ENGINE_MAX_RUNNING,
+                 max_queued: int = ENGINE_MAX_QUEUED, split_workers: int = ENGINE_SPLIT_WORKERS,
+                 split_slots: int = ENGINE_SPLIT_SLOTS):
+        self.workers = max(1, workers)
+        self.max_running = max(1, max_running)
+        self.max_queued = max(0, max_queued)
+        self.split_workers = max(1, min(split_workers, self.workers))
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.queues: Dict[str, GameQueue] = {}
+        self.root_bounds = None
+        self.free_slots = list(range(max(1, split_slots)))
+        self.split_generation = 0
+
+    async def start(self):
+        """Create the pool and spin every worker up before traffic arrives"""
+        if self.executor is not None:
+            return
+        context = multiprocessing.get_context(ENGINE_START_METHOD)
+        self.root_bounds = context.Array('d', len(self.free_slots) * SPLIT_SLOT_SIZE)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.root_bounds,)
+        )
+        self.queues = {game: GameQueue(self.max_running, self.max_queued) for game in GAME_TYPES}
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, warm_up) for _ in range(self.workers)
+        ))
+        print(f"✅ Engine pool ready: {len(set(pids))} worker processes")
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            print("Engine pool stopped")
+
+    async def run(self, game: str, func: Callable, *args, request: Optional[Request] = None):
+        """Run func(*args) in a worker and return its result.
+
+        Raises EngineOverloaded (503) when the game's queue is full and
+        SearchCancelled when `request`'s client disconnects first. A search
+        still waiting for a slot is dropped; one already running in a worker
+        can't be interrupted and simply finishes within its time budget.
+        """
+        if self.executor is None:
+            await self.start()
+
+        queue = self.queues[game]
+        if queue.pending >= queue.limit:
+            raise EngineOverloaded(game)
+
+        queue.pending += 1
+        try:
+            job = asyncio.ensure_future(self._run_in_slot(queue, func, args))
+            if request is None:
+                return await job
+
+            watcher = asyncio.ensure_future(self._wait_for_disconnect(request))
+            try:
+                await asyncio.wait({job, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                watcher.cancel()
+
+            if not job.done():
+                job.cancel()
+                raise SearchCancelled()
+            return job.result()
+        finally:
+            queue.pending -= 1
+
+    async def run_split(self, game: str, func: Callable, *args, shares: Optional[int] = None,
+                        request: Optional[Request] = None):
+        """Split one search by root move: func(share, shares, slot, generation, *args) in `shares`
+        workers at once (split_workers by default), sharing their best root score at each depth.
+
+        Returns the merged (move, search stats dict); raises like run().
+        """
+        if self.executor is None:
+            await self.start()
+        if not self.free_slots:
+            raise EngineOverloaded(game)
+
+        shares = shares or self.split_workers
+        slot = self.free_slots.pop()
+        self.split_generation += 1
+        generation = self.split_generation
+        RootBounds(self.root_bounds, slot, generation).reset()
+        try:
+            # Every share is awaited, even after one fails, so none is still running when the slot is released
+            results = await asyncio.gather(*(
+                self.run(game, func, share, shares, slot, generation, *args, request=request)
+                for share in range(shares)
+            ), return_exceptions=True)
+        finally:
+            self.free_slots.append(slot)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        move, stats = merge_split_results(results)
+        return move, stats.to_dict()
+
+    async def _run_in_slot(self, queue: GameQueue, func: Callable, args):
+        async with queue.slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _wait_for_disconnect(self, request: Request):
+        while not await request.is_disconnected():
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+engine_pool = EnginePool()
@@ -0,0 +1,333 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.database import get_collection
+
+# --- CONFIGURATION ---
+GAME_CACHE_SIZE = int(os.getenv("GAME_CACHE_SIZE", 1000))
+# Games idle for this long are flushed and dropped from memory
+GAME_CACHE_TTL_SECONDS = float(os.getenv("GAME_CACHE_TTL_SECONDS", 1800))
+# "write-through": every save is written before the request returns.
+# "write-behind": saves only mark the game dirty; a background task writes them every flush interval.
+GAME_CACHE_MODE = os.getenv("GAME_CACHE_MODE", "write-through")
+GAME_CACHE_FLUSH_SECONDS = float(os.getenv("GAME_CACHE_FLUSH_SECONDS", 2))
+
+# List fields that only ever grow; saves $push the new items instead of rewriting the list
+APPEND_ONLY_FIELDS = ("moves", "move_history")
+
+GameModel = TypeVar("GameModel", bound=BaseModel)
+CacheKey = Tuple[str, str]
+
+
+class GameConflict(HTTPException):
+    """Another request saved the game after this one loaded it"""
+
+    def __init__(self):
+        super().__init__(status_code=409, detail="Game was updated by another request, reload and retry")
+
+
+def document_id(game_id: str):
+    """Mongo _id for a game id string (ObjectId when it parses as one, the raw string otherwise)"""
+    try:
+        return ObjectId(game_id)
+    except (InvalidId, TypeError):
+        return game_id
+
+
+def version_filter(version: int):
+    # Documents written before the version field existed count as version 0
+    return version if version else {"$in": [0, None]}
+
+
+class CachedGame:
+    """A cached game plus what Mongo already has of it"""
+    __slots__ = ("game", "expires_at", "dirty", "stored_version", "stored_lengths", "lock")
+
+    def __init__(self, game: BaseModel, in_sync: bool):
+        self.game = game
+        self.expires_at = 0.0
+        self.dirty = False
+        self.stored_version = game.version
+        # Stored length of each append-only list; None when unknown (the whole game is rewritten)
+        self.stored_lengths = append_lengths(game) if in_sync else None
+        self.lock = asyncio.Lock()
+
+
+def append_lengths(game: BaseModel) -> Dict[str, int]:
+    return {name: len(getattr(game, name)) for name in APPEND_ONLY_FIELDS if hasattr(game, name)}
+
+
+class GameStore:
+    """LRU + TTL cache of active games in front of Mongo.
+
+    Move routes load the parsed game model from memory instead of running a
+    find_one and rebuilding it from the document on every move, and save it
+    once after the human and AI moves are both applied. Evicted or expired
+    games that still have unsaved changes are written before they are
+    forgotten, and everything pending is flushed on shutdown.
+
+    Each write is one update_one: $push for the moves added since the last
+    write and $set for the rest, filtered on the version the write is based
+    on. Saving a copy whose version is no longer current raises GameConflict.
+
+    The cache is per process: run one API worker, or route a game's
+    requests to the same worker, when write-behind is on.
+    """
+
+    def __init__(self, max_games: int = GAME_CACHE_SIZE, ttl_seconds: float = GAME_CACHE_TTL_SECONDS,
+                 mode: str = GAME_CACHE_MODE, flush_seconds: float = GAME_CACHE_FLUSH_SECONDS):
+        if mode not in ("write-through", "write-behind"):
+            raise ValueError(f"Unknown GAME_CACHE_MODE {mode!r}")
+        self.max_games = max(1, max_games)
+        self.ttl_seconds = ttl_seconds
+        self.write_behind = mode == "write-behind"
+        self.flush_seconds = flush_seconds
+        self.games: "OrderedDict[CacheKey, CachedGame]" = OrderedDict()
+        # Games pushed out of the LRU with unsaved changes; still served from here until written
+        self.evicted: Dict[CacheKey, CachedGame] = {}
+        self.flusher: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.conflicts = 0
+
+    # --- lifecycle ---
+
+    def start(self):
+        if self.write_behind and self.flusher is None:
+            self.flusher = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the background flusher and write every unsaved game"""
+        if self.flusher is not None:
+            self.flusher.cancel()
+            try:
+                await self.flusher
+            except asyncio.CancelledError:
+                pass
+            self.flusher = None
+        await self.flush()
+
+    # --- game access ---
+
+    async def create(self, collection: str, game: GameModel) -> str:
+        """Insert a new game and cache it; returns its id"""
+        game_dict = game.dict()
+        game_dict["_id"] = ObjectId()
+        result = await get_collection(collection).insert_one(game_dict)
+        game_id = str(result.inserted_id)
+        self._remember((collection, game_id), game, dirty=False)
+        return game_id
+
+    async def load(self, collection: str, game_id: str, model: Type[GameModel]) -> Optional[GameModel]:
+        """The game from memory, or from Mongo on a miss; None if it doesn't exist.
+
+        Returns a private copy: changes only become visible to other requests
+        (and get persisted) through save(), so a request that fails or is
+        cancelled halfway leaves the cached game as it was.
+        """
+        key = (collection, game_id)
+        entry = self.games.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            await self._expire(key)
+            entry = self.games.get(key)
+
+        if entry is not None:
+            self.hits += 1
+            game = entry.game
+        elif key in self.evicted:
+            self.hits += 1
+            game = self._revive(key).game
+        else:
+            self.misses += 1
+            game_data = await get_collection(collection).find_one({"_id": document_id(game_id)})
+            if not game_data:
+                return None
+            game = model(**game_data)
+        self._remember(key, game, dirty=False)
+        return game.model_copy(deep=True)
+
+    async def save(self, collection: str, game_id: str, game: BaseModel):
+        """Record the game's new state: written now (write-through) or by the next flush (write-behind).
+
+        Raises GameConflict when the game was saved by someone else since
+        `game` was loaded.
+        """
+        key = (collection, game_id)
+        current = self.games.get(key) or self.evicted.get(key)
+        if current is not None and current.game.version != game.version:
+            self.conflicts += 1
+            raise GameConflict()
+        # Dropped from the cache since it was loaded: the write is checked against the
+        # version loaded, but rewrites the whole game as there's no stored state to diff against
+        entry = current or CachedGame(game, in_sync=False)
+
+        if self.write_behind:
+            if current is None:
+                self.games[key] = entry
+            game.version += 1
+            game.updated_at = datetime.utcnow()
+            self._remember(key, game, dirty=True)
+            return
+
+        # Write-through: the cache only takes the new state once Mongo has it, so a failed
+        # write (and the error the client gets) leaves the game as it was
+        async with entry.lock:
+            if current is not None and entry.game.version != game.version:
+                self.conflicts += 1
+                raise GameConflict()
+            loaded_version, loaded_at = game.version, game.updated_at
+            game.version += 1
+            game.updated_at = datetime.utcnow()
+            try:
+                await self._store(key, entry, game)
+            except Exception:
+                game.version, game.updated_at = loaded_version, loaded_at
+                raise
+            if current is None:
+                self.games[key] = entry
+            self._remember(key, game, dirty=False)
+            # Anything still pending was part of this write
+            entry.dirty = False
+
+    async def delete(self, collection: str, game_id: str) -> bool:
+        """Forget the game and remove it from Mongo; False if it didn't exist"""
+        key = (collection, game_id)
+        cached = self.games.pop(key, None) or self.evicted.pop(key, None)
+        result = await get_collection(collection).delete_one({"_id": document_id(game_id)})
+        return cached is not None or result.deleted_count > 0
+
+    # --- persistence ---
+
+    async def flush(self):
+        """Write every game with unsaved changes"""
+        for key in list(self.evicted):
+            await self._write_evicted(key)
+        for key, entry in list(self.games.items()):
+            if entry.dirty:
+                await self._write_or_drop(key, entry)
+        now = time.monotonic()
+        for key in [key for key, entry in self.games.items() if entry.expires_at <= now]:
+            await self._expire(key)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️ Game cache flush failed, will retry: {e}")
+
+    def _update(self, entry: CachedGame, game: BaseModel) -> Dict[str, dict]:
+        """The update that brings the stored document from entry's stored version to `game`"""
+        if entry.stored_lengths is None:
+            return {"$set": game.dict(exclude={"id", "created_at"})}
+
+        appended = [name for name in entry.stored_lengths if hasattr(game, name)]
+        update = {"$set": game.dict(exclude={"id", "created_at", *appended})}
+        pushes = {}
+        for name in appended:
+            new_items: List = getattr(game, name)[entry.stored_lengths[name]:]
+            if new_items:
+                pushes[name] = {"$each": [item.dict() if isinstance(item, BaseModel) else item for item in new_items]}
+        if pushes:
+            update["$push"] = pushes
+        return update
+
+    async def _write_entry(self, key: CacheKey, entry: CachedGame):
+        # One write per entry at a time, so each is based on the version the previous one stored
+        async with entry.lock:
+            if not entry.dirty:
+                return
+            # Cleared first so a save made while the write is in flight marks it dirty again
+            entry.dirty = False
+            try:
+                await self._store(key, entry, entry.game)
+            except GameConflict:
+                raise
+            except Exception:
+                entry.dirty = True
+                raise
+
+    async def _store(self, key: CacheKey, entry: CachedGame, game: BaseModel):
+        """Write `game` over the version entry last stored (the caller holds entry.lock)"""
+        collection, game_id = key
+        result = await get_collection(collection).update_one(
+            {"_id": document_id(game_id), "version": version_filter(entry.stored_version)},
+            self._update(entry, game)
+        )
+        self.writes += 1
+
+        if result.matched_count == 0:
+            # Someone else wrote a newer version: forget ours and let the next load read theirs
+            self.conflicts += 1
+            if self.games.get(key) is entry:
+                del self.games[key]
+            raise GameConflict()
+        entry.stored_version = game.version
+        entry.stored_lengths = append_lengths(game)
+
+    async def _write_or_drop(self, key: CacheKey, entry: CachedGame) -> bool:
+        """Background write of an unsaved game; False if it lost to a newer version and was dropped"""
+        try:
+            await self._write_entry(key, entry)
+        except GameConflict:
+            print(f"⚠️ Dropped cached {key[0]} game {key[1]}: it was changed elsewhere")
+            return False
+        return True
+
+    async def _expire(self, key: CacheKey):
+        entry = self.games[key]
+        if entry.dirty and not await self._write_or_drop(key, entry):
+            return
+        # A save during the write makes the entry current again
+        if self.games.get(key) is entry and not entry.dirty:
+            del self.games[key]
+
+    def _remember(self, key: CacheKey, game: BaseModel, dirty: bool) -> CachedGame:
+        entry = self.games.get(key) or self._revive(key)
+        if entry is None:
+            entry = self.games[key] = CachedGame(game, in_sync=True)
+        entry.game = game
+        entry.dirty = entry.dirty or dirty
+        entry.expires_at = time.monotonic() + self.ttl_seconds
+        self.games.move_to_end(key)
+        while len(self.games) > self.max_games:
+            old_key, old_entry = self.games.popitem(last=False)
+            if old_entry.dirty:
+                self.evicted[old_key] = old_entry
+                if not self.write_behind:
+                    asyncio.create_task(self._write_evicted(old_key))
+        return entry
+
+    def _revive(self, key: CacheKey) -> Optional[CachedGame]:
+        """Move an evicted, still unsaved game back into the LRU"""
+        entry = self.evicted.pop(key, None)
+        if entry is not None:
+            self.games[key] = entry
+        return entry
+
+    async def _write_evicted(self, key: CacheKey):
+        entry = self.evicted.get(key)
+        if entry is None:
+            return
+        await self._write_or_drop(key, entry)
+        if self.evicted.get(key) is entry and not entry.dirty:
+            del self.evicted[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"games": len(self.games), "hits": self.hits, "misses": self.misses, "writes": self.writes,
+                "conflicts": self.conflicts,
+                "dirty": sum(entry.dirty for entry in self.games.values()) + len(self.evicted)}
+
+
+game_store = GameStore()
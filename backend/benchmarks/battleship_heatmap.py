@@ -0,0 +1,74 @@
+"""Time the Battleship placement heatmap: nested Python loops vs the numpy version.
+
+`loop_counts` is the hunt-mode heatmap as it used to be written in
+BattleshipAI._heatmap_hunt (every placement, cell by cell). Both versions are
+run on random partly-shot boards of several sizes; their counts must agree on
+every unknown cell.
+
+Usage (from backend/):
+    python benchmarks/battleship_heatmap.py [boards]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.games.battleship_ai import placement_counts
+
+SHIPS = [5, 4, 3, 3, 2]
+SIZES = (10, 20, 40)
+
+
+def loop_counts(board, ships):
+    size = len(board)
+    counts = [[0] * size for _ in range(size)]
+    for ship_len in ships:
+        for r in range(size):
+            for c in range(size - ship_len + 1):
+                if all(board[r][c + i] not in [1, 3] for i in range(ship_len)):
+                    for i in range(ship_len):
+                        if board[r][c + i] == 0:
+                            counts[r][c + i] += 1
+        for r in range(size - ship_len + 1):
+            for c in range(size):
+                if all(board[r + i][c] not in [1, 3] for i in range(ship_len)):
+                    for i in range(ship_len):
+                        if board[r + i][c] == 0:
+                            counts[r + i][c] += 1
+    return counts
+
+
+def random_board(rng: random.Random, size: int):
+    """A board with roughly a third of the cells already shot at"""
+    return [[rng.choice([0, 0, 0, 0, 0, 0, 1, 1, 2, 3]) for _ in range(size)] for _ in range(size)]
+
+
+if __name__ == "__main__":
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = random.Random(0)
+    print(f"{boards} boards per size, fleet {SHIPS} (counts verified)")
+    print(f"  {'size':<8} {'loops ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for size in SIZES:
+        samples = [random_board(rng, size) for _ in range(boards)]
+        arrays = [np.asarray(board) for board in samples]
+
+        for board, array in zip(samples, arrays):
+            expected = np.asarray(loop_counts(board, SHIPS))
+            unknown = array == 0
+            assert (placement_counts(array, SHIPS)[unknown] == expected[unknown]).all()
+
+        start = time.perf_counter()
+        for board in samples:
+            loop_counts(board, SHIPS)
+        loops = (time.perf_counter() - start) / boards
+
+        start = time.perf_counter()
+        for array in arrays:
+            placement_counts(array, SHIPS)
+        vectorized = (time.perf_counter() - start) / boards
+
+        print(f"  {size:<8} {loops * 1000:>10.3f} {vectorized * 1000:>10.3f} {loops / vectorized:>7.1f}x")
@@ -0,0 +1,131 @@
+"""Compare board copying against in-place push/pop in the chess search.
+
+Runs a perft-style traversal (every legal move to a fixed depth) three ways:
+
+  copy      - the old approach: a fresh ChessGameLogic with a copied board for
+              every child and for every self-check test
+  push_pop  - ChessGameLogic.push/pop on one mutable board
+  bitboard  - BitboardPosition.push/pop, which is what ChessAI searches on
+
+For each it reports nodes visited, time per node, board copies made per node
+(each copy is 9 lists plus a ChessGameLogic and its piece-value dict) and the
+peak memory traced by tracemalloc during the run.
+
+Usage (from backend/):
+    python benchmarks/chess_make_unmake.py [depth]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.games.chess_logic import ChessGameLogic
+from app.games.chess_bitboard import BitboardPosition
+from app.models.chess_models import create_initial_board
+
+POSITIONS = {
+    "initial": (create_initial_board(), 'white'),
+    "middlegame": ([
+        ["r", None, "b", "q", "k", None, None, "r"],
+        ["p", "p", "p", None, "b", "p", "p", "p"],
+        [None, None, "n", "p", None, "n", None, None],
+        [None, None, None, None, "p", None, None, None],
+        [None, None, "B", None, "P", None, None, None],
+        [None, None, "N", "P", None, "N", None, None],
+        ["P", "P", "P", None, None, "P", "P", "P"],
+        ["R", None, "B", "Q", "K", None, None, "R"],
+    ], 'white'),
+}
+
+
+def opponent(player: str) -> str:
+    return 'black' if player == 'white' else 'white'
+
+
+board_copies = 0
+
+
+def copy_logic(logic: ChessGameLogic) -> ChessGameLogic:
+    global board_copies
+    board_copies += 1
+    return ChessGameLogic([row[:] for row in logic.board])
+
+
+def legal_moves_by_copy(logic: ChessGameLogic, player: str):
+    """Legal move generation as it was before push/pop: one board copy per pseudo-legal move"""
+    moves = []
+    for i in range(8):
+        for j in range(8):
+            piece = logic.board[i][j]
+            if piece and ((player == 'white' and piece.isupper()) or (player == 'black' and piece.islower())):
+                for move in logic.get_piece_moves(i, j, piece):
+                    test_logic = copy_logic(logic)
+                    test_logic.make_move(move['from'], move['to'])
+                    if not test_logic.is_check(player):
+                        moves.append(move)
+    return moves
+
+
+def perft_copy(logic: ChessGameLogic, player: str, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in legal_moves_by_copy(logic, player):
+        child = copy_logic(logic)
+        child.make_move(move['from'], move['to'])
+        nodes += perft_copy(child, opponent(player), depth - 1)
+    return nodes
+
+
+def perft_push_pop(logic: ChessGameLogic, player: str, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in logic.get_legal_moves(player):
+        logic.push(move)
+        nodes += perft_push_pop(logic, opponent(player), depth - 1)
+        logic.pop()
+    return nodes
+
+
+def perft_bitboard(position: BitboardPosition, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in position.generate_legal_moves():
+        position.push(move)
+        nodes += perft_bitboard(position, depth - 1)
+        position.pop()
+    return nodes
+
+
+def run(name: str, board, player: str, depth: int):
+    global board_copies
+    runners = {
+        "copy": lambda: perft_copy(ChessGameLogic([row[:] for row in board]), player, depth),
+        "push_pop": lambda: perft_push_pop(ChessGameLogic([row[:] for row in board]), player, depth),
+        "bitboard": lambda: perft_bitboard(BitboardPosition.from_board(board, player), depth),
+    }
+    print(f"\n{name} (depth {depth})")
+    print(f"  {'method':<10} {'nodes':>8} {'us/node':>10} {'copies/node':>12} {'peak bytes':>12}")
+    for method, runner in runners.items():
+        board_copies = 0
+        start = time.perf_counter()
+        nodes = runner()
+        elapsed = time.perf_counter() - start
+        copies = board_copies
+
+        tracemalloc.start()
+        runner()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"  {method:<10} {nodes:>8} {elapsed / nodes * 1e6:>10.1f} {copies / nodes:>12.1f} {peak:>12}")
+
+
+if __name__ == "__main__":
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    for name, (board, player) in POSITIONS.items():
+        run(name, board, player, depth)
@@ -0,0 +1,104 @@
+"""Compare Connect 4 leaf evaluation strategies.
+
+Plays random games and, at every position, evaluates each legal child the
+way a search would at its leaves:
+
+  rescan       - the old approach: drop, scan all 69 windows (rescan_position), undo
+  incremental  - drop_piece/evaluate_position/undo_piece with the running window scores
+  bitboard     - Connect4Position.play/evaluate/undo, what Connect4AI searches on
+
+All three must agree on every score; the script checks that before timing.
+
+Usage (from backend/):
+    python benchmarks/connect4_eval.py [games]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.games.connect4_logic import Connect4GameLogic
+from app.games.connect4_bitboard import Connect4Position, evaluate
+
+
+def random_positions(games: int, seed: int = 0):
+    """(board, player to move) for every position of `games` random games"""
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(games):
+        logic = Connect4GameLogic([[None] * 7 for _ in range(6)])
+        player = 'red'
+        while True:
+            positions.append(([row[:] for row in logic.board], player))
+            moves = logic.get_legal_moves()
+            if not moves:
+                break
+            col = rng.choice(moves)
+            row = logic.drop_piece(col, player)
+            if logic.check_winner(row, col):
+                break
+            player = 'yellow' if player == 'red' else 'red'
+    return positions
+
+
+def leaves_rescan(board, player):
+    logic = Connect4GameLogic(board)
+    scores = []
+    for col in logic.get_legal_moves():
+        logic.drop_piece(col, player)
+        scores.append(logic.rescan_position(player))
+        logic.undo_piece(col)
+    return scores
+
+
+def leaves_incremental(board, player):
+    logic = Connect4GameLogic(board)
+    logic.reset_evaluation()
+    scores = []
+    for col in logic.get_legal_moves():
+        logic.drop_piece(col, player)
+        scores.append(logic.evaluate_position(player))
+        logic.undo_piece(col)
+    return scores
+
+
+def leaves_bitboard(board, player):
+    position = Connect4Position.from_board(board, player)
+    scores = []
+    for col in position.legal_moves():
+        position.play(col)
+        # After play() the AI's stones are the opponent's bitboard
+        scores.append(evaluate(position.opponent, position.current))
+        position.undo()
+    return scores
+
+
+METHODS = {
+    "rescan": leaves_rescan,
+    "incremental": leaves_incremental,
+    "bitboard": leaves_bitboard,
+}
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    positions = random_positions(games)
+
+    for board, player in positions:
+        expected = leaves_rescan([row[:] for row in board], player)
+        for name, method in METHODS.items():
+            assert method([row[:] for row in board], player) == expected, name
+
+    # Board copies are made up front so only evaluation is timed
+    leaves = sum(len(Connect4GameLogic(board).get_legal_moves()) for board, _ in positions)
+    print(f"{len(positions)} positions, {leaves} leaf evaluations (scores verified)")
+    print(f"  {'method':<12} {'total ms':>10} {'us/leaf':>10}")
+    for name, method in METHODS.items():
+        boards = [([row[:] for row in board], player) for board, player in positions]
+        start = time.perf_counter()
+        for board, player in boards:
+            method(board, player)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<12} {elapsed * 1000:>10.1f} {elapsed / leaves * 1e6:>10.1f}")
@@ -0,0 +1,227 @@
+"""Engine benchmark suite: fixed positions for the chess, Connect 4, checkers and tic-tac-toe AIs.
+
+Every search runs on the hard engine to a fixed depth with no time budget, so
+node counts and moves only change when the search itself does:
+
+  chess      perft on the standard perft positions (checked against the
+             engine's known counts), then a search of each position
+  connect4   searches of a set of positions past the opening book
+  checkers   searches of midgame positions
+  tictactoe  solving the game tree from each position, as done at import
+
+Each row reports nodes, time, nodes per second, time to reach each depth,
+the peak memory traced by tracemalloc (in a second, untimed run) and the
+best move. With --json the results are saved for comparing commits; pass
+that file to --compare on a later run to see the nodes/sec ratio per row and
+which nodes or moves changed. Exits non-zero if a perft count is wrong.
+
+Usage (from backend/):
+    python benchmarks/engine_suite.py [--games chess connect4 checkers tictactoe]
+        [--chess-depth 3] [--perft-depth 3] [--connect4-depth 9] [--checkers-depth 8]
+        [--no-memory] [--json out.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.games import tic_tac_toe_ai
+from app.games.chess_ai import ChessAI
+from app.games.chess_bitboard import BitboardPosition
+from app.games.checkers_ai import CheckersAI
+from app.games.connect4_ai import Connect4AI
+from app.games.tic_tac_toe_ai import TicTacToeAI
+from app.models.game_models import Player
+from benchmarks.positions import (
+    CHECKERS_POSITIONS, CONNECT4_TEST_SET, PERFT_POSITIONS, TICTACTOE_POSITIONS,
+    chess_board, connect4_board, connect4_player, grid_board,
+)
+
+GAMES = ("chess", "connect4", "checkers", "tictactoe")
+
+
+def perft(position: BitboardPosition, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in position.generate_legal_moves():
+        position.push(move)
+        nodes += perft(position, depth - 1)
+        position.pop()
+    return nodes
+
+
+def measure(run, memory: bool):
+    """Time run() (which returns (nodes, time to depth, best move)), then trace its peak memory in a rerun"""
+    start = time.perf_counter()
+    nodes, time_to_depth, best_move = run()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    peak_kib = None
+    if memory:
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kib = round(peak / 1024, 1)
+
+    return {
+        "depth": max(time_to_depth, default=0),
+        "nodes": nodes,
+        "time_ms": round(elapsed_ms, 1),
+        "nps": round(nodes / elapsed_ms * 1000) if elapsed_ms else None,
+        "time_to_depth": {str(depth): ms for depth, ms in time_to_depth.items()},
+        "peak_kib": peak_kib,
+        "best_move": best_move,
+    }
+
+
+def search_run(make_ai, search):
+    """run() for measure(): a fresh engine (its tables count towards memory) searching once"""
+    def run():
+        ai = make_ai()
+        move = search(ai)
+        return ai.clock.nodes, {depth: ms for depth, _, ms in ai.clock.iterations}, move
+    return run
+
+
+def perft_run(placement: str, depth: int):
+    def run():
+        position = BitboardPosition.from_board(chess_board(placement), 'white')
+        start = time.perf_counter()
+        time_to_depth, nodes = {}, 0
+        for current in range(1, depth + 1):
+            nodes = perft(position, current)
+            time_to_depth[current] = round((time.perf_counter() - start) * 1000, 1)
+        return nodes, time_to_depth, None
+    return run
+
+
+def tictactoe_run(rows, player: str):
+    """Solve the tree below the position from an empty table (later lookups solve what they need again)"""
+    def run():
+        board = grid_board(rows)
+        tic_tac_toe_ai._solutions.clear()
+        start = time.perf_counter()
+        move = TicTacToeAI(Player(player)).get_best_move(board)
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        # The tree is solved to the end: as deep as there are empty cells
+        return len(tic_tac_toe_ai._solutions), {sum(row.count(".") for row in rows): elapsed_ms}, list(move)
+    return run
+
+
+def benchmarks(args):
+    """(game, position, kind, run) for every benchmark selected"""
+    if "chess" in args.games:
+        for name, placement, _ in PERFT_POSITIONS:
+            yield "chess", name, "perft", perft_run(placement, args.perft_depth)
+        for name, placement, _ in PERFT_POSITIONS:
+            yield "chess", name, "search", search_run(
+                lambda: ChessAI('hard'),
+                lambda ai, placement=placement: ai.get_best_move(chess_board(placement), 'white',
+                                                                 max_depth=args.chess_depth))
+    if "connect4" in args.games:
+        for name, columns in CONNECT4_TEST_SET:
+            yield "connect4", name, "search", search_run(
+                lambda: Connect4AI('hard'),
+                lambda ai, columns=columns: ai.get_best_move(connect4_board(columns), connect4_player(columns),
+                                                             max_depth=args.connect4_depth))
+    if "checkers" in args.games:
+        for name, rows, player in CHECKERS_POSITIONS:
+            yield "checkers", name, "search", search_run(
+                lambda: CheckersAI('hard'),
+                lambda ai, rows=rows, player=player: ai.get_best_move(grid_board(rows), player,
+                                                                      max_depth=args.checkers_depth))
+    if "tictactoe" in args.games:
+        for name, rows, player in TICTACTOE_POSITIONS:
+            yield "tictactoe", name, "solve", tictactoe_run(rows, player)
+
+
+def commit_id():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def short_move(move) -> str:
+    if isinstance(move, dict):
+        if "from" in move:
+            return f"{move['from']}{move['to']}"
+        return f"{move['from_row']}{move['from_col']}-{move['to_row']}{move['to_col']}"
+    return "" if move is None else str(move)
+
+
+def compare(rows, baseline_path: Path):
+    baseline = {(row["game"], row["position"], row["kind"]): row
+                for row in json.loads(baseline_path.read_text())["results"]}
+    print(f"\nAgainst {baseline_path}:")
+    print(f"{'game':<10} {'position':<11} {'kind':<7} {'nps ratio':>9}  changes")
+    for row in rows:
+        base = baseline.get((row["game"], row["position"], row["kind"]))
+        if base is None:
+            print(f"{row['game']:<10} {row['position']:<11} {row['kind']:<7} {'-':>9}  new")
+            continue
+        ratio = round(row["nps"] / base["nps"], 2) if row["nps"] and base["nps"] else None
+        changes = [f"{field} {base[field]} -> {row[field]}" for field in ("depth", "nodes")
+                   if base[field] != row[field]]
+        if base["best_move"] != row["best_move"]:
+            changes.append(f"move {short_move(base['best_move'])} -> {short_move(row['best_move'])}")
+        print(f"{row['game']:<10} {row['position']:<11} {row['kind']:<7} {ratio if ratio else '-':>9}  "
+              f"{', '.join(changes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", nargs="+", choices=GAMES, default=list(GAMES))
+    parser.add_argument("--chess-depth", type=int, default=3)
+    parser.add_argument("--perft-depth", type=int, default=3)
+    parser.add_argument("--connect4-depth", type=int, default=9)
+    parser.add_argument("--checkers-depth", type=int, default=8)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc rerun")
+    parser.add_argument("--json", type=Path, help="also write the results here as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    print(f"{'game':<10} {'position':<11} {'kind':<7} {'depth':>5} {'nodes':>9} {'ms':>9} {'nodes/s':>9} "
+          f"{'peak KiB':>9}  move")
+    rows, perft_errors = [], []
+    for game, name, kind, run in benchmarks(args):
+        row = {"game": game, "position": name, "kind": kind, **measure(run, not args.no_memory)}
+        if kind == "perft":
+            expected = next(counts for position, _, counts in PERFT_POSITIONS if position == name)
+            row["expected_nodes"] = expected.get(args.perft_depth)
+            if row["expected_nodes"] is not None and row["nodes"] != row["expected_nodes"]:
+                perft_errors.append(f"{name}: {row['nodes']} nodes, expected {row['expected_nodes']}")
+        rows.append(row)
+        print(f"{game:<10} {name:<11} {kind:<7} {row['depth']:>5} {row['nodes']:>9} {row['time_ms']:>9} "
+              f"{row['nps'] or '-':>9} {row['peak_kib'] or '-':>9}  {short_move(row['best_move'])}")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "commit": commit_id(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "settings": {
+                "chess_depth": args.chess_depth, "perft_depth": args.perft_depth,
+                "connect4_depth": args.connect4_depth, "checkers_depth": args.checkers_depth,
+            },
+            "results": rows,
+        }, indent=2))
+        print(f"Wrote {args.json}")
+    if args.compare:
+        compare(rows, args.compare)
+    if perft_errors:
+        sys.exit("Wrong perft counts: " + "; ".join(perft_errors))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare MazeAI's from-scratch A* with the incremental session planner.
+
+Plays chase games on random mazes: the mouse wanders, a few cells flip
+between empty/mud/wall every move, and the cat follows its plan. Each move
+is answered both ways and the two path costs must match.
+
+Usage (from backend/):
+    python benchmarks/maze_replan.py [size] [games]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.games.maze_ai import MazeAI
+from app.models.maze_models import Position
+
+
+def random_maze(rng: random.Random, size: int):
+    grid = [[rng.choice(["empty"] * 6 + ["wall", "mud"]) for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[size - 1][size - 1] = "empty"
+    return grid
+
+
+def path_cost(ai: MazeAI, grid, path) -> int:
+    return sum(ai.get_cost(grid[r][c]) for r, c in path[1:])
+
+
+def play(size: int, games: int, seed: int = 0):
+    rng = random.Random(seed)
+    ai = MazeAI()
+    timings = {"astar": 0.0, "incremental": 0.0}
+    moves = 0
+    for game in range(games):
+        grid = random_maze(rng, size)
+        cat, mouse = (0, 0), (size - 1, size - 1)
+        for _ in range(size * 2):
+            for _ in range(rng.randint(0, 2)):
+                r, c = rng.randrange(size), rng.randrange(size)
+                if (r, c) not in (cat, mouse):
+                    grid[r][c] = rng.choice(["empty", "mud", "wall"])
+            steps = [(mouse[0] + dr, mouse[1] + dc) for dr, dc in ai.directions]
+            steps = [(r, c) for r, c in steps if 0 <= r < size and 0 <= c < size and grid[r][c] != "wall"]
+            if steps:
+                mouse = rng.choice(steps)
+
+            cat_pos, mouse_pos = Position(row=cat[0], col=cat[1]), Position(row=mouse[0], col=mouse[1])
+            start = time.perf_counter()
+            fresh = ai.get_next_move(grid, cat_pos, mouse_pos)
+            timings["astar"] += time.perf_counter() - start
+            start = time.perf_counter()
+            repaired = ai.get_next_move(grid, cat_pos, mouse_pos, session_id=f"game-{game}")
+            timings["incremental"] += time.perf_counter() - start
+            assert path_cost(ai, grid, fresh["path"]) == path_cost(ai, grid, repaired["path"])
+
+            moves += 1
+            cat = (repaired["row"], repaired["col"])
+            if cat == mouse:
+                break
+    return moves, timings
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    moves, timings = play(size, games)
+    print(f"{games} games on {size}x{size} mazes, {moves} moves (path costs verified)")
+    print(f"  {'method':<12} {'total ms':>10} {'ms/move':>10}")
+    for name, elapsed in timings.items():
+        print(f"  {name:<12} {elapsed * 1000:>10.1f} {elapsed / moves * 1000:>10.2f}")
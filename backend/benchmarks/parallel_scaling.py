@@ -0,0 +1,84 @@
+"""Scaling of the root-split hard search for chess and Connect 4 over 1/2/4/8 workers.
+
+Every position is searched to a fixed depth with a fixed seed, so each worker
+count must pick the same move; the report shows wall time, nodes and speedup
+over one worker, and flags any position whose move changed.
+
+Usage (from backend/):
+    python benchmarks/parallel_scaling.py [--workers 1 2 4 8] [--chess-depth 3] [--connect4-depth 9] [--json out.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.engine_pool import EnginePool, chess_split_search, connect4_split_search
+from benchmarks.positions import (
+    CHESS_POSITIONS, CONNECT4_POSITIONS, chess_board, connect4_board, connect4_player
+)
+
+
+def searches(chess_depth: int, connect4_depth: int, seed: int):
+    """(game, position name, split function, arguments) for every benchmark search"""
+    for name, placement, player in CHESS_POSITIONS:
+        yield "chess", name, chess_split_search, (chess_board(placement), player, "hard", None, (), chess_depth, seed)
+    for name, columns in CONNECT4_POSITIONS:
+        yield ("connect4", name, connect4_split_search,
+               (connect4_board(columns), connect4_player(columns), "hard", None, connect4_depth, seed))
+
+
+async def run_with_workers(workers: int, args) -> list:
+    pool = EnginePool(workers=workers, max_running=workers, split_workers=workers)
+    await pool.start()
+    rows = []
+    try:
+        for game, name, func, search_args in searches(args.chess_depth, args.connect4_depth, args.seed):
+            start = time.perf_counter()
+            move, stats = await pool.run_split(game, func, *search_args)
+            rows.append({
+                "game": game, "position": name, "workers": workers, "move": move,
+                "depth": stats["depth"], "nodes": stats["nodes"],
+                "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+            })
+    finally:
+        pool.shutdown()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chess-depth", type=int, default=3)
+    parser.add_argument("--connect4-depth", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="also write the results here as JSON")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs; chess depth {args.chess_depth}, Connect 4 depth {args.connect4_depth}")
+    rows = []
+    for workers in args.workers:
+        rows.extend(asyncio.run(run_with_workers(workers, args)))
+
+    baseline = {(row["game"], row["position"]): row for row in rows if row["workers"] == args.workers[0]}
+    print(f"{'game':<9} {'position':<11} {'workers':>7} {'wall ms':>9} {'nodes':>9} {'speedup':>8}  move")
+    for row in rows:
+        base = baseline[(row["game"], row["position"])]
+        row["speedup"] = round(base["wall_ms"] / row["wall_ms"], 2) if row["wall_ms"] else None
+        row["same_move"] = row["move"] == base["move"]
+        print(f"{row['game']:<9} {row['position']:<11} {row['workers']:>7} {row['wall_ms']:>9} {row['nodes']:>9} "
+              f"{row['speedup']:>8}  {row['move']}{'' if row['same_move'] else '  <-- differs'}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"cpus": os.cpu_count(), "results": rows}, indent=2))
+        print(f"Wrote {args.json}")
+    if not all(row["same_move"] for row in rows):
+        sys.exit("Moves differ between worker counts")
+
+
+if __name__ == "__main__":
+    main()
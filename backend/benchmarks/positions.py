@@ -0,0 +1,110 @@
+"""Fixed positions the benchmarks search, as the API's list boards"""
+from typing import List, Optional
+
+Board = List[List[Optional[str]]]
+
+# (name, FEN piece placement, side to move)
+CHESS_POSITIONS = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR", "white"),
+    ("italian", "r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R", "black"),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R", "black"),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8", "black"),
+]
+
+# Standard perft test positions (white to move) as (name, FEN piece placement, {depth: leaf nodes}).
+# The engine plays without castling or en passant and always promotes to a queen, so the
+# counts are its own: they match the published ones only for "start" and "position6",
+# where none of those moves come up at these depths.
+PERFT_POSITIONS = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR", {1: 20, 2: 400, 3: 8902}),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R", {1: 46, 2: 1865, 3: 86585}),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8", {1: 14, 2: 191, 3: 2810}),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1", {1: 6, 2: 222, 3: 7855}),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R", {1: 40, 2: 1339, 3: 51750}),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1", {1: 46, 2: 2079, 3: 89890}),
+]
+
+# (name, columns played from the empty board, 1-based, red first); all past the opening book
+CONNECT4_POSITIONS = [
+    ("opening", "43443"),
+    ("middlegame", "3454326"),
+    ("late", "44455536621"),
+]
+
+# More Connect 4 positions for the engine suite: a crowded centre and a forced endgame
+CONNECT4_TEST_SET = CONNECT4_POSITIONS + [
+    ("centre", "444333377"),
+    ("endgame", "2252576253462244111563365343671351441"),
+]
+
+# (name, rows from the top, side to move); red men 'r' move down, white men 'w' up, kings upper case.
+# Reached by a few random opening moves and then hard self-play.
+CHECKERS_POSITIONS = [
+    ("early", [
+        ".....r.r",
+        "..r.r.r.",
+        ".r.r.r.r",
+        "..r.....",
+        ".w...w..",
+        "w.....w.",
+        ".w.w.w.w",
+        "..w.w...",
+    ], "red"),
+    ("middlegame", [
+        ".....r..",
+        "..r.r.r.",
+        ".r...r.r",
+        "........",
+        ".w...w..",
+        "w.w.w...",
+        "...w....",
+        "....w...",
+    ], "red"),
+    ("late", [
+        ".....r..",
+        "w...r...",
+        "...r.r.w",
+        "r...r...",
+        "...w...r",
+        "w.w.w.w.",
+        "...w.w..",
+        "........",
+    ], "red"),
+]
+
+# (name, rows from the top, side to move)
+TICTACTOE_POSITIONS = [
+    ("empty", ["...", "...", "..."], "X"),
+    ("corner", ["X..", ".O.", "..."], "X"),
+    ("fork", ["X..", ".O.", "..X"], "O"),
+]
+
+
+def chess_board(placement: str) -> Board:
+    """8x8 board (row 0 = rank 8, white in upper case) from a FEN piece placement"""
+    board = []
+    for rank in placement.split("/"):
+        row: List[Optional[str]] = []
+        for char in rank:
+            row.extend([None] * int(char) if char.isdigit() else [char])
+        board.append(row)
+    return board
+
+
+def connect4_board(columns: str) -> Board:
+    """6x7 board (row 0 at the top, 'R'/'Y') after dropping pieces in `columns`"""
+    board: Board = [[None] * 7 for _ in range(6)]
+    for ply, char in enumerate(columns):
+        col = int(char) - 1
+        row = max(row for row in range(6) if board[row][col] is None)
+        board[row][col] = "R" if ply % 2 == 0 else "Y"
+    return board
+
+
+def connect4_player(columns: str) -> str:
+    return "red" if len(columns) % 2 == 0 else "yellow"
+
+
+def grid_board(rows: List[str]) -> Board:
+    """Board from rows of piece characters, '.' for an empty cell (checkers, tic-tac-toe)"""
+    return [[None if char == "." else char for char in row] for row in rows]
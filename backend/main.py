@@ -5,6 +5,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.routes import tictactoe, connect4, chess, maze, battleship, pacman, auth, chatbot, checkers # Added pacman
 from app.database import connect_to_mongo, close_mongo_connection
+from app.services.engine_pool import engine_pool
+from app.services.game_store import game_store
+from app.services.chess_memory import chess_memory
 
 app = FastAPI(
     title="AI Games API",
@@ -34,10 +37,22 @@ app.include_router(checkers.router)
 
 @app.on_event("startup")
 async def startup_event():
+    await engine_pool.start()
     await connect_to_mongo()
+    game_store.start()
+    chess_memory.start()
+    try:
+        await chess_memory.ensure_indexes()
+    except Exception as e:
+        print(f"⚠️ Could not create chess memory index: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    engine_pool.shutdown()
+    # Write any games the cache hasn't persisted yet
+    await game_store.stop()
+    # Finish (or spool to disk) the chess AI's pending learning
+    await chess_memory.stop()
     await close_mongo_connection()
 @app.get("/")
 async def root():
@@ -0,0 +1,159 @@
+"""Build the checkers endgame table used by CheckersAI on hard.
+
+Solves every position with up to --pieces pieces by retrograde analysis, from
+the fewest pieces up. Each position's moves are generated once. A move that
+captures leads into a smaller, already solved slice, and a move that doesn't
+stays in the current one, where it is recorded as a reverse edge. Results then
+spread backwards from the positions whose side to move has no move (lost in 0),
+one ply at a time. A position is won as soon as one child is lost, and lost
+once every child is won. Whatever is never reached is a draw. Working in order
+of distance means every result carries the exact number of plies to the end.
+The table is written in the format read by app/games/checkers_endgame.py, and
+the server memory-maps it.
+
+Usage (from backend/):
+    python scripts/build_checkers_endgame.py [--pieces 3] [--output app/data/checkers_endgame.bin]
+"""
+import argparse
+import sys
+import time
+from array import array
+from collections import defaultdict
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.games.checkers_bitboard import CheckersPosition, PROMOTION_MASKS, SQUARES
+from app.games.checkers_endgame import (
+    DEFAULT_TABLE_PATH, decode, encode, index, material_of, material_slices, slice_size, write_table
+)
+
+UNKNOWN, WIN, LOSS = 0, 1, -1
+
+
+def slice_positions(material, side):
+    """Every legal position of a slice (no men standing on the row where they'd have been crowned)"""
+    allowed = [
+        [sq for sq in range(SQUARES) if not PROMOTION_MASKS[piece >> 1] >> sq & 1] if not piece & 1
+        else list(range(SQUARES))
+        for piece in range(4)
+    ]
+
+    def place(piece, taken, chosen):
+        if piece == 4:
+            position = CheckersPosition()
+            for kind, squares in enumerate(chosen):
+                for sq in squares:
+                    position._put(kind, sq)
+            position.side = side
+            yield position
+            return
+        free = [sq for sq in allowed[piece] if not taken >> sq & 1]
+        for squares in combinations(free, material[piece]):
+            mask = sum(1 << sq for sq in squares)
+            yield from place(piece + 1, taken | mask, chosen + [squares])
+
+    yield from place(0, 0, [])
+
+
+def solve_tier(pieces, solved):
+    """Solve every slice with exactly `pieces` pieces; `solved` holds the smaller slices' values"""
+    slices = [(material, side) for material, side in material_slices(pieces) if sum(material) == pieces]
+    base, total = {}, 0
+    for key in slices:
+        base[key] = total
+        total += slice_size(key[0])
+
+    status = np.zeros(total, dtype=np.int8)
+    distance = np.zeros(total, dtype=np.int16)
+    unresolved_children = np.zeros(total, dtype=np.int32)
+    edge_child, edge_parent = array("q"), array("q")
+    # Level -> (parent, whether the child is won for its side to move) for children outside this tier
+    events = defaultdict(list)
+    resolved = defaultdict(list)
+
+    count = 0
+    for material, side in slices:
+        for position in slice_positions(material, side):
+            node = base[(material, side)] + index(position)
+            moves = position.generate_moves()
+            if not moves:
+                status[node], distance[node] = LOSS, 0
+                resolved[0].append(node)
+                continue
+            unresolved_children[node] = len(moves)
+            for move in moves:
+                position.push(move)
+                if not position.occupancy[position.side]:
+                    # Last piece captured: the child's side to move has lost
+                    events[0].append((node, False))
+                elif move[1]:
+                    child = decode(solved[(material_of(position), position.side)][index(position)])
+                    if child.value:
+                        events[child.distance].append((node, child.value > 0))
+                else:
+                    edge_child.append(base[(material_of(position), position.side)] + index(position))
+                    edge_parent.append(node)
+                position.pop()
+            count += 1
+    print(f"  {pieces} pieces: {count} positions, {len(edge_child)} moves within the tier")
+
+    # Reverse edges grouped by child (CSR)
+    edge_child = np.frombuffer(edge_child, dtype=np.int64)
+    order = np.argsort(edge_child, kind="stable")
+    parents = np.frombuffer(edge_parent, dtype=np.int64)[order]
+    starts = np.searchsorted(edge_child[order], np.arange(total + 1))
+
+    level = 0
+    while level <= max(max(events, default=0), max(resolved, default=0)):
+        work = events.pop(level, [])
+        for child in resolved.pop(level, []):
+            child_won = status[child] == WIN
+            work.extend((int(parent), child_won) for parent in parents[starts[child]:starts[child + 1]])
+        for node, child_won in work:
+            if status[node] != UNKNOWN:
+                continue
+            if not child_won:
+                status[node], distance[node] = WIN, level + 1
+                resolved[level + 1].append(node)
+            else:
+                unresolved_children[node] -= 1
+                if unresolved_children[node] == 0:
+                    status[node], distance[node] = LOSS, level + 1
+                    resolved[level + 1].append(node)
+        level += 1
+
+    for key in slices:
+        start = base[key]
+        values = np.zeros(slice_size(key[0]), dtype=np.int8)
+        for offset in np.flatnonzero(status[start:start + len(values)]):
+            values[offset] = encode(int(status[start + offset]), int(distance[start + offset]))
+        solved[key] = values
+    wins, losses = int((status == WIN).sum()), int((status == LOSS).sum())
+    print(f"  {wins} won, {losses} lost, {count - wins - losses} drawn; longest {int(distance.max())} plies")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pieces", type=int, default=3,
+                        help="table covers positions with up to this many pieces (4 needs far more time and memory)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_TABLE_PATH)
+    args = parser.parse_args()
+
+    solved = {}
+    start = time.perf_counter()
+    for pieces in range(2, args.pieces + 1):
+        solve_tier(pieces, solved)
+        print(f"  {time.perf_counter() - start:.0f}s")
+
+    write_table(args.output, args.pieces, (
+        (material, side, solved[(material, side)].tobytes()) for material, side in material_slices(args.pieces)
+    ))
+    print(f"Wrote {sum(len(values) for values in solved.values())} positions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Build the Connect 4 opening book used by Connect4AI on hard.
+
+Enumerates every position reachable in at most --plies moves (mirror images
+are merged, since the board is symmetric), searches each one to --depth with
+the hard engine and writes a sorted binary book (see app/games/connect4_book.py
+for the format). The server memory-maps the file, so it costs no heap in the
+worker processes.
+
+Usage (from backend/):
+    python scripts/build_connect4_book.py [--plies 4] [--depth 10] [--output app/data/connect4_book.bin]
+"""
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.games.connect4_ai import Connect4AI, WIN_SCORE
+from app.games.connect4_bitboard import Connect4Position, COLS, has_alignment
+from app.games.connect4_book import DEFAULT_BOOK_PATH, canonical_key, write_book
+
+
+def book_positions(max_plies: int):
+    """One representative per mirror pair of every non-terminal position up to max_plies"""
+    seen = set()
+    frontier = [Connect4Position()]
+    positions = []
+    for _ in range(max_plies + 1):
+        next_frontier = []
+        for position in frontier:
+            key, _ = canonical_key(position.key)
+            if key in seen:
+                continue
+            seen.add(key)
+            positions.append(position)
+            for col in position.legal_moves():
+                child = Connect4Position(position.current, position.mask, position.moves)
+                child.play(col)
+                # The side that just moved owns child.opponent; skip finished games
+                if not has_alignment(child.opponent):
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plies", type=int, default=4, help="book covers positions with up to this many stones")
+    parser.add_argument("--depth", type=int, default=10, help="search depth for each book position")
+    parser.add_argument("--output", type=Path, default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    positions = book_positions(args.plies)
+    print(f"Searching {len(positions)} positions to depth {args.depth}")
+
+    ai = Connect4AI('hard')
+    ai.use_book = False
+    entries = []
+    start = time.perf_counter()
+    for index, position in enumerate(positions, 1):
+        column, score = ai.analyse(position, args.depth)
+        if math.isinf(score):
+            score = WIN_SCORE if score > 0 else -WIN_SCORE
+        key, mirrored = canonical_key(position.key)
+        entries.append((key, int(score), COLS - 1 - column if mirrored else column))
+        if index % 25 == 0 or index == len(positions):
+            print(f"  {index}/{len(positions)} positions, {time.perf_counter() - start:.0f}s")
+
+    write_book(args.output, entries, args.plies, args.depth)
+    print(f"Wrote {len(entries)} entries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
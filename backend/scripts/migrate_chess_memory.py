@@ -0,0 +1,85 @@
+"""Rewrite chess_learning_memory documents from the old str(board) key to the compact one.
+
+Old documents look like {"state": "[['r', 'n', ...], ...]", "bad_moves": [...]};
+new ones are {"key": <Int64 Zobrist>, "fen": "<placement FEN>", "bad_moves": [...]}
+(see app/services/chess_memory.py). Every old document is parsed back into a
+board and its bad moves are merged into the new document for that position,
+so positions stored under differently formatted strings end up as one
+document. The unique index on `(key, fen)` is created first; any index on
+`state`, and the older unique index on `key` alone, are dropped at the end. Re-running the script is harmless.
+
+Usage (from backend/, with MONGODB_URL and DATABASE_NAME set in .env):
+    python scripts/migrate_chess_memory.py [--dry-run] [--batch 500]
+"""
+import argparse
+import ast
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pymongo import DeleteOne, MongoClient, UpdateOne
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.chess_memory import COLLECTION, INDEX_FIELDS, OLD_KEY_INDEX, position_key
+
+
+def parse_state(state: str):
+    """The 8x8 board an old `state` string was made from, or None if it isn't one"""
+    try:
+        board = ast.literal_eval(state)
+    except (ValueError, SyntaxError):
+        return None
+    if len(board) != 8 or any(len(row) != 8 for row in board):
+        return None
+    return board
+
+
+def index_size(db) -> int:
+    return db.command("collStats", COLLECTION).get("totalIndexSize", 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="count what would change without writing")
+    parser.add_argument("--batch", type=int, default=500, help="documents per bulk_write")
+    args = parser.parse_args()
+
+    load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+    db = MongoClient(os.getenv("MONGODB_URL"))[os.getenv("DATABASE_NAME")]
+    collection = db[COLLECTION]
+    print(f"Index size before: {index_size(db)} bytes")
+
+    if not args.dry_run:
+        collection.create_index(INDEX_FIELDS, unique=True, partialFilterExpression={"key": {"$exists": True}})
+
+    migrated, skipped, batch = 0, 0, []
+    for doc in collection.find({"state": {"$exists": True}}, {"state": 1, "bad_moves": 1}):
+        board = parse_state(doc["state"])
+        if board is None:
+            skipped += 1
+            print(f"  skipping {doc['_id']}: state is not a board")
+            continue
+        key, fen = position_key(board)
+        batch.append(UpdateOne(
+            {"key": key, "fen": fen},
+            {"$addToSet": {"bad_moves": {"$each": doc.get("bad_moves", [])}}},
+            upsert=True
+        ))
+        batch.append(DeleteOne({"_id": doc["_id"]}))
+        migrated += 1
+        if len(batch) >= args.batch * 2:
+            if not args.dry_run:
+                collection.bulk_write(batch, ordered=True)
+            batch = []
+    if batch and not args.dry_run:
+        collection.bulk_write(batch, ordered=True)
+
+    print(f"{'Would migrate' if args.dry_run else 'Migrated'} {migrated} documents, skipped {skipped}")
+    if not args.dry_run:
+        for name, info in collection.index_information().items():
+            if name == OLD_KEY_INDEX or any(field == "state" for field, _ in info["key"]):
+                collection.drop_index(name)
+                print(f"Dropped index {name}")
+        print(f"Index size after: {index_size(db)} bytes, {collection.count_documents({})} positions")
@@ -9,6 +9,9 @@ const Checkers = () => {
   const [currentPlayer, setCurrentPlayer] = useState('red');
   const [selectedPiece, setSelectedPiece] = useState(null);
   const [validMoves, setValidMoves] = useState([]);
+  const [legalMoves, setLegalMoves] = useState([]); // Red's legal moves, as sent by the backend
+  const [jumpFrom, setJumpFrom] = useState(null); // [row, col] of a piece partway through a multi-jump
+  const [jumpCaptured, setJumpCaptured] = useState([]); // Pieces that multi-jump has jumped so far
   const [gameId, setGameId] = useState(null);
   const [gameOver, setGameOver] = useState(false);
   const [winner, setWinner] = useState(null);
@@ -36,6 +39,9 @@ const Checkers = () => {
         setGameId(response.data.game_id);
         setBoard(response.data.board);
         setCurrentPlayer(response.data.current_player);
+        setLegalMoves(response.data.valid_moves || []);
+        setJumpFrom(null);
+        setJumpCaptured([]);
         setSelectedPiece(null);
         setValidMoves([]);
         setGameOver(false);
@@ -63,63 +69,19 @@ const Checkers = () => {
     return piece.toLowerCase() === 'r' ? 'red' : 'white';
   };
 
-  // Local helper to highlight valid moves for UI feedback only
-  const getValidMoves = (row, col) => {
-    const piece = board[row][col];
-    if (!piece) return [];
-
-    const color = getPieceColor(piece);
-    const isKing = piece === piece.toUpperCase();
-    const moves = [];
-
-    // Check normal moves
-    const directions = [];
-    if (color === 'red' || isKing) directions.push(1); // down
-    if (color === 'white' || isKing) directions.push(-1); // up
-
-    directions.forEach(rowDir => {
-      [-1, 1].forEach(colDir => {
-        const newRow = row + rowDir;
-        const newCol = col + colDir;
-        
-        if (newRow >= 0 && newRow < 8 && newCol >= 0 && newCol < 8) {
-          if (!board[newRow][newCol]) {
-            moves.push({ 
-              row: newRow, 
-              col: newCol, 
-              type: 'move',
-              capture: false 
-            });
-          }
-        }
-      });
-    });
-
-    // Check capture moves
-    directions.forEach(rowDir => {
-      [-2, 2].forEach(colDir => {
-        const newRow = row + rowDir * 2;
-        const newCol = col + colDir;
-        const captureRow = row + rowDir;
-        const captureCol = col + colDir / 2;
-        
-        if (newRow >= 0 && newRow < 8 && newCol >= 0 && newCol < 8) {
-          const capturedPiece = board[captureRow][captureCol];
-          if (capturedPiece && getPieceColor(capturedPiece) !== color && !board[newRow][newCol]) {
-            moves.push({ 
-              row: newRow, 
-              col: newCol, 
-              type: 'capture',
-              capture: true,
-              capturedRow: captureRow,
-              capturedCol: captureCol
-            });
-          }
+  // Squares the piece can step or jump to next, taken from the backend's legal moves
+  // (captures are compulsory, and a multi-jump is played one hop at a time)
+  const getValidMoves = (row, col, moves = legalMoves) => {
+    const targets = [];
+    moves
+      .filter(move => move.from_row === row && move.from_col === col)
+      .forEach(move => {
+        const [hopRow, hopCol] = move.path[1];
+        if (!targets.some(target => target.row === hopRow && target.col === hopCol)) {
+          targets.push({ row: hopRow, col: hopCol, capture: move.capture });
         }
       });
-    });
-
-    return moves;
+    return targets;
   };
 
   const handleSquareClick = async (row, col) => {
@@ -130,8 +92,9 @@ const Checkers = () => {
     const piece = board[row][col];
     const pieceColor = getPieceColor(piece);
 
-    // If clicking on own piece, select it
-    if (piece && pieceColor === 'red') {
+    // If clicking on own piece, select it (mid multi-jump, only the jumping piece can move)
+    const isJumping = jumpFrom && (jumpFrom[0] !== row || jumpFrom[1] !== col);
+    if (piece && pieceColor === 'red' && !isJumping) {
       setSelectedPiece({ row, col });
       const moves = getValidMoves(row, col);
       setValidMoves(moves);
@@ -141,7 +104,7 @@ const Checkers = () => {
     // If a piece is selected and clicking on valid move square
     if (selectedPiece && validMoves.some(move => move.row === row && move.col === col)) {
       await makeMove(selectedPiece.row, selectedPiece.col, row, col);
-    } else {
+    } else if (!jumpFrom) {
       // Deselect if clicking elsewhere
       setSelectedPiece(null);
       setValidMoves([]);
@@ -163,9 +126,19 @@ const Checkers = () => {
       // Update Board with Backend State
       setBoard(data.board);
       setCurrentPlayer(data.current_player);
+      setLegalMoves(data.valid_moves || []);
+      setJumpFrom(data.jump_from);
+      setJumpCaptured(data.jump_captured || []);
       setGameOver(data.game_over);
       setWinner(data.winner);
 
+      // Partway through a multi-jump the same piece stays selected for its next hop
+      if (data.jump_from) {
+        const [jumpRow, jumpCol] = data.jump_from;
+        setSelectedPiece({ row: jumpRow, col: jumpCol });
+        setValidMoves(getValidMoves(jumpRow, jumpCol, data.valid_moves || []));
+      }
+
       // Play Sound Effects
       if (isMusicEnabled) playMove();
       
@@ -186,14 +159,18 @@ const Checkers = () => {
     }
   };
 
-  const renderPiece = (piece) => {
+  const isCaptured = (row, col) => {
+    return jumpCaptured.some(([capturedRow, capturedCol]) => capturedRow === row && capturedCol === col);
+  };
+
+  const renderPiece = (piece, captured = false) => {
     if (!piece) return null;
 
     const color = getPieceColor(piece);
     const isKing = piece === piece.toUpperCase();
 
     return (
-      <div className={`w-8 h-8 rounded-full border-2 ${
+      <div className={`w-8 h-8 rounded-full border-2 ${captured ? 'opacity-40' : ''} ${
         color === 'red' 
           ? 'bg-red-500 border-red-700 hover:bg-red-600' 
           : 'bg-gray-200 border-gray-400 hover:bg-gray-300'
@@ -312,7 +289,7 @@ const Checkers = () => {
                         }`}
                         onClick={() => handleSquareClick(rowIndex, colIndex)}
                       >
-                        {renderPiece(piece)}
+                        {renderPiece(piece, isCaptured(rowIndex, colIndex))}
                       </div>
                     );
                   })}
@@ -333,7 +310,8 @@ const Checkers = () => {
               </div>
               <div className="space-y-2">
                 <p>• Move diagonally to empty squares</p>
-                <p>• Jump over opponent pieces to capture them</p>
+                <p>• Jump over opponent pieces to capture them (captures are compulsory)</p>
+                <p>• Keep jumping with the same piece while you can; jumped pieces fade until the jump ends</p>
                 <p>• Reach the opposite end to become a <span className="text-yellow-400">King</span></p>
               </div>
             </div>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { RefreshCw, Zap, Footprints, Skull } from 'lucide-react'; // Example icons
 import BackButton from '../common/BackButton';
 import { gameAPI } from '../../utils/api';
@@ -13,6 +13,7 @@ const MazeRunner = () => {
   const [mousePos, setMousePos] = useState({ row: 9, col: 9 });
   const [gameStatus, setGameStatus] = useState('playing'); // playing, won, lost
   const [loading, setLoading] = useState(false);
+  const sessionId = useRef(null); // Lets the backend reuse its path search between moves
   const { isMusicEnabled } = useAudio();
 
   // Initialize Grid
@@ -30,6 +31,7 @@ const MazeRunner = () => {
         if((r!==0 || c!==0) && (r!==9 || c!==9)) newGrid[r][c] = 'wall';
     }
     setGrid(newGrid);
+    sessionId.current = Math.random().toString(36).slice(2);
     setCatPos({ row: 0, col: 0 });
     setMousePos({ row: 9, col: 9 });
     setGameStatus('playing');
@@ -62,7 +64,7 @@ const MazeRunner = () => {
                 cols: COLS,
                 cat_pos: catPos,
                 mouse_pos: { row: newR, col: newC } // Pass updated mouse pos
-            });
+            }, sessionId.current);
             
             const aiMove = response.data;
             setCatPos({ row: aiMove.row, col: aiMove.col });
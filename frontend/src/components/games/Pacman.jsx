@@ -165,31 +165,26 @@ const Pacman = () => {
 
   const moveGhostsAI = async () => {
     const newGhosts = { ...ghosts };
-    const promises = Object.keys(newGhosts).map(async (key) => {
-      const ghost = newGhosts[key];
-      try {
-        const payload = {
-          game_state: {
-            grid: grid,
-            pacman: { x: pacman.x, y: pacman.y, direction: pacman.direction },
-            ghosts: transformGhostsForAPI(ghosts),
-            score: score,
-            level: 1
-          },
-          ghost_type: ghost.type
-        };
-        const res = await gameAPI.getPacmanGhostMove(payload);
-        const direction = res.data.direction;
-        
-        const nextPos = getNextPos(ghost.x, ghost.y, direction);
+    try {
+      // One request per tick for all four ghosts
+      const res = await gameAPI.getPacmanGhostMoves({
+        grid: grid,
+        pacman: { x: pacman.x, y: pacman.y, direction: pacman.direction },
+        ghosts: transformGhostsForAPI(ghosts),
+        score: score,
+        level: 1
+      });
+      Object.entries(res.data.moves).forEach(([key, move]) => {
+        const ghost = newGhosts[key];
+        if (!ghost) return;
+        const nextPos = getNextPos(ghost.x, ghost.y, move.direction);
         if (isValidMove(nextPos.x, nextPos.y)) {
           newGhosts[key] = { ...ghost, x: nextPos.x, y: nextPos.y };
         }
-      } catch (err) {
-        // Silent fail to keep game running if API hiccups
-      }
-    });
-    await Promise.all(promises);
+      });
+    } catch (err) {
+      // Silent fail to keep game running if API hiccups
+    }
     setGhosts(newGhosts);
   };
 
@@ -48,13 +48,14 @@ export const gameAPI = {
 
   // Maze Solver
   solveMaze: (mazeData) => api.post("/api/maze/solve", mazeData),
-  getMazeMove: (state) => api.post("/api/maze/next-move", { state }),
+  getMazeMove: (state, sessionId) => api.post("/api/maze/next-move", { state, session_id: sessionId }),
 
   // Battleship
   getBattleshipHint: (state) => api.post("/api/battleship/hint", state),
 
   // Pacman
   getPacmanGhostMove: (data) => api.post("/api/pacman/ghost-move", data),
+  getPacmanGhostMoves: (gameState) => api.post("/api/pacman/ghost-moves", gameState),
 };
 
 // Checkers API